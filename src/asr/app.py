@@ -8,25 +8,42 @@ target via ``ASR_FORWARD_URL``.
 from __future__ import annotations
 
 import os
+from contextlib import asynccontextmanager
 from typing import Any, Dict, Optional
 
 import httpx
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
 from fastapi.responses import JSONResponse
 
+from src.utils.http_pool import create_pooled_client
 from src.utils.logger import configure_logger
+from src.utils.upload_stream import UploadTooLarge, multipart_upload
 
 
-app = FastAPI(title="SOS ASR Service", version="0.1.0")
 logger = configure_logger("sos.asr")
 
 FORWARD_URL_RAW = os.environ.get("ASR_FORWARD_URL")
 FORWARD_URL = FORWARD_URL_RAW.rstrip("/") if FORWARD_URL_RAW else None
 HTTP_TIMEOUT = float(os.environ.get("ASR_HTTP_TIMEOUT", "60"))
+UPLOAD_MAX_BYTES = int(os.environ.get("ASR_UPLOAD_MAX_BYTES", str(50 * 1024 * 1024)))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    client, transport = create_pooled_client("ASR", HTTP_TIMEOUT)
+    app.state.http = client
+    app.state.http_metrics = transport
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+app = FastAPI(title="SOS ASR Service", version="0.1.0", lifespan=lifespan)
 
 
 @app.get("/health")
-async def health() -> Dict[str, Any]:
+async def health(request: Request) -> Dict[str, Any]:
     if not FORWARD_URL:
         return {
             "status": "error",
@@ -37,10 +54,9 @@ async def health() -> Dict[str, Any]:
     backend_info: Dict[str, Any] = {}
     backend_status = "ok"
     try:
-        async with httpx.AsyncClient(timeout=HTTP_TIMEOUT) as client:
-            response = await client.get(f"{FORWARD_URL}/health")
-            response.raise_for_status()
-            backend_info = response.json()
+        response = await request.app.state.http.get(f"{FORWARD_URL}/health")
+        response.raise_for_status()
+        backend_info = response.json()
     except httpx.HTTPError as exc:
         backend_status = "unreachable"
         logger.error("ASR backend health check failed: %s", exc)
@@ -50,46 +66,40 @@ async def health() -> Dict[str, Any]:
         "forward_url": FORWARD_URL,
         "backend_status": backend_status,
         "backend_info": backend_info,
+        "backend_connections": request.app.state.http_metrics.stats(),
     }
 
 
 @app.post("/asr")
 async def asr_endpoint(
+    request: Request,
     audio: UploadFile = File(..., description="Input WAV audio"),
     language: Optional[str] = Form(default=None),
 ) -> JSONResponse:
-    audio_bytes = await audio.read()
-
     if not FORWARD_URL:
         logger.error("ASR request received but ASR_FORWARD_URL is not configured")
         raise HTTPException(status_code=503, detail="ASR backend not configured")
 
-    return await _forward_to_backend(audio_bytes, audio.filename, audio.content_type, language)
+    return await _forward_to_backend(request.app.state.http, audio, language)
 
 
 async def _forward_to_backend(
-    audio_bytes: bytes,
-    filename: Optional[str],
-    content_type: Optional[str],
+    client: httpx.AsyncClient,
+    audio: UploadFile,
     language: Optional[str],
 ) -> JSONResponse:
-    files = {
-        "file": (
-            filename or "input.wav",
-            audio_bytes,
-            content_type or "audio/wav",
-        )
-    }
-    data: Dict[str, Any] = {}
+    data: Dict[str, str] = {}
     if language:
         data["language"] = language
-    async with httpx.AsyncClient(timeout=HTTP_TIMEOUT) as client:
-        try:
-            response = await client.post(f"{FORWARD_URL}/asr", files=files, data=data)
-            response.raise_for_status()
-        except httpx.HTTPError as exc:
-            logger.error("ASR backend request failed: %s", exc)
-            raise HTTPException(status_code=502, detail="ASR backend unavailable") from exc
+    try:
+        headers, body = multipart_upload(audio, field="file", fields=data, max_bytes=UPLOAD_MAX_BYTES)
+        response = await client.post(f"{FORWARD_URL}/asr", content=body, headers=headers)
+        response.raise_for_status()
+    except UploadTooLarge as exc:
+        raise HTTPException(status_code=413, detail=f"Audio upload exceeds {exc.limit} bytes") from exc
+    except httpx.HTTPError as exc:
+        logger.error("ASR backend request failed: %s", exc)
+        raise HTTPException(status_code=502, detail="ASR backend unavailable") from exc
     return JSONResponse(content=response.json())
 
 
@@ -2,16 +2,33 @@
 LLM Client Module
 
 Handles communication with the local LLM via LM Studio's chat completions API.
+
+``LLMClient`` is the blocking client; unless given a ``session`` it sends
+through the process-wide keep-alive session from
+:func:`src.llm.runtime.shared_session`. ``PooledLLMClient`` owns a private
+``requests.Session`` with its own pool size, and
+``AsyncLLMClient`` is the ``httpx`` based equivalent for asyncio callers. All
+three build the same payload, accept separate connect/read timeouts, expose
+``chat`` returning content plus usage/latency telemetry (the same shape as
+``LMStudioRuntime.chat``) and can stream reply tokens from the SSE endpoint.
+
+Requests, parsing, retries and metrics are delegated to
+:class:`src.llm.runtime.LLMRuntime`.
 """
 
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional
 
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
 
+from src.llm.runtime import LLMRuntime, RetryPolicy, shared_session
+from src.llm.sse import parse_sse_delta
+
 
 class LLMClient:
     def __init__(
@@ -22,6 +39,11 @@ class LLMClient:
         temperature: float = 0.7,
         max_tokens: int = -1,
         stream: bool = False,
+        *,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 60.0,
+        session: Optional[requests.Session] = None,
+        retry: Optional[RetryPolicy] = None,
     ):
         self.api_url = api_url
         self.system_prompt = system_prompt
@@ -29,21 +51,18 @@ class LLMClient:
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.stream = stream
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.session = session
+        self.retry = retry
+        self.last_stats: Dict[str, Any] = {}
 
-    def ask(
+    def build_messages(
         self,
         user_input: str,
         context: Optional[Dict[str, Any]] = None,
         history: Optional[Iterable[Dict[str, str]]] = None,
-    ) -> str:
-        """
-        Send a user utterance to the LLM and return the assistant response.
-
-        Args:
-            user_input: Latest user utterance.
-            context: Optional structured context inserted as a system message.
-            history: Prior messages (list of {"role": "...", "content": "..."}).
-        """
+    ) -> List[Dict[str, str]]:
         messages: List[Dict[str, str]] = []
         if self.system_prompt:
             messages.append({"role": "system", "content": self.system_prompt})
@@ -55,21 +74,164 @@ class LLMClient:
                 if "role" in msg and "content" in msg:
                     messages.append({"role": msg["role"], "content": msg["content"]})
         messages.append({"role": "user", "content": user_input})
+        return messages
+
+    def build_payload(self, messages: List[Dict[str, str]], *, stream: Optional[bool] = None) -> Dict[str, Any]:
+        return self.runtime().payload(messages, stream=self.stream if stream is None else stream)
+
+    def runtime(self) -> LLMRuntime:
+        """Runtime configured from this client's current settings."""
+        return LLMRuntime(
+            self.api_url,
+            model=self.model,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            connect_timeout=self.connect_timeout,
+            read_timeout=self.read_timeout,
+            retry=self.retry,
+            sender=self.session or shared_session(),
+        )
+
+    def ask(
+        self,
+        user_input: str,
+        context: Optional[Dict[str, Any]] = None,
+        history: Optional[Iterable[Dict[str, str]]] = None,
+    ) -> str:
+        """
+        Send a user utterance to the LLM and return the assistant response.
+
+        Args:
+            user_input: Latest user utterance.
+            context: Optional structured context inserted as a system message.
+            history: Prior messages (list of {"role": "...", "content": "..."}).
+        """
+        return self.chat(user_input, context=context, history=history)["content"]
+
+    def chat(
+        self,
+        user_input: str,
+        context: Optional[Dict[str, Any]] = None,
+        history: Optional[Iterable[Dict[str, str]]] = None,
+    ) -> Dict[str, Any]:
+        """Like :meth:`ask` but return ``content``, ``usage``, ``tokens``, ``latency`` and ``raw``."""
+        self.last_stats = self.runtime().complete(self.build_messages(user_input, context, history))
+        return self.last_stats
+
+    def stream_tokens(
+        self,
+        user_input: str,
+        context: Optional[Dict[str, Any]] = None,
+        history: Optional[Iterable[Dict[str, str]]] = None,
+    ) -> Iterator[str]:
+        """
+        Yield reply tokens as the server streams them.
+
+        Telemetry for the finished stream (including ``first_token_latency``)
+        is available from ``last_stats`` once the iterator is exhausted.
+        """
+        yield from self.runtime().stream(
+            self.build_messages(user_input, context, history),
+            on_complete=self._set_stats,
+        )
+
+    def _set_stats(self, stats: Dict[str, Any]) -> None:
+        self.last_stats = stats
+
+
+class PooledLLMClient(LLMClient):
+    """
+    ``LLMClient`` backed by a keep-alive ``requests.Session``.
+
+    The session's connection pool holds up to ``pool_size`` connections per
+    host; pass ``session`` to share one pool between several clients.
+    """
+
+    def __init__(self, *args: Any, pool_size: int = 10, session: Optional[requests.Session] = None, **kwargs: Any):
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        super().__init__(*args, session=session, **kwargs)
+
+    def close(self) -> None:
+        if self.session is not None:
+            self.session.close()
 
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": self.temperature,
-            "stream": self.stream,
-        }
-        if self.max_tokens is not None and self.max_tokens >= 0:
-            payload["max_tokens"] = self.max_tokens
-        response = requests.post(self.api_url, json=payload, timeout=60)
+    def __enter__(self) -> "PooledLLMClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class AsyncLLMClient(LLMClient):
+    """
+    asyncio client with the same payload and telemetry as :class:`LLMClient`.
+
+    Owns an ``httpx.AsyncClient`` with keep-alive unless ``client`` is given;
+    use it as an async context manager or call :meth:`aclose`.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        client: Optional[httpx.AsyncClient] = None,
+        max_connections: int = 10,
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(
+            timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    async def ask(  # type: ignore[override]
+        self,
+        user_input: str,
+        context: Optional[Dict[str, Any]] = None,
+        history: Optional[Iterable[Dict[str, str]]] = None,
+    ) -> str:
+        return (await self.chat(user_input, context=context, history=history))["content"]
+
+    async def chat(  # type: ignore[override]
+        self,
+        user_input: str,
+        context: Optional[Dict[str, Any]] = None,
+        history: Optional[Iterable[Dict[str, str]]] = None,
+    ) -> Dict[str, Any]:
         try:
-            response.raise_for_status()
-        except HTTPError as exc:
-            raise HTTPError(f"{exc} | Response body: {response.text}") from exc
-        data = response.json()
-        if "choices" in data and data["choices"]:
-            return data["choices"][0]["message"]["content"]
-        return data.get("response", "")
+            self.last_stats = await self.runtime().acomplete(
+                self.build_messages(user_input, context, history), client=self.client
+            )
+        except httpx.HTTPStatusError as exc:
+            raise HTTPError(f"{exc} | Response body: {exc.response.text}") from exc
+        return self.last_stats
+
+    async def stream_tokens(  # type: ignore[override]
+        self,
+        user_input: str,
+        context: Optional[Dict[str, Any]] = None,
+        history: Optional[Iterable[Dict[str, str]]] = None,
+    ) -> AsyncIterator[str]:
+        async for token in self.runtime().astream(
+            self.build_messages(user_input, context, history),
+            client=self.client,
+            on_complete=self._set_stats,
+        ):
+            yield token
+
+    async def aclose(self) -> None:
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncLLMClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+
+__all__ = ["AsyncLLMClient", "LLMClient", "PooledLLMClient", "parse_sse_delta"]
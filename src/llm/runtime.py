@@ -0,0 +1,477 @@
+"""
+Shared runtime for OpenAI-compatible chat completion calls.
+
+Every LLM path in the project (``LLMClient``, ``LMStudioRuntime``, the
+orchestrator and the chaos harness) goes through :class:`LLMRuntime`, so
+payload building, response parsing, timeouts, retries and metrics behave the
+same everywhere.
+
+Transports are pluggable. Blocking calls use a ``requests``-style sender
+(anything with ``post(url, json=..., timeout=..., stream=...)``); by default
+that is one process-wide keep-alive session. Async calls take an
+``httpx.AsyncClient``, usually the caller's shared client. Both have a plain
+and a streaming (SSE) variant.
+
+Failed attempts are retried with exponential backoff and full jitter when the
+error is a connection problem or a retryable status (429/5xx). Streams are
+only retried until the first token has been yielded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+
+from src.llm.sse import parse_sse_delta
+
+Message = Dict[str, str]
+
+_SESSION: Any = None
+_SESSION_LOCK = threading.Lock()
+
+
+def shared_session(pool_size: int = 16) -> Any:
+    """Process-wide keep-alive ``requests.Session`` used by blocking calls."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
+def build_payload(
+    messages: Sequence[Message],
+    *,
+    model: str,
+    temperature: float,
+    max_tokens: Optional[int] = None,
+    stream: bool = False,
+    response_format: Optional[Dict[str, Any]] = None,
+    cache_prompt: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """
+    Chat completion body; ``max_tokens`` of ``None`` or below zero leaves the server default.
+
+    ``cache_prompt`` is passed through for llama.cpp-style servers, which keep
+    the KV cache of a prompt prefix that repeats across requests.
+    """
+    payload: Dict[str, Any] = {
+        "model": model,
+        "messages": list(messages),
+        "temperature": float(temperature),
+        "stream": bool(stream),
+    }
+    if max_tokens is not None and max_tokens >= 0:
+        payload["max_tokens"] = int(max_tokens)
+    if response_format:
+        payload["response_format"] = response_format
+    if cache_prompt is not None:
+        payload["cache_prompt"] = bool(cache_prompt)
+    return payload
+
+
+def completion_text(data: Any) -> str:
+    """Reply text from an OpenAI-style body, falling back to Ollama's ``response``."""
+    if not isinstance(data, dict):
+        return ""
+    choices = data.get("choices")
+    if isinstance(choices, list) and choices:
+        message = (choices[0] or {}).get("message")
+        if isinstance(message, dict):
+            return message.get("content", "") or ""
+        return ""
+    return data.get("response", "") or ""
+
+
+def token_count(data: Any) -> int:
+    if not isinstance(data, dict):
+        return 0
+    usage = data.get("usage")
+    if isinstance(usage, dict):
+        for key in ("total_tokens", "completion_tokens", "input_tokens", "prompt_tokens"):
+            value = usage.get(key)
+            if isinstance(value, int):
+                return value
+    meta = data.get("meta")
+    if isinstance(meta, dict):
+        for key in ("total_tokens", "tokens"):
+            value = meta.get(key)
+            if isinstance(value, int):
+                return value
+    return 0
+
+
+@dataclass
+class RetryPolicy:
+    """``attempts`` counts the first try; ``1`` disables retries."""
+
+    attempts: int = 1
+    base_delay: float = 0.25
+    max_delay: float = 4.0
+    statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+    def delay(self, attempt: int) -> float:
+        """Full-jitter backoff before retry number ``attempt`` (starting at 1)."""
+        return random.uniform(0.0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+class RuntimeMetrics:
+    """Thread-safe request, retry, token and latency counters."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.tokens = 0
+        self._latency_total = 0.0
+        self._first_token_total = 0.0
+        self._streams = 0
+
+    def record(self, *, ok: bool, latency: float, tokens: int = 0, first_token: Optional[float] = None) -> None:
+        with self._lock:
+            self.requests += 1
+            if not ok:
+                self.errors += 1
+                return
+            self.tokens += tokens
+            self._latency_total += latency
+            if first_token is not None:
+                self._first_token_total += first_token
+                self._streams += 1
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            succeeded = self.requests - self.errors
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "retries": self.retries,
+                "tokens": self.tokens,
+                "avg_latency_sec": round(self._latency_total / succeeded, 4) if succeeded else 0.0,
+                "avg_first_token_sec": round(self._first_token_total / self._streams, 4) if self._streams else 0.0,
+            }
+
+
+METRICS = RuntimeMetrics()
+
+
+class LLMRuntime:
+    """
+    Chat completions against ``url`` with one payload, retry and metrics policy.
+
+    ``complete``/``stream`` are blocking and use ``sender`` (the shared
+    session when omitted); ``acomplete``/``astream`` are their asyncio
+    counterparts over ``client``. ``url`` and ``client`` can be overridden per
+    call, which lets a router pick the backend. Completions return
+    ``content``, ``usage``, ``tokens``, ``latency``, ``attempts`` and ``raw``;
+    streams report the same plus ``first_token_latency`` through
+    ``on_complete``.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        *,
+        model: str = "medicine-llm-13b",
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 60.0,
+        retry: Optional[RetryPolicy] = None,
+        sender: Any = None,
+        client: Optional[httpx.AsyncClient] = None,
+        metrics: Optional[RuntimeMetrics] = None,
+    ) -> None:
+        self.url = url
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retry = retry or RetryPolicy()
+        self.sender = sender
+        self.client = client
+        self.metrics = metrics or METRICS
+
+    # ------------------------------------------------------------------ API
+    def payload(self, messages: Sequence[Message], *, stream: bool = False, **overrides: Any) -> Dict[str, Any]:
+        options = {"model": self.model, "temperature": self.temperature, "max_tokens": self.max_tokens}
+        options.update({key: value for key, value in overrides.items() if value is not None})
+        return build_payload(messages, stream=stream, **options)
+
+    def complete(self, messages: Sequence[Message], *, url: Optional[str] = None, **overrides: Any) -> Dict[str, Any]:
+        payload = self.payload(messages, **overrides)
+        target = self._url(url)
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self._sender().post(target, json=payload, timeout=self._sync_timeout())
+                if self._retryable_status(response, attempt):
+                    self._backoff_sync(attempt)
+                    continue
+                _raise_for_status(response)
+                data = response.json() if response.content else {}
+                break
+            except Exception as exc:
+                if self._retryable_sync_error(exc, attempt):
+                    self._backoff_sync(attempt)
+                    continue
+                self.metrics.record(ok=False, latency=time.perf_counter() - start)
+                raise
+        return self._finish(data, time.perf_counter() - start, attempt)
+
+    def stream(
+        self,
+        messages: Sequence[Message],
+        *,
+        url: Optional[str] = None,
+        on_complete: Optional[Callable[[Dict[str, Any]], None]] = None,
+        **overrides: Any,
+    ) -> Iterator[str]:
+        payload = self.payload(messages, stream=True, **overrides)
+        target = self._url(url)
+        start = time.perf_counter()
+        attempt = 0
+        first_token: Optional[float] = None
+        parts: List[str] = []
+        while True:
+            attempt += 1
+            try:
+                response = self._sender().post(target, json=payload, timeout=self._sync_timeout(), stream=True)
+                if self._retryable_status(response, attempt):
+                    response.close()
+                    self._backoff_sync(attempt)
+                    continue
+                try:
+                    _raise_for_status(response)
+                    for line in response.iter_lines(decode_unicode=True):
+                        token = parse_sse_delta(line or "")
+                        if token:
+                            if first_token is None:
+                                first_token = time.perf_counter() - start
+                            parts.append(token)
+                            yield token
+                finally:
+                    response.close()
+                break
+            except Exception as exc:
+                if first_token is None and self._retryable_sync_error(exc, attempt):
+                    self._backoff_sync(attempt)
+                    continue
+                self.metrics.record(ok=False, latency=time.perf_counter() - start)
+                raise
+        self._finish_stream(parts, start, first_token, attempt, on_complete)
+
+    async def acomplete(
+        self,
+        messages: Sequence[Message],
+        *,
+        url: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        **overrides: Any,
+    ) -> Dict[str, Any]:
+        payload = self.payload(messages, **overrides)
+        target = self._url(url)
+        http = self._client(client)
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = await http.post(target, json=payload, timeout=self._async_timeout())
+                if self._retryable_status(response, attempt):
+                    await self._backoff_async(attempt)
+                    continue
+                response.raise_for_status()
+                data = response.json() if response.content else {}
+                break
+            except httpx.TransportError:
+                if attempt < self.retry.attempts:
+                    await self._backoff_async(attempt)
+                    continue
+                self.metrics.record(ok=False, latency=time.perf_counter() - start)
+                raise
+            except Exception:
+                self.metrics.record(ok=False, latency=time.perf_counter() - start)
+                raise
+        return self._finish(data, time.perf_counter() - start, attempt)
+
+    async def astream(
+        self,
+        messages: Sequence[Message],
+        *,
+        url: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        on_complete: Optional[Callable[[Dict[str, Any]], None]] = None,
+        **overrides: Any,
+    ) -> AsyncIterator[str]:
+        """
+        Yield reply tokens as they arrive.
+
+        Backends that ignore ``stream: true`` and answer with a single JSON
+        body are tolerated; the whole reply is yielded as one token.
+        """
+        payload = self.payload(messages, stream=True, **overrides)
+        target = self._url(url)
+        http = self._client(client)
+        start = time.perf_counter()
+        attempt = 0
+        first_token: Optional[float] = None
+        parts: List[str] = []
+        while True:
+            attempt += 1
+            try:
+                async with http.stream("POST", target, json=payload, timeout=self._async_timeout()) as response:
+                    if self._retryable_status(response, attempt):
+                        await self._backoff_async(attempt)
+                        continue
+                    response.raise_for_status()
+                    if "text/event-stream" not in response.headers.get("content-type", ""):
+                        await response.aread()
+                        content = completion_text(response.json())
+                        if content:
+                            first_token = time.perf_counter() - start
+                            parts.append(content)
+                            yield content
+                    else:
+                        async for line in response.aiter_lines():
+                            token = parse_sse_delta(line)
+                            if token:
+                                if first_token is None:
+                                    first_token = time.perf_counter() - start
+                                parts.append(token)
+                                yield token
+                break
+            except httpx.TransportError:
+                if first_token is None and attempt < self.retry.attempts:
+                    await self._backoff_async(attempt)
+                    continue
+                self.metrics.record(ok=False, latency=time.perf_counter() - start)
+                raise
+            except Exception:
+                self.metrics.record(ok=False, latency=time.perf_counter() - start)
+                raise
+        self._finish_stream(parts, start, first_token, attempt, on_complete)
+
+    # ------------------------------------------------------------- internals
+    def _url(self, url: Optional[str]) -> str:
+        target = url or self.url
+        if not target:
+            raise ValueError("LLMRuntime call needs a URL")
+        return target
+
+    def _sender(self) -> Any:
+        return self.sender if self.sender is not None else shared_session()
+
+    def _client(self, client: Optional[httpx.AsyncClient]) -> httpx.AsyncClient:
+        http = client or self.client
+        if http is None:
+            raise ValueError("LLMRuntime async call needs an httpx.AsyncClient")
+        return http
+
+    def _sync_timeout(self) -> Tuple[float, float]:
+        return (self.connect_timeout, self.read_timeout)
+
+    def _async_timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+
+    def _retryable_status(self, response: Any, attempt: int) -> bool:
+        return attempt < self.retry.attempts and getattr(response, "status_code", None) in self.retry.statuses
+
+    def _retryable_sync_error(self, exc: Exception, attempt: int) -> bool:
+        if attempt >= self.retry.attempts:
+            return False
+        try:
+            import requests
+        except ImportError:  # pragma: no cover - requests ships with the CLI tools
+            return False
+        return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+    def _backoff_sync(self, attempt: int) -> None:
+        self.metrics.record_retry()
+        time.sleep(self.retry.delay(attempt))
+
+    async def _backoff_async(self, attempt: int) -> None:
+        self.metrics.record_retry()
+        await asyncio.sleep(self.retry.delay(attempt))
+
+    def _finish(self, data: Any, latency: float, attempts: int) -> Dict[str, Any]:
+        tokens = token_count(data)
+        self.metrics.record(ok=True, latency=latency, tokens=tokens)
+        return {
+            "content": completion_text(data),
+            "usage": data.get("usage") if isinstance(data, dict) else None,
+            "tokens": tokens,
+            "latency": latency,
+            "attempts": attempts,
+            "raw": data,
+        }
+
+    def _finish_stream(
+        self,
+        parts: List[str],
+        start: float,
+        first_token: Optional[float],
+        attempts: int,
+        on_complete: Optional[Callable[[Dict[str, Any]], None]],
+    ) -> None:
+        latency = time.perf_counter() - start
+        self.metrics.record(ok=True, latency=latency, tokens=len(parts), first_token=first_token)
+        if on_complete is not None:
+            on_complete(
+                {
+                    "content": "".join(parts),
+                    "usage": None,
+                    "tokens": len(parts),
+                    "latency": latency,
+                    "first_token_latency": first_token,
+                    "attempts": attempts,
+                    "raw": None,
+                }
+            )
+
+
+def _raise_for_status(response: Any) -> None:
+    """``raise_for_status`` with the response body appended to the message."""
+    try:
+        response.raise_for_status()
+    except Exception as exc:
+        try:
+            from requests.exceptions import HTTPError
+        except ImportError:  # pragma: no cover
+            raise
+        if isinstance(exc, HTTPError):
+            raise HTTPError(f"{exc} | Response body: {response.text}", response=response) from exc
+        raise
+
+
+__all__ = [
+    "LLMRuntime",
+    "METRICS",
+    "RetryPolicy",
+    "RuntimeMetrics",
+    "build_payload",
+    "completion_text",
+    "shared_session",
+    "token_count",
+]
@@ -0,0 +1,40 @@
+"""
+Parsing helpers for OpenAI-compatible server-sent event streams.
+
+Kept free of HTTP client imports so both the ``requests`` based LLM clients
+and the ``httpx`` based orchestrator can share it.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Optional
+
+
+def parse_sse_delta(line: str) -> Optional[str]:
+    """
+    Extract the content delta from one OpenAI-compatible SSE line.
+
+    Returns ``None`` for keep-alives, comments, ``[DONE]`` and chunks without
+    text content.
+    """
+    line = line.strip()
+    if not line.startswith("data:"):
+        return None
+    data = line[len("data:"):].strip()
+    if not data or data == "[DONE]":
+        return None
+    try:
+        chunk = json.loads(data)
+    except json.JSONDecodeError:
+        return None
+    choices = chunk.get("choices") if isinstance(chunk, dict) else None
+    if not choices:
+        return None
+    first = choices[0] or {}
+    delta = first.get("delta") or first.get("message") or {}
+    content = delta.get("content") if isinstance(delta, dict) else None
+    return content or None
+
+
+__all__ = ["parse_sse_delta"]
@@ -12,7 +12,7 @@ See architecture-overview.md for system context.
 
 # TODO: Implement application startup logic here
 from src.llm.lmstudio_runtime import LMStudioRuntime
-from src.llm.llm_client import LLMClient
+from src.llm.llm_client import PooledLLMClient
 
 
 if __name__ == "__main__":
@@ -25,7 +25,7 @@ if __name__ == "__main__":
     except Exception as exc:  # pragma: no cover - startup diagnostics
         raise SystemExit(f"Failed to prepare LM Studio: {exc}") from exc
 
-    client = LLMClient(
+    client = PooledLLMClient(
         api_url=f"{runtime.base_url.rstrip('/')}/v1/chat/completions",
         system_prompt="You are a clinical reasoning assistant.",
         model=runtime.target_model,
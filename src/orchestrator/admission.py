@@ -0,0 +1,185 @@
+"""
+Admission control in front of the LLM backends.
+
+A single LM Studio instance slows down for everyone when it receives more
+concurrent generations than it can batch, and every caller ends up hitting
+``HTTP_TIMEOUT``. :class:`AdmissionController` caps the number of in-flight
+requests per backend and queues the rest by priority (live audio turns ahead
+of text turns ahead of batch jobs). When the queue is full, or a request waits
+longer than the queue timeout, it is rejected with :class:`Overloaded` so the
+API can answer 503 with ``Retry-After`` immediately instead of timing out.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+PRIORITY_AUDIO = 0
+PRIORITY_TEXT = 1
+PRIORITY_BATCH = 2
+PRIORITY_NAMES = {"audio": PRIORITY_AUDIO, "text": PRIORITY_TEXT, "batch": PRIORITY_BATCH}
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot be admitted; ``retry_after`` is in seconds."""
+
+    def __init__(self, retry_after: int, reason: str) -> None:
+        super().__init__(reason)
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class AdmissionController:
+    """
+    Bounded in-flight counter with a priority wait queue.
+
+    Waiters with equal priority are served first come, first served. A slot
+    released by a finishing request is handed directly to the next waiter, so
+    a burst of new arrivals cannot overtake the queue.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_in_flight: int = 4,
+        max_queue: int = 32,
+        queue_timeout: float = 30.0,
+        on_queue_time: Optional[Callable[[float], None]] = None,
+    ) -> None:
+        self.max_in_flight = max(int(max_in_flight), 1)
+        self.max_queue = max(int(max_queue), 0)
+        self.queue_timeout = max(float(queue_timeout), 0.0)
+        self._on_queue_time = on_queue_time
+        self._in_flight = 0
+        self._waiters: List[Tuple[int, int, "asyncio.Future[None]"]] = []
+        self._sequence = itertools.count()
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._queue_time_total = 0.0
+        self._queued_total = 0
+        self._service_time_total = 0.0
+        self._completed = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def retry_after(self) -> int:
+        """Seconds until a new request would likely get a slot."""
+        average = self._service_time_total / self._completed if self._completed else 1.0
+        waves = (self.queued + 1) / self.max_in_flight
+        return max(1, math.ceil(average * waves))
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_TEXT) -> AsyncIterator[float]:
+        """Hold an in-flight slot for the body; yields the seconds spent queued."""
+        waited = await self._acquire(priority)
+        started = time.perf_counter()
+        try:
+            yield waited
+        finally:
+            self._service_time_total += time.perf_counter() - started
+            self._completed += 1
+            self._release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self._in_flight,
+            "max_in_flight": self.max_in_flight,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_queue_sec": round(self._queue_time_total / self._queued_total, 4) if self._queued_total else 0.0,
+        }
+
+    # ------------------------------------------------------------- internals
+    async def _acquire(self, priority: int) -> float:
+        if self._in_flight < self.max_in_flight and not self.queued:
+            self._in_flight += 1
+            self.admitted += 1
+            self._record_queue_time(0.0, queued=False)
+            return 0.0
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded(self.retry_after(), "LLM queue is full")
+
+        future: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout or None)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                # The slot was granted just as the timeout fired; keep it.
+                pass
+            else:
+                future.cancel()
+                self.timed_out += 1
+                raise Overloaded(self.retry_after(), "timed out waiting for an LLM slot") from None
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()
+            else:
+                future.cancel()
+            raise
+        waited = time.perf_counter() - start
+        self.admitted += 1
+        self._record_queue_time(waited, queued=True)
+        return waited
+
+    def _release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                # Hand the slot straight to the waiter; _in_flight is unchanged.
+                future.set_result(None)
+                return
+        self._in_flight -= 1
+
+    def _record_queue_time(self, waited: float, *, queued: bool) -> None:
+        if queued:
+            self._queue_time_total += waited
+            self._queued_total += 1
+        if self._on_queue_time is not None:
+            self._on_queue_time(waited)
+
+
+class AdmissionRegistry:
+    """One :class:`AdmissionController` per backend URL, created on first use."""
+
+    def __init__(self, **limits: Any) -> None:
+        self._limits = limits
+        self._controllers: Dict[str, AdmissionController] = {}
+
+    def for_backend(self, url: str) -> AdmissionController:
+        controller = self._controllers.get(url)
+        if controller is None:
+            controller = self._controllers[url] = AdmissionController(**self._limits)
+        return controller
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {url: controller.stats() for url, controller in self._controllers.items()}
+
+
+__all__ = [
+    "AdmissionController",
+    "AdmissionRegistry",
+    "Overloaded",
+    "PRIORITY_AUDIO",
+    "PRIORITY_BATCH",
+    "PRIORITY_NAMES",
+    "PRIORITY_TEXT",
+]
@@ -4,34 +4,89 @@ FastAPI orchestrator that coordinates ASR → LLM → TTS for the SOS desktop bu
 
 from __future__ import annotations
 
+import asyncio
 import json
-import uuid
 from contextlib import asynccontextmanager
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 from urllib.parse import urljoin
 
 import httpx
 from fastapi import APIRouter, Depends, FastAPI, File, Form, HTTPException, Request, UploadFile
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.background import BackgroundTask
 from prometheus_client import make_asgi_app
 
-from src.utils.logger import configure_logger, log_turn_metric
+from src.utils.logger import (
+    METRICS_SINK,
+    configure_logger,
+    log_turn_metric,
+    start_metrics_sink,
+    stop_metrics_sink,
+)
 from src.utils import storage
 from src.security.auth import verify_token
-from src.telemetry.otel_config import turns_counter, latency_hist
+from src.telemetry.otel_config import (
+    latency_hist,
+    llm_queue_hist,
+    llm_rejected_counter,
+    phrase_cache_hits,
+    phrase_cache_misses,
+    turns_counter,
+)
 from src.utils.audit_logger import append_audit
+from src.utils.audio_store import AudioStore
+from src.utils.upload_stream import UploadTooLarge, multipart_upload
+from src.llm.runtime import LLMRuntime, RetryPolicy
 
 from . import dashboard, pairing
+from .admission import (
+    PRIORITY_AUDIO,
+    PRIORITY_NAMES,
+    PRIORITY_TEXT,
+    AdmissionRegistry,
+    Overloaded,
+)
+from .history import compact_history
+from .llm_router import LLMRouter
+from .phrase_cache import PhraseCache, load_phrase_file
+from .response_cache import ResponseCache, cache_key
+from .sessions import ConversationStore, SessionNotFound
+from .streaming import SentenceChunker, format_sse
 
 from .config import (
     ASR_API_URL,
+    HISTORY_KEEP_TURNS,
+    HISTORY_TOKEN_BUDGET,
     HTTP_TIMEOUT,
     KOKORO_API_URL,
+    LLM_CONNECT_TIMEOUT,
+    LLM_EJECT_COOLDOWN_SEC,
+    LLM_HEDGE,
+    LLM_MAX_IN_FLIGHT,
+    LLM_MAX_QUEUE,
+    LLM_MODEL,
+    LLM_QUEUE_TIMEOUT_SEC,
+    LLM_RETRIES,
+    LLM_TEMPERATURE,
     ORCHESTRATOR_AUDIO_DIR,
+    ORCHESTRATOR_AUDIO_MAX_BYTES,
+    ORCHESTRATOR_AUDIO_TTL_SEC,
+    ORCHESTRATOR_UPLOAD_MAX_BYTES,
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_TTL_SEC,
+    SESSION_DB_URL,
+    SESSION_IDLE_SEC,
+    SESSION_MAX,
+    SHARED_AUDIO_DIR,
+    TTS_AUDIO_MODE,
+    TTS_PHRASE_WARMUP,
+    TTS_PHRASES_FILE,
     get_llm_url,
+    get_llm_urls,
 )
 
 logger = configure_logger("sos.orchestrator")
@@ -45,6 +100,34 @@ FALLBACK_MESSAGE = (
     "clinical information to help you."
 )
 _MIN_WORDS_FOR_CONFIDENCE = 3
+AUDIO_STORE = AudioStore(
+    SHARED_AUDIO_DIR or ORCHESTRATOR_AUDIO_DIR,
+    max_bytes=ORCHESTRATOR_AUDIO_MAX_BYTES,
+    ttl_sec=ORCHESTRATOR_AUDIO_TTL_SEC,
+    # In a shared directory TTS owns eviction; the orchestrator only reads and adds clips.
+    shared=SHARED_AUDIO_DIR is not None,
+    owner=SHARED_AUDIO_DIR is None,
+)
+PHRASE_CACHE = PhraseCache(
+    AUDIO_STORE,
+    [CLARIFYING_PROMPT, FALLBACK_MESSAGE, *load_phrase_file(TTS_PHRASES_FILE)],
+)
+RESPONSE_CACHE = ResponseCache(max_entries=RESPONSE_CACHE_MAX_ENTRIES, ttl_sec=RESPONSE_CACHE_TTL_SEC)
+LLM_RUNTIME = LLMRuntime(
+    model=LLM_MODEL,
+    temperature=LLM_TEMPERATURE,
+    connect_timeout=LLM_CONNECT_TIMEOUT,
+    read_timeout=HTTP_TIMEOUT,
+    retry=RetryPolicy(attempts=LLM_RETRIES + 1),
+)
+LLM_ROUTER = LLMRouter(get_llm_urls(), hedge=LLM_HEDGE, cooldown_sec=LLM_EJECT_COOLDOWN_SEC)
+LLM_ADMISSION = AdmissionRegistry(
+    max_in_flight=LLM_MAX_IN_FLIGHT,
+    max_queue=LLM_MAX_QUEUE,
+    queue_timeout=LLM_QUEUE_TIMEOUT_SEC,
+    on_queue_time=llm_queue_hist.record,
+)
+SESSIONS = ConversationStore(idle_sec=SESSION_IDLE_SEC, max_sessions=SESSION_MAX, db_url=SESSION_DB_URL)
 
 router = APIRouter()
 
@@ -73,12 +156,20 @@ def require_token(roles: Optional[List[str]] = None):
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     client = httpx.AsyncClient(timeout=HTTP_TIMEOUT)
-    ORCHESTRATOR_AUDIO_DIR.mkdir(parents=True, exist_ok=True)
+    AUDIO_STORE.root.mkdir(parents=True, exist_ok=True)
     app.state.http = client
+    app.state.metrics_sink = start_metrics_sink()
+    warmup = None
+    if TTS_PHRASE_WARMUP:
+        warmup = asyncio.create_task(PHRASE_CACHE.warm(lambda text: _render_tts_clip(client, text)))
     try:
         yield
     finally:
+        if warmup is not None and not warmup.done():
+            warmup.cancel()
         await client.aclose()
+        await asyncio.to_thread(stop_metrics_sink)
+        await asyncio.to_thread(SESSIONS.flush)
 
 
 app = FastAPI(
@@ -132,6 +223,15 @@ async def health() -> Dict[str, Any]:
         "asr_url": ASR_API_URL,
         "tts_url": KOKORO_API_URL,
         "llm_url": get_llm_url(),
+        "tts_audio_mode": TTS_AUDIO_MODE,
+        "audio_store": AUDIO_STORE.stats(),
+        "phrase_cache": PHRASE_CACHE.stats(),
+        "response_cache": dict(RESPONSE_CACHE.stats(), enabled=RESPONSE_CACHE_ENABLED),
+        "sessions": SESSIONS.stats(),
+        "llm_router": LLM_ROUTER.stats(),
+        "llm_admission": LLM_ADMISSION.stats(),
+        "llm_runtime": LLM_RUNTIME.metrics.stats(),
+        "metrics_sink": METRICS_SINK.stats(),
         "secure": SECURE_MODE,
         "summary": summary,
     }
@@ -152,27 +252,31 @@ async def turn(
     enable_tts: bool = Form(default=True),
     language: Optional[str] = Form(default=None),
     history: Optional[str] = Form(default=None),
+    session_id: Optional[str] = Form(default=None),
 ) -> JSONResponse:
     start = time.time()
     audio_url = None
     audio_format = None
     transcript_payload: Dict[str, Any] = {}
     try:
-        audio_bytes = await audio.read()
-        transcript_payload = await _call_asr(request.app.state.http, audio_bytes, audio.filename, language)
+        session_id = session_id or request.headers.get("X-Session-Id")
+        messages, history_saved = await _prepare_history(history, session_id)
+        transcript_payload = await _call_asr(request.app.state.http, audio, language)
         transcript = (transcript_payload.get("text") or "").strip()
-        messages = _parse_history(history)
         response_text, clarifying, fallback_triggered = await _generate_response(
             request.app.state.http,
             transcript,
             messages,
+            priority=_request_priority(request, PRIORITY_AUDIO),
+            cache_prompt=bool(session_id),
         )
+        await _record_session_turn(session_id, transcript, response_text)
 
         if enable_tts and response_text:
             audio_format, audio_url = await _call_tts(request, request.app.state.http, response_text)
 
         total = time.time() - start
-        wav_count = len(list(ORCHESTRATOR_AUDIO_DIR.glob("*.wav")))
+        wav_count = AUDIO_STORE.count
         turns_counter.add(1)
         latency_hist.record(total)
         log_turn_metric(
@@ -185,6 +289,7 @@ async def turn(
                 "secure": SECURE_MODE,
                 "clarifying": clarifying,
                 "fallback": fallback_triggered,
+                "history_tokens_saved": history_saved,
             },
         )
         append_audit(
@@ -208,6 +313,7 @@ async def turn(
             "asr": transcript_payload,
             "clarifying": clarifying,
             "fallback": fallback_triggered,
+            "session_id": session_id,
         }
         return JSONResponse(content=payload)
     except HTTPException as exc:
@@ -240,12 +346,17 @@ async def turn_text(
     try:
         payload = await _extract_turn_text_payload(request)
         transcript = payload["transcript"]
-        messages = _parse_history(payload.get("history"))
+        session_id = payload["session_id"] or request.headers.get("X-Session-Id")
+        messages, history_saved = await _prepare_history(payload.get("history"), session_id)
         response_text, clarifying, fallback_triggered = await _generate_response(
             request.app.state.http,
             transcript,
             messages,
+            use_cache=RESPONSE_CACHE_ENABLED and not _cache_opted_out(request),
+            priority=_request_priority(request, PRIORITY_TEXT),
+            cache_prompt=bool(session_id),
         )
+        await _record_session_turn(session_id, transcript, response_text)
 
         audio_url = None
         audio_format = None
@@ -264,6 +375,7 @@ async def turn_text(
                 "secure": SECURE_MODE,
                 "clarifying": clarifying,
                 "fallback": fallback_triggered,
+                "history_tokens_saved": history_saved,
             },
         )
         append_audit(
@@ -285,6 +397,7 @@ async def turn_text(
             "audio_format": audio_format,
             "clarifying": clarifying,
             "fallback": fallback_triggered,
+            "session_id": session_id,
         }
         return JSONResponse(content=payload_out)
     except HTTPException as exc:
@@ -307,14 +420,119 @@ async def turn_text(
         raise
 
 
+@app.post("/turn/stream")
+async def turn_stream(
+    request: Request,
+    user: dict = Depends(require_token(['clinician', 'admin'])),
+    audio: UploadFile = File(...),
+    enable_tts: bool = Form(default=True),
+    language: Optional[str] = Form(default=None),
+    history: Optional[str] = Form(default=None),
+    session_id: Optional[str] = Form(default=None),
+) -> StreamingResponse:
+    """
+    Streaming variant of ``/turn`` delivered as server-sent events.
+
+    Emits ``transcript`` once ASR completes, ``token`` for each LLM delta,
+    ``audio`` for every synthesized sentence (in order) and a final ``done``
+    event. Failures after the stream has started are reported as ``error``.
+    """
+    start = time.time()
+    try:
+        session_id = session_id or request.headers.get("X-Session-Id")
+        messages, history_saved = await _prepare_history(history, session_id)
+        transcript_payload = await _call_asr(request.app.state.http, audio, language)
+    except Exception as exc:
+        detail = exc.detail if isinstance(exc, HTTPException) else str(exc)
+        log_turn_metric(
+            "turn_stream",
+            ok=False,
+            latency_sec=time.time() - start,
+            extra={"error": detail, "secure": SECURE_MODE},
+        )
+        append_audit("turn_stream_error", user.get("sub", "unknown"), {"error": str(exc)})
+        raise
+
+    events = _turn_stream_events(
+        request,
+        transcript_payload,
+        messages,
+        enable_tts=enable_tts,
+        start=start,
+        user_sub=user.get("sub", "unknown"),
+        history_saved=history_saved,
+        session_id=session_id,
+    )
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/sessions")
+async def create_session(_user: dict = Depends(require_token(["clinician", "admin"]))) -> Dict[str, Any]:
+    """Open a server-side conversation; pass the ID as ``session_id`` on later turns."""
+    return {"session_id": SESSIONS.create(), "idle_sec": SESSIONS.idle_sec}
+
+
+@app.get("/sessions/{session_id}")
+async def get_session(
+    session_id: str,
+    _user: dict = Depends(require_token(["clinician", "admin"])),
+) -> Dict[str, Any]:
+    try:
+        messages = await _session_call(SESSIONS.messages, session_id)
+    except SessionNotFound as exc:
+        raise HTTPException(status_code=404, detail="Session not found or expired.") from exc
+    return {"session_id": session_id, "messages": messages, "prefix": SESSIONS.prefix_digest(session_id)}
+
+
+@app.delete("/sessions/{session_id}")
+async def delete_session(
+    session_id: str,
+    _user: dict = Depends(require_token(["clinician", "admin"])),
+) -> Dict[str, Any]:
+    deleted = await asyncio.to_thread(SESSIONS.delete, session_id) if SESSIONS.persistent else SESSIONS.delete(session_id)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Session not found or expired.")
+    return {"session_id": session_id, "deleted": True}
+
+
 @app.get("/audio/{file_name}")
 async def download_audio(file_name: str):
-    file_path = (ORCHESTRATOR_AUDIO_DIR / file_name).resolve()
-    if not file_path.exists() or ORCHESTRATOR_AUDIO_DIR not in file_path.parents:
+    file_path = AUDIO_STORE.resolve(file_name)
+    if file_path is None:
         raise HTTPException(status_code=404, detail="Audio file not found.")
     return FileResponse(file_path, media_type="audio/wav")
 
 
+@app.get("/audio/tts/{file_name}")
+async def proxy_tts_audio(request: Request, file_name: str):
+    """Stream a clip straight from the TTS service without storing it locally."""
+    if "/" in file_name or file_name.startswith("."):
+        raise HTTPException(status_code=404, detail="Audio file not found.")
+    client: httpx.AsyncClient = request.app.state.http
+    upstream = client.build_request("GET", f"{KOKORO_API_URL.rstrip('/')}/audio/{file_name}")
+    try:
+        response = await client.send(upstream, stream=True)
+    except httpx.HTTPError as exc:
+        logger.error("Failed to proxy TTS audio: %s", exc)
+        raise HTTPException(status_code=502, detail="Failed to fetch TTS audio") from exc
+    if response.status_code >= 400:
+        await response.aclose()
+        raise HTTPException(status_code=404 if response.status_code == 404 else 502, detail="Audio file not found.")
+    headers = {}
+    if "content-length" in response.headers:
+        headers["Content-Length"] = response.headers["content-length"]
+    return StreamingResponse(
+        response.aiter_raw(),
+        media_type=response.headers.get("content-type", "audio/wav"),
+        headers=headers,
+        background=BackgroundTask(response.aclose),
+    )
+
+
 @router.get("/updates/manifest.json")
 async def updates_manifest():
     if not UPDATES_MANIFEST.exists():
@@ -354,6 +572,7 @@ async def _extract_turn_text_payload(request: Request) -> Dict[str, Any]:
         "transcript": transcript,
         "enable_tts": enable_tts,
         "history": data.get("history"),
+        "session_id": data.get("session_id") or None,
     }
 
 
@@ -382,6 +601,56 @@ def _parse_history(history: Optional[Any]) -> Optional[List[Dict[str, str]]]:
     return messages or None
 
 
+async def _session_call(fn: Callable[..., Any], session_id: str, *args: Any, **kwargs: Any) -> Any:
+    """Run a session store call inline, or in a worker thread when it has to reload from the DB."""
+    if SESSIONS.resident(session_id):
+        return fn(session_id, *args, **kwargs)
+    return await asyncio.to_thread(fn, session_id, *args, **kwargs)
+
+
+async def _prepare_history(
+    history: Optional[Any],
+    session_id: Optional[str] = None,
+) -> tuple[Optional[List[Dict[str, str]]], int]:
+    """
+    Load the conversation for ``session_id`` (or parse client ``history``) and
+    fit it to the token budget; returns the messages and tokens saved.
+
+    Sessions compact at checkpoints so their prompt prefix stays stable;
+    client-supplied history is compacted from scratch on every turn.
+    """
+    if session_id:
+        try:
+            messages, saved = await _session_call(
+                SESSIONS.history,
+                session_id,
+                token_budget=HISTORY_TOKEN_BUDGET,
+                keep_turns=HISTORY_KEEP_TURNS,
+            )
+        except SessionNotFound as exc:
+            raise HTTPException(status_code=404, detail="Session not found or expired.") from exc
+        return messages or None, saved
+    return compact_history(
+        _parse_history(history),
+        token_budget=HISTORY_TOKEN_BUDGET,
+        keep_turns=HISTORY_KEEP_TURNS,
+    )
+
+
+async def _record_session_turn(session_id: Optional[str], transcript: str, response_text: str) -> None:
+    if not session_id:
+        return
+    turn = []
+    if transcript:
+        turn.append({"role": "user", "content": transcript})
+    if response_text:
+        turn.append({"role": "assistant", "content": response_text})
+    try:
+        await _session_call(SESSIONS.append, session_id, turn)
+    except SessionNotFound:
+        logger.warning("Session %s expired before the turn completed", session_id)
+
+
 def _needs_clarification(transcript: str) -> bool:
     stripped = transcript.strip()
     if not stripped:
@@ -393,66 +662,155 @@ def _needs_clarification(transcript: str) -> bool:
 
 async def _call_asr(
     client: httpx.AsyncClient,
-    audio_bytes: bytes,
-    filename: Optional[str],
+    audio: UploadFile,
     language: Optional[str],
 ) -> Dict[str, Any]:
-    files = {
-        "audio": (
-            filename or "input.wav",
-            audio_bytes,
-            "audio/wav",
-        )
-    }
-    data: Dict[str, Any] = {}
+    """Stream ``audio`` to the ASR service without reading it into memory."""
+    data: Dict[str, str] = {}
     if language:
         data["language"] = language
     try:
-        response = await client.post(f"{ASR_API_URL.rstrip('/')}/asr", files=files, data=data)
+        headers, body = multipart_upload(
+            audio,
+            field="audio",
+            fields=data,
+            content_type="audio/wav",
+            max_bytes=ORCHESTRATOR_UPLOAD_MAX_BYTES,
+        )
+        response = await client.post(f"{ASR_API_URL.rstrip('/')}/asr", content=body, headers=headers)
         response.raise_for_status()
+    except UploadTooLarge as exc:
+        raise HTTPException(status_code=413, detail=f"Audio upload exceeds {exc.limit} bytes") from exc
     except httpx.HTTPError as exc:
         logger.error("ASR request failed: %s", exc)
         raise HTTPException(status_code=502, detail="ASR service unavailable") from exc
     return response.json()
 
 
-async def _call_llm(
-    client: httpx.AsyncClient,
+def _build_llm_messages(
     transcript: str,
     history: Optional[List[Dict[str, str]]],
-) -> str:
+) -> List[Dict[str, str]]:
     messages: List[Dict[str, str]] = [{"role": "system", "content": "You are a calm emergency medicine assistant."}]
     if history:
         messages.extend(history)
     messages.append({"role": "user", "content": transcript})
+    return messages
+
+
+def _request_priority(request: Request, default: int) -> int:
+    """
+    LLM queue priority for this request. ``X-SOS-Priority`` (audio, text or
+    batch) may only lower the endpoint's default, never raise it.
+    """
+    requested = PRIORITY_NAMES.get(request.headers.get("X-SOS-Priority", "").strip().lower(), default)
+    return max(default, requested)
 
-    payload = {"model": "default", "messages": messages, "temperature": 0.7, "stream": False}
 
-    url = get_llm_url()
+def _overloaded(exc: Overloaded) -> HTTPException:
+    llm_rejected_counter.add(1)
+    logger.warning("LLM admission rejected: %s", exc.reason)
+    return HTTPException(
+        status_code=503,
+        detail=f"LLM busy: {exc.reason}",
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+def _cache_opted_out(request: Request) -> bool:
+    """Clients bypass the response cache with ``Cache-Control: no-cache`` or ``no-store``."""
+    directives = request.headers.get("cache-control", "").lower()
+    return "no-cache" in directives or "no-store" in directives
+
+
+async def _call_llm(
+    client: httpx.AsyncClient,
+    transcript: str,
+    history: Optional[List[Dict[str, str]]],
+    *,
+    use_cache: bool = False,
+    priority: int = PRIORITY_TEXT,
+    cache_prompt: bool = False,
+) -> str:
+    messages = _build_llm_messages(transcript, history)
+    key = cache_key(messages, LLM_MODEL, LLM_TEMPERATURE) if use_cache else None
+    if key is not None:
+        cached = RESPONSE_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+    async def send(url: str) -> Dict[str, Any]:
+        async with LLM_ADMISSION.for_backend(url).slot(priority):
+            with LLM_ROUTER.upstream():
+                return await LLM_RUNTIME.acomplete(messages, url=url, client=client, cache_prompt=cache_prompt or None)
+
     try:
-        response = await client.post(url, json=payload)
-        response.raise_for_status()
+        completion = await LLM_ROUTER.call(send, neutral=(Overloaded,))
+    except Overloaded as exc:
+        raise _overloaded(exc) from exc
     except httpx.HTTPError as exc:
         logger.error("LLM request failed: %s", exc)
         raise HTTPException(status_code=502, detail="LLM service unavailable") from exc
 
-    data = response.json()
-    if "choices" in data and data["choices"]:
-        return data["choices"][0]["message"]["content"]
-    return data.get("response", "")
+    reply = completion["content"]
+    if key is not None and reply and reply.strip():
+        RESPONSE_CACHE.put(key, reply)
+    return reply
+
+
+async def _stream_llm(
+    client: httpx.AsyncClient,
+    transcript: str,
+    history: Optional[List[Dict[str, str]]],
+    *,
+    priority: int = PRIORITY_TEXT,
+    cache_prompt: bool = False,
+) -> AsyncIterator[str]:
+    """
+    Yield reply tokens from the LLM as they arrive.
+
+    Backends that ignore ``stream: true`` and answer with a single JSON body
+    are tolerated; the whole reply is yielded as one token.
+    """
+    messages = _build_llm_messages(transcript, history)
+    try:
+        async with LLM_ROUTER.lease(neutral=(Overloaded,)) as backend:
+            url = backend.url
+            async with LLM_ADMISSION.for_backend(url).slot(priority):
+                with LLM_ROUTER.upstream():
+                    async for delta in LLM_RUNTIME.astream(
+                        messages, url=url, client=client, cache_prompt=cache_prompt or None
+                    ):
+                        yield delta
+    except Overloaded as exc:
+        raise _overloaded(exc) from exc
+    except httpx.HTTPError as exc:
+        logger.error("LLM stream failed: %s", exc)
+        raise HTTPException(status_code=502, detail="LLM service unavailable") from exc
 
 
 async def _generate_response(
     client: httpx.AsyncClient,
     transcript: str,
     history: Optional[List[Dict[str, str]]],
+    *,
+    use_cache: bool = False,
+    priority: int = PRIORITY_TEXT,
+    cache_prompt: bool = False,
 ) -> tuple[str, bool, bool]:
     trimmed = transcript.strip()
     clarifying = _needs_clarification(trimmed)
     if clarifying:
         return CLARIFYING_PROMPT, True, False
 
-    response_text = await _call_llm(client, trimmed, history)
+    response_text = await _call_llm(
+        client,
+        trimmed,
+        history,
+        use_cache=use_cache,
+        priority=priority,
+        cache_prompt=cache_prompt,
+    )
     if not response_text or not response_text.strip():
         return FALLBACK_MESSAGE, False, True
     return response_text, False, False
@@ -463,6 +821,42 @@ async def _call_tts(
     client: httpx.AsyncClient,
     text: str,
 ) -> tuple[str, Optional[str]]:
+    if text in PHRASE_CACHE:
+        cached = PHRASE_CACHE.lookup(text)
+        if cached is not None:
+            phrase_cache_hits.add(1)
+            audio_format, file_path = cached
+        else:
+            phrase_cache_misses.add(1)
+            audio_format, data = await _render_tts_clip(client, text)
+            file_path = PHRASE_CACHE.put(text, audio_format, data)
+            _archive_audio(file_path)
+        return audio_format, str(request.url_for("download_audio", file_name=file_path.name))
+
+    data = await _request_tts(client, text)
+    audio_format = data.get("format", "wav")
+    download_path = data.get("audio_url")
+    if not download_path:
+        return audio_format, None
+
+    if TTS_AUDIO_MODE == "shared":
+        shared_path = AUDIO_STORE.resolve(data.get("file_name") or "")
+        if shared_path is not None:
+            _archive_audio(shared_path)
+            return audio_format, str(request.url_for("download_audio", file_name=shared_path.name))
+        # TTS wrote somewhere else (remote host or forward mode); fall back to a copy.
+
+    if TTS_AUDIO_MODE == "proxy" and not download_path.lower().startswith("http"):
+        file_name = download_path.rstrip("/").rsplit("/", 1)[-1]
+        return audio_format, str(request.url_for("proxy_tts_audio", file_name=file_name))
+
+    file_path = AUDIO_STORE.write(await _download_tts_audio(client, download_path))
+    _archive_audio(file_path)
+
+    return audio_format, str(request.url_for("download_audio", file_name=file_path.name))
+
+
+async def _request_tts(client: httpx.AsyncClient, text: str) -> Dict[str, Any]:
     payload = {"text": text, "format": "wav"}
     try:
         response = await client.post(f"{KOKORO_API_URL.rstrip('/')}/tts", json=payload)
@@ -470,12 +864,10 @@ async def _call_tts(
     except httpx.HTTPError as exc:
         logger.error("TTS request failed: %s", exc)
         raise HTTPException(status_code=502, detail="TTS service unavailable") from exc
+    return response.json()
 
-    data = response.json()
-    download_path = data.get("audio_url")
-    if not download_path:
-        return data.get("format", "wav"), None
 
+async def _download_tts_audio(client: httpx.AsyncClient, download_path: str) -> bytes:
     absolute_url = download_path
     if not download_path.lower().startswith("http"):
         absolute_url = urljoin(f"{KOKORO_API_URL.rstrip('/')}/", download_path.lstrip("/"))
@@ -486,16 +878,159 @@ async def _call_tts(
     except httpx.HTTPError as exc:
         logger.error("Failed to download TTS audio: %s", exc)
         raise HTTPException(status_code=502, detail="Failed to fetch TTS audio") from exc
+    return audio_response.content
+
 
-    file_name = f"{uuid.uuid4().hex}.wav"
-    file_path = ORCHESTRATOR_AUDIO_DIR / file_name
-    file_path.write_bytes(audio_response.content)
+async def _render_tts_clip(client: httpx.AsyncClient, text: str) -> tuple[str, bytes]:
+    """Synthesize ``text`` and return the clip bytes regardless of ``TTS_AUDIO_MODE``."""
+    data = await _request_tts(client, text)
+    download_path = data.get("audio_url")
+    if not download_path:
+        raise HTTPException(status_code=502, detail="TTS returned no audio")
+    return data.get("format", "wav"), await _download_tts_audio(client, download_path)
+
+
+def _archive_audio(file_path: Path) -> None:
     try:
         storage.upload_validation_file(file_path)
     except Exception:
         pass
 
-    return data.get("format", "wav"), str(request.url_for("download_audio", file_name=file_name))
+
+async def _turn_stream_events(
+    request: Request,
+    transcript_payload: Dict[str, Any],
+    history: Optional[List[Dict[str, str]]],
+    *,
+    enable_tts: bool,
+    start: float,
+    user_sub: str,
+    history_saved: int = 0,
+    session_id: Optional[str] = None,
+) -> AsyncIterator[str]:
+    client = request.app.state.http
+    priority = _request_priority(request, PRIORITY_AUDIO)
+    transcript = (transcript_payload.get("text") or "").strip()
+    yield format_sse("transcript", {"transcript": transcript, "asr": transcript_payload})
+
+    events: asyncio.Queue = asyncio.Queue()
+    sentences: asyncio.Queue = asyncio.Queue()
+    outcome: Dict[str, Any] = {"response_text": "", "clarifying": False, "fallback": False}
+
+    async def generate() -> None:
+        try:
+            if _needs_clarification(transcript):
+                outcome["response_text"] = CLARIFYING_PROMPT
+                outcome["clarifying"] = True
+                await events.put(("token", {"text": CLARIFYING_PROMPT}))
+                await sentences.put(CLARIFYING_PROMPT)
+                return
+
+            chunker = SentenceChunker()
+            parts: List[str] = []
+            async for token in _stream_llm(
+                client, transcript, history, priority=priority, cache_prompt=bool(session_id)
+            ):
+                parts.append(token)
+                await events.put(("token", {"text": token}))
+                for sentence in chunker.feed(token):
+                    await sentences.put(sentence)
+            tail = chunker.flush()
+            response_text = "".join(parts)
+            if not response_text.strip():
+                outcome["response_text"] = FALLBACK_MESSAGE
+                outcome["fallback"] = True
+                await events.put(("token", {"text": FALLBACK_MESSAGE}))
+                await sentences.put(FALLBACK_MESSAGE)
+                return
+            outcome["response_text"] = response_text
+            if tail:
+                await sentences.put(tail)
+        finally:
+            await sentences.put(None)
+
+    async def synthesize() -> None:
+        index = 0
+        while True:
+            sentence = await sentences.get()
+            if sentence is None:
+                return
+            if not enable_tts:
+                continue
+            audio_format, audio_url = await _call_tts(request, client, sentence)
+            if "first_audio_sec" not in outcome:
+                outcome["first_audio_sec"] = time.time() - start
+            await events.put(
+                (
+                    "audio",
+                    {"index": index, "text": sentence, "audio_url": audio_url, "audio_format": audio_format},
+                )
+            )
+            index += 1
+
+    tasks = [asyncio.create_task(generate()), asyncio.create_task(synthesize())]
+    pipeline = asyncio.gather(*tasks)
+    pipeline.add_done_callback(lambda _: events.put_nowait(None))
+    try:
+        while True:
+            item = await events.get()
+            if item is None:
+                break
+            yield format_sse(*item)
+        await pipeline
+    except Exception as exc:
+        detail = exc.detail if isinstance(exc, HTTPException) else str(exc)
+        log_turn_metric(
+            "turn_stream",
+            ok=False,
+            latency_sec=time.time() - start,
+            extra={"error": detail, "secure": SECURE_MODE},
+        )
+        append_audit("turn_stream_error", user_sub, {"error": str(exc)})
+        yield format_sse("error", {"detail": detail})
+        return
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    total = time.time() - start
+    response_text = outcome["response_text"]
+    await _record_session_turn(session_id, transcript, response_text)
+    turns_counter.add(1)
+    latency_hist.record(total)
+    log_turn_metric(
+        "turn_stream",
+        ok=True,
+        latency_sec=total,
+        extra={
+            "reply_len": len(response_text or ""),
+            "first_audio_sec": round(outcome["first_audio_sec"], 3) if "first_audio_sec" in outcome else None,
+            "secure": SECURE_MODE,
+            "clarifying": outcome["clarifying"],
+            "fallback": outcome["fallback"],
+            "history_tokens_saved": history_saved,
+        },
+    )
+    append_audit(
+        "turn_stream",
+        user_sub,
+        {
+            "reply_len": len(response_text or ""),
+            "clarifying": outcome["clarifying"],
+            "fallback": outcome["fallback"],
+        },
+    )
+    yield format_sse(
+        "done",
+        {
+            "transcript": transcript,
+            "response_text": response_text,
+            "reply": response_text,
+            "clarifying": outcome["clarifying"],
+            "fallback": outcome["fallback"],
+            "latency_sec": round(total, 3),
+        },
+    )
 
 
 if __name__ == "__main__":  # pragma: no cover - manual launch
@@ -4,6 +4,9 @@ Environment-driven configuration helpers for the SOS orchestrator.
 
 import os
 from pathlib import Path
+from typing import List
+
+from src.utils.audio_store import shared_audio_dir
 
 ASR_API_URL = os.getenv("ASR_API_URL", "http://127.0.0.1:9001")
 KOKORO_API_URL = os.getenv("KOKORO_API_URL", "http://127.0.0.1:8880")
@@ -18,7 +21,47 @@ LLM_OLLAMA_URL = os.getenv("LLM_OLLAMA_URL", "http://127.0.0.1:11434/v1/chat/com
 DEFAULT_LLM_URL = "http://100.111.223.74:1234/v1/chat/completions"
 
 LLM_API_URL = os.getenv("LLM_API_URL") or (LM_LOCAL_URL if USE_LOCAL_LLM else DEFAULT_LLM_URL)
+LLM_MODEL = os.getenv("ORCHESTRATOR_LLM_MODEL", "default")
+LLM_TEMPERATURE = float(os.getenv("ORCHESTRATOR_LLM_TEMPERATURE", "0.7"))
+# LLM backend pool. Hedging re-sends a slow request to a second backend once
+# the first has exceeded its recent p95 latency.
+LLM_USE_OLLAMA = os.getenv("ORCHESTRATOR_LLM_USE_OLLAMA", "false").lower() == "true"
+LLM_HEDGE = os.getenv("ORCHESTRATOR_LLM_HEDGE", "false").lower() == "true"
+LLM_EJECT_COOLDOWN_SEC = float(os.getenv("ORCHESTRATOR_LLM_EJECT_COOLDOWN_SEC", "10"))
+# Retries (with jittered backoff) on the same backend for connection errors
+# and 429/5xx answers; 0 leaves failover to the router.
+LLM_RETRIES = int(os.getenv("ORCHESTRATOR_LLM_RETRIES", "0"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("ORCHESTRATOR_LLM_CONNECT_TIMEOUT", "5"))
+# Admission control per LLM backend: concurrent generations, waiting requests
+# and how long a request may wait before it is answered with 503.
+LLM_MAX_IN_FLIGHT = int(os.getenv("ORCHESTRATOR_LLM_MAX_IN_FLIGHT", "4"))
+LLM_MAX_QUEUE = int(os.getenv("ORCHESTRATOR_LLM_MAX_QUEUE", "32"))
+LLM_QUEUE_TIMEOUT_SEC = float(os.getenv("ORCHESTRATOR_LLM_QUEUE_TIMEOUT_SEC", "30"))
+# Reuse /turn_text replies for identical prompts. Off by default: with a
+# non-zero temperature a cached reply hides the model's sampling variance.
+RESPONSE_CACHE_ENABLED = os.getenv("ORCHESTRATOR_RESPONSE_CACHE", "false").lower() == "true"
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("ORCHESTRATOR_RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+RESPONSE_CACHE_TTL_SEC = float(os.getenv("ORCHESTRATOR_RESPONSE_CACHE_TTL_SEC", "3600"))
+# Client history above this many words is compacted; 0 disables compaction.
+HISTORY_TOKEN_BUDGET = int(os.getenv("ORCHESTRATOR_HISTORY_TOKEN_BUDGET", "1024"))
+HISTORY_KEEP_TURNS = int(os.getenv("ORCHESTRATOR_HISTORY_KEEP_TURNS", "4"))
+SESSION_IDLE_SEC = float(os.getenv("ORCHESTRATOR_SESSION_IDLE_SEC", "1800"))
+SESSION_MAX = int(os.getenv("ORCHESTRATOR_SESSION_MAX", "1000"))
+# Optional SQLAlchemy URL (sqlite:///... or postgresql://...) backing the session store.
+SESSION_DB_URL = os.getenv("ORCHESTRATOR_SESSION_DB_URL")
 ORCHESTRATOR_AUDIO_DIR = Path(os.getenv("ORCHESTRATOR_AUDIO_DIR", "_validation/orchestrator_audio")).resolve()
+ORCHESTRATOR_AUDIO_MAX_BYTES = int(os.getenv("ORCHESTRATOR_AUDIO_MAX_BYTES", str(512 * 1024 * 1024)))
+ORCHESTRATOR_AUDIO_TTL_SEC = float(os.getenv("ORCHESTRATOR_AUDIO_TTL_SEC", "86400"))
+ORCHESTRATOR_UPLOAD_MAX_BYTES = int(os.getenv("ORCHESTRATOR_UPLOAD_MAX_BYTES", str(50 * 1024 * 1024)))
+SHARED_AUDIO_DIR = shared_audio_dir()
+# How TTS clips reach the client:
+#   download - fetch the clip from TTS and keep a copy under ORCHESTRATOR_AUDIO_DIR
+#   shared   - TTS writes into SOS_SHARED_AUDIO_DIR and the orchestrator serves it in place
+#   proxy    - stream the clip from TTS when the client requests it, nothing stored locally
+TTS_AUDIO_MODE = os.getenv("ORCHESTRATOR_TTS_AUDIO_MODE", "shared" if SHARED_AUDIO_DIR else "download").lower()
+# Extra phrases (one per line) to pre-render alongside the canned replies.
+TTS_PHRASES_FILE = Path(os.getenv("ORCHESTRATOR_TTS_PHRASES_FILE", "data/tts_phrases.txt"))
+TTS_PHRASE_WARMUP = os.getenv("ORCHESTRATOR_TTS_PHRASE_WARMUP", "true").lower() == "true"
 HTTP_TIMEOUT = float(os.getenv("ORCHESTRATOR_HTTP_TIMEOUT", "60"))
 TOKEN_SECRET = os.getenv("TOKEN_SECRET", "change-me")
 
@@ -31,6 +74,20 @@ def get_llm_url() -> str:
     return os.getenv("LLM_API_URL", "http://100.111.223.74:1234/v1/chat/completions")
 
 
+def get_llm_urls() -> List[str]:
+    """
+    Backend pool for the LLM router: ``ORCHESTRATOR_LLM_URLS`` (comma separated)
+    or the single :func:`get_llm_url`, plus ``LLM_OLLAMA_URL`` when
+    ``ORCHESTRATOR_LLM_USE_OLLAMA=true``.
+    """
+    urls = [url.strip() for url in os.getenv("ORCHESTRATOR_LLM_URLS", "").split(",") if url.strip()]
+    if not urls:
+        urls = [get_llm_url()]
+    if LLM_USE_OLLAMA and LLM_OLLAMA_URL not in urls:
+        urls.append(LLM_OLLAMA_URL)
+    return urls
+
+
 __all__ = [
     "ASR_API_URL",
     "KOKORO_API_URL",
@@ -42,8 +99,34 @@ __all__ = [
     "LLM_MODE",
     "LM_LOCAL_URL",
     "LLM_OLLAMA_URL",
+    "LLM_MODEL",
+    "LLM_TEMPERATURE",
+    "LLM_USE_OLLAMA",
+    "LLM_HEDGE",
+    "LLM_EJECT_COOLDOWN_SEC",
+    "LLM_RETRIES",
+    "LLM_CONNECT_TIMEOUT",
+    "LLM_MAX_IN_FLIGHT",
+    "LLM_MAX_QUEUE",
+    "LLM_QUEUE_TIMEOUT_SEC",
+    "RESPONSE_CACHE_ENABLED",
+    "RESPONSE_CACHE_MAX_ENTRIES",
+    "RESPONSE_CACHE_TTL_SEC",
+    "HISTORY_TOKEN_BUDGET",
+    "HISTORY_KEEP_TURNS",
+    "SESSION_IDLE_SEC",
+    "SESSION_MAX",
+    "SESSION_DB_URL",
     "HTTP_TIMEOUT",
     "TOKEN_SECRET",
     "ORCHESTRATOR_AUDIO_DIR",
+    "ORCHESTRATOR_AUDIO_MAX_BYTES",
+    "ORCHESTRATOR_AUDIO_TTL_SEC",
+    "ORCHESTRATOR_UPLOAD_MAX_BYTES",
+    "SHARED_AUDIO_DIR",
+    "TTS_AUDIO_MODE",
+    "TTS_PHRASES_FILE",
+    "TTS_PHRASE_WARMUP",
     "get_llm_url",
+    "get_llm_urls",
 ]
@@ -0,0 +1,186 @@
+"""
+Token-budgeted compaction of client-supplied chat history.
+
+Long OR sessions resend every previous turn, so prompt prefill grows with the
+session. When the history exceeds the budget, system messages and the most
+recent turns are kept verbatim and everything older is folded into a single
+SBAR summary produced by :meth:`SBARManager.serialize_for_llm`. When nothing
+stable survives the SBAR consensus, the tail of the older turns is kept
+verbatim instead, so they never vanish without a trace. If the recent turns
+alone overrun the budget, the oldest of them are folded in as well.
+
+Server-side sessions use :func:`fold_point` and :func:`summary_message` to
+compact at checkpoints instead: the summary is frozen when it is built and
+later turns are appended after it, so the prompt prefix stays stable until
+the budget is exceeded again.
+
+Token counts are whitespace word counts, matching ``ContextManager``.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.sbar_manager import SBARManager
+
+SUMMARY_PREFIX = "Earlier in this case (SBAR summary):"
+DIGEST_PREFIX = "Earlier in this case (verbatim, truncated):"
+
+# Rough routing of free-text turns into SBAR fields. Anything that does not
+# match is treated as an assessment.
+_FIELD_PATTERNS = (
+    (
+        "background",
+        re.compile(
+            r"\b(history|pmh|year[- ]old|yo|allerg\w*|medications?|surgery|post-?op|"
+            r"diabetes|hypertension|asthma)\b"
+        ),
+    ),
+    (
+        "situation",
+        re.compile(
+            r"\b(sats?|spo2|o2|oxygen|desat\w*|hr|heart rate|pulse|bp|blood pressure|"
+            r"etco2|rhythm|tachy\w*|brady\w*|hypotens\w*)\b"
+        ),
+    ),
+    (
+        "recommendation",
+        re.compile(r"\b(give|start|push|call|administer|intubate|bolus|dose|mg|mcg|cpr|compressions|epi\w*)\b"),
+    ),
+)
+
+
+def count_tokens(messages: List[Dict[str, str]]) -> int:
+    return sum(len(str(message.get("content", "")).split()) for message in messages)
+
+
+def _sbar_field(message: Dict[str, str]) -> str:
+    if message.get("role") == "assistant":
+        return "recommendation"
+    text = str(message.get("content", "")).lower()
+    for field, pattern in _FIELD_PATTERNS:
+        if pattern.search(text):
+            return field
+    return "assessment"
+
+
+def summarize_turns(messages: List[Dict[str, str]]) -> str:
+    """Fold ``messages`` into an SBAR line; empty when nothing stable remains."""
+    manager = SBARManager()
+    for message in messages:
+        content = str(message.get("content", "")).strip()
+        if content:
+            manager.update_field(_sbar_field(message), content, 0.8, source=message.get("role", "user"))
+    return manager.serialize_for_llm()
+
+
+def _truncate_words(text: str, max_tokens: int, *, keep_tail: bool) -> str:
+    words = text.split()
+    if len(words) <= max_tokens:
+        return text
+    # One token goes to the "..." marker.
+    keep = max(max_tokens - 1, 0)
+    kept = words[len(words) - keep :] if keep_tail else words[:keep]
+    return ("... " + " ".join(kept)) if keep_tail else (" ".join(kept) + " ...")
+
+
+def summary_message(messages: List[Dict[str, str]], max_tokens: int) -> Optional[Dict[str, str]]:
+    """
+    One system message standing in for ``messages`` within ``max_tokens``.
+
+    Prefers the SBAR summary; falls back to the most recent words of the
+    turns themselves. Returns ``None`` when not even the prefix fits.
+    """
+    summary = summarize_turns(messages)
+    prefix = SUMMARY_PREFIX if summary else DIGEST_PREFIX
+    room = max_tokens - len(prefix.split())
+    if room <= 0:
+        return None
+    if summary:
+        body = _truncate_words(summary, room, keep_tail=False)
+    else:
+        digest = " ".join(
+            f"{message.get('role', 'user')}: {str(message.get('content', '')).strip()}"
+            for message in messages
+            if str(message.get("content", "")).strip()
+        )
+        if not digest:
+            return None
+        body = _truncate_words(digest, room, keep_tail=True)
+    return {"role": "system", "content": f"{prefix} {body}"}
+
+
+def fold_point(
+    dialogue: List[Dict[str, str]],
+    *,
+    token_budget: int,
+    keep_turns: int,
+    reserved: int = 0,
+) -> int:
+    """
+    Index splitting ``dialogue`` into the part to summarize and the part kept verbatim.
+
+    The last ``keep_turns`` turns are kept, but they give way (oldest first)
+    until they fit in three quarters of ``token_budget`` minus ``reserved``,
+    leaving the rest for the summary. The final message is always kept.
+    """
+    split = len(dialogue)
+    turns = 0
+    while split > 0 and turns < max(keep_turns, 0):
+        split -= 1
+        if dialogue[split].get("role") == "user":
+            turns += 1
+    recent_budget = token_budget - token_budget // 4 - reserved
+    while split < len(dialogue) - 1 and count_tokens(dialogue[split:]) > recent_budget:
+        split += 1
+    return split
+
+
+def compact_history(
+    messages: Optional[List[Dict[str, str]]],
+    *,
+    token_budget: int,
+    keep_turns: int,
+) -> Tuple[Optional[List[Dict[str, str]]], int]:
+    """
+    Return ``(messages, tokens_saved)`` with the history fitted to ``token_budget``.
+
+    A turn starts at a user message; the last ``keep_turns`` turns and all
+    system messages are kept verbatim unless the kept turns take more than
+    three quarters of the budget, in which case the oldest of them are folded
+    into the summary too.
+    Only system messages plus the final message can still exceed the budget.
+    ``token_budget`` of ``0`` disables compaction.
+    """
+    if not messages or token_budget <= 0:
+        return messages, 0
+    before = count_tokens(messages)
+    if before <= token_budget:
+        return messages, 0
+
+    system = [message for message in messages if message.get("role") == "system"]
+    dialogue = [message for message in messages if message.get("role") != "system"]
+    fixed = count_tokens(system)
+    split = fold_point(dialogue, token_budget=token_budget, keep_turns=keep_turns, reserved=fixed)
+    older, recent = dialogue[:split], dialogue[split:]
+    if not older:
+        return messages, 0
+
+    compacted = list(system)
+    summary = summary_message(older, token_budget - fixed - count_tokens(recent))
+    if summary is not None:
+        compacted.append(summary)
+    compacted.extend(recent)
+    return compacted, max(before - count_tokens(compacted), 0)
+
+
+__all__ = [
+    "DIGEST_PREFIX",
+    "SUMMARY_PREFIX",
+    "compact_history",
+    "count_tokens",
+    "fold_point",
+    "summarize_turns",
+    "summary_message",
+]
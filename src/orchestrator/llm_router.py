@@ -0,0 +1,321 @@
+"""
+Latency-aware routing across several OpenAI-compatible LLM endpoints.
+
+The orchestrator can spread generations over a pool of backends (LM Studio on
+several GPU boxes, Ollama via ``LLM_OLLAMA_URL``, ...). For every backend the
+router tracks outstanding requests, an EWMA of latency and of the error rate,
+and picks the backend with the fewest outstanding requests (lowest EWMA
+latency breaks ties).
+
+A backend that fails repeatedly is ejected. After a cool-down it is half-open:
+exactly one probe request is let through, and its outcome decides whether the
+backend rejoins the pool or stays ejected.
+
+Optionally a request is hedged. If the first backend has not answered by its
+recent p95 latency, the same request is sent to a second backend and the
+first answer wins.
+
+Only the upstream call is timed. Callers that queue locally before talking to
+the backend (admission slots) wrap the actual request in
+:meth:`LLMRouter.upstream`; the wait before it counts neither towards the
+backend's EWMA/p95 nor towards the hedge delay. Without the marker the whole
+attempt is timed and hedging never triggers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from src.utils.logger import configure_logger
+
+logger = configure_logger("sos.orchestrator.llm_router")
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class Backend:
+    url: str
+    outstanding: int = 0
+    ewma_latency: float = 0.0
+    ewma_error: float = 0.0
+    requests: int = 0
+    errors: int = 0
+    consecutive_failures: int = 0
+    state: str = CLOSED
+    opened_at: float = 0.0
+    probing: bool = False
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=200))
+
+    def p95(self, min_samples: int) -> Optional[float]:
+        if len(self.latencies) < min_samples:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "errors": self.errors,
+            "ewma_latency_sec": round(self.ewma_latency, 4),
+            "ewma_error_rate": round(self.ewma_error, 4),
+        }
+
+
+@dataclass
+class _Attempt:
+    backend: Backend
+    started: asyncio.Event = field(default_factory=asyncio.Event)
+    latency: Optional[float] = None
+    released: bool = False
+
+
+_CURRENT: ContextVar[Optional[_Attempt]] = ContextVar("llm_router_attempt", default=None)
+
+
+class LLMRouter:
+    """
+    Pick a backend per request and keep its health statistics.
+
+    ``eject_after`` consecutive failures, or an EWMA error rate above
+    ``eject_error_rate`` once ``min_samples`` requests have been seen, eject a
+    backend for ``cooldown_sec``. Hedging needs ``min_samples`` latencies on
+    the first backend before it kicks in.
+    """
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        *,
+        alpha: float = 0.2,
+        eject_after: int = 3,
+        eject_error_rate: float = 0.5,
+        cooldown_sec: float = 10.0,
+        hedge: bool = False,
+        min_samples: int = 20,
+    ) -> None:
+        unique = list(dict.fromkeys(url.strip() for url in urls if url and url.strip()))
+        if not unique:
+            raise ValueError("LLMRouter needs at least one backend URL")
+        self.backends: List[Backend] = [Backend(url) for url in unique]
+        self.alpha = alpha
+        self.eject_after = max(int(eject_after), 1)
+        self.eject_error_rate = eject_error_rate
+        self.cooldown_sec = max(float(cooldown_sec), 0.0)
+        self.hedge = hedge
+        self.min_samples = max(int(min_samples), 1)
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    # ------------------------------------------------------------------ API
+    def pick(self, exclude: Tuple[str, ...] = ()) -> Backend:
+        """Return the backend for the next request, preferring healthy ones."""
+        now = time.monotonic()
+        candidates = []
+        for backend in self.backends:
+            if backend.url in exclude:
+                continue
+            if backend.state == OPEN and now - backend.opened_at >= self.cooldown_sec:
+                backend.state = HALF_OPEN
+            if backend.state == CLOSED or (backend.state == HALF_OPEN and not backend.probing):
+                candidates.append(backend)
+        if not candidates:
+            # Everything is ejected: fail open to the backend that was ejected first.
+            pool = [backend for backend in self.backends if backend.url not in exclude] or self.backends
+            return min(pool, key=lambda backend: backend.opened_at)
+        return min(candidates, key=lambda backend: (backend.outstanding, backend.ewma_latency))
+
+    @asynccontextmanager
+    async def lease(
+        self,
+        exclude: Tuple[str, ...] = (),
+        *,
+        neutral: Tuple[Type[BaseException], ...] = (),
+    ) -> AsyncIterator[Backend]:
+        """
+        Reserve a backend for the body and record its latency and outcome.
+
+        Exceptions listed in ``neutral`` (for example local admission
+        rejections) do not count against the backend; cancellation is not
+        recorded at all.
+        """
+        async with self._hold(self._acquire(self.pick(exclude)), neutral) as attempt:
+            yield attempt.backend
+
+    @staticmethod
+    @contextmanager
+    def upstream() -> Iterator[None]:
+        """Mark the backend call inside ``send`` or a lease body; only this part is timed."""
+        attempt = _CURRENT.get()
+        if attempt is None:
+            yield
+            return
+        started = time.perf_counter()
+        attempt.started.set()
+        try:
+            yield
+        finally:
+            attempt.latency = time.perf_counter() - started
+
+    async def call(
+        self,
+        send: Callable[[str], Awaitable[T]],
+        *,
+        neutral: Tuple[Type[BaseException], ...] = (),
+        hedge: Optional[bool] = None,
+    ) -> T:
+        """Run ``send(url)`` on the chosen backend, hedging to a second one if enabled."""
+        primary = self._acquire(self.pick())
+        delay = None
+        if (self.hedge if hedge is None else hedge) and len(self.backends) > 1:
+            delay = primary.backend.p95(self.min_samples)
+
+        async def run(attempt: _Attempt) -> T:
+            async with self._hold(attempt, neutral) as held:
+                return await send(held.backend.url)
+
+        if delay is None:
+            return await run(primary)
+
+        first = asyncio.ensure_future(run(primary))
+        attempts = [primary]
+        pending = {first}
+        try:
+            # The hedge clock starts when the primary reaches its backend, not
+            # while it waits for a local admission slot.
+            reached = asyncio.ensure_future(primary.started.wait())
+            pending.add(reached)
+            await asyncio.wait({first, reached}, return_when=asyncio.FIRST_COMPLETED)
+            reached.cancel()
+            pending.discard(reached)
+            if not first.done():
+                await asyncio.wait({first}, timeout=delay)
+            if first.done():
+                return first.result()
+
+            self.hedged += 1
+            attempts.append(self._acquire(self.pick((primary.backend.url,))))
+            secondary = asyncio.ensure_future(run(attempts[-1]))
+            pending.add(secondary)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is secondary:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            assert error is not None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+            # A task cancelled before its first step never enters _hold; release
+            # its slot here (a no-op for attempts that already finished).
+            for attempt in attempts:
+                self._release(attempt, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backends": {backend.url: backend.stats() for backend in self.backends},
+            "hedge": self.hedge,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+        }
+
+    # ------------------------------------------------------------- internals
+    def _acquire(self, backend: Backend) -> _Attempt:
+        """Count the request against ``backend`` right away, before any await."""
+        if backend.state == HALF_OPEN:
+            backend.probing = True
+        backend.outstanding += 1
+        return _Attempt(backend)
+
+    @asynccontextmanager
+    async def _hold(self, attempt: _Attempt, neutral: Tuple[Type[BaseException], ...]) -> AsyncIterator[_Attempt]:
+        token = _CURRENT.set(attempt)
+        started = time.perf_counter()
+        outcome: Optional[bool] = None
+        try:
+            yield attempt
+            outcome = True
+        except asyncio.CancelledError:
+            raise
+        except neutral:
+            raise
+        except Exception:
+            outcome = False
+            raise
+        finally:
+            _CURRENT.reset(token)
+            if attempt.latency is None:
+                attempt.latency = time.perf_counter() - started
+            self._release(attempt, outcome)
+
+    def _release(self, attempt: _Attempt, outcome: Optional[bool]) -> None:
+        if attempt.released:
+            return
+        attempt.released = True
+        attempt.backend.outstanding -= 1
+        attempt.backend.probing = False
+        if outcome is not None:
+            self._record(attempt.backend, attempt.latency or 0.0, outcome)
+
+    def _record(self, backend: Backend, latency: float, ok: bool) -> None:
+        backend.requests += 1
+        error = 0.0 if ok else 1.0
+        if backend.requests == 1:
+            backend.ewma_error = error
+        else:
+            backend.ewma_error += self.alpha * (error - backend.ewma_error)
+        if ok:
+            backend.latencies.append(latency)
+            if backend.ewma_latency == 0.0:
+                backend.ewma_latency = latency
+            else:
+                backend.ewma_latency += self.alpha * (latency - backend.ewma_latency)
+            backend.consecutive_failures = 0
+            if backend.state != CLOSED:
+                logger.info("LLM backend %s recovered", backend.url)
+            backend.state = CLOSED
+            return
+
+        backend.errors += 1
+        backend.consecutive_failures += 1
+        unhealthy = backend.consecutive_failures >= self.eject_after or (
+            backend.requests >= self.min_samples and backend.ewma_error > self.eject_error_rate
+        )
+        if backend.state == HALF_OPEN or (backend.state == CLOSED and unhealthy):
+            logger.warning("Ejecting LLM backend %s for %.0fs", backend.url, self.cooldown_sec)
+            backend.state = OPEN
+            backend.opened_at = time.monotonic()
+
+
+__all__ = ["Backend", "LLMRouter"]
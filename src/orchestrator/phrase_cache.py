@@ -0,0 +1,107 @@
+"""
+Pre-rendered audio for canned orchestrator replies.
+
+``CLARIFYING_PROMPT``, ``FALLBACK_MESSAGE`` and any phrase listed in
+``ORCHESTRATOR_TTS_PHRASES_FILE`` are synthesized once (at startup, or on first
+use if TTS was not reachable then) and kept in the orchestrator audio store
+under a name derived from the phrase, so later turns skip the TTS round trip.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from src.utils.audio_store import AudioStore
+from src.utils.logger import configure_logger
+
+logger = configure_logger("sos.orchestrator.phrases")
+
+Renderer = Callable[[str], Awaitable[Tuple[str, bytes]]]
+
+
+def normalize_phrase(text: str) -> str:
+    return " ".join(text.split())
+
+
+def load_phrase_file(path: Optional[Path]) -> list[str]:
+    """Read one phrase per line, ignoring blanks and ``#`` comments."""
+    if path is None or not path.exists():
+        return []
+    phrases = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            phrases.append(line)
+    return phrases
+
+
+class PhraseCache:
+    """
+    Map frequent phrases to clips held in an :class:`AudioStore`.
+
+    Only registered phrases are cached. A clip that the store has evicted is
+    treated as a miss and rendered again on the next request.
+    """
+
+    def __init__(self, store: AudioStore, phrases: Iterable[str] = ()) -> None:
+        self.store = store
+        self._formats: Dict[str, str] = {}
+        self._names: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+        for phrase in phrases:
+            self.add(phrase)
+
+    def add(self, text: str) -> None:
+        key = normalize_phrase(text)
+        if key and key not in self._names:
+            digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+            self._names[key] = f"phrase-{digest[:32]}{self.store.suffix}"
+
+    def __contains__(self, text: object) -> bool:
+        return isinstance(text, str) and normalize_phrase(text) in self._names
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def lookup(self, text: str) -> Optional[Tuple[str, Path]]:
+        """Return ``(format, path)`` for a rendered phrase and count the hit or miss."""
+        key = normalize_phrase(text)
+        name = self._names.get(key)
+        path = self.store.resolve(name) if name else None
+        if path is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._formats.get(key, "wav"), path
+
+    def put(self, text: str, audio_format: str, data: bytes) -> Path:
+        """Store rendered audio for a registered phrase."""
+        key = normalize_phrase(text)
+        self.add(key)
+        self._formats[key] = audio_format
+        return self.store.write(data, name=self._names[key])
+
+    async def warm(self, render: Renderer) -> int:
+        """Render every phrase that is not already on disk; returns how many were rendered."""
+        rendered = 0
+        for key, name in list(self._names.items()):
+            if self.store.resolve(name) is not None:
+                continue
+            try:
+                audio_format, data = await render(key)
+            except Exception as exc:
+                logger.warning("Could not pre-render phrase %r: %s", key[:40], exc)
+                continue
+            self.put(key, audio_format, data)
+            rendered += 1
+        logger.info("Phrase cache warmed: %d rendered, %d total", rendered, len(self))
+        return rendered
+
+    def stats(self) -> Dict[str, int]:
+        return {"phrases": len(self), "hits": self.hits, "misses": self.misses}
+
+
+__all__ = ["PhraseCache", "load_phrase_file", "normalize_phrase"]
@@ -0,0 +1,88 @@
+"""
+In-memory cache of LLM replies for ``/turn_text``.
+
+Drills and load tests replay the same utterances many times. With the cache
+enabled, a reply is reused when the normalized prompt messages, the model and
+the sampling temperature all match, so repeated turns skip the LLM and replay
+runs produce identical transcripts. Entries expire after a TTL and the least
+recently used ones are dropped once the cache is full.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+
+def cache_key(messages: List[Dict[str, str]], model: str, temperature: float) -> str:
+    """Hash the prompt messages (whitespace/case-normalized) with the model and temperature."""
+    body = {
+        "model": model,
+        "temperature": round(float(temperature), 3),
+        "messages": [[message.get("role", ""), _normalize(str(message.get("content", "")))] for message in messages],
+    }
+    return hashlib.sha256(json.dumps(body, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """TTL plus LRU map from :func:`cache_key` digests to reply text."""
+
+    def __init__(self, *, max_entries: int = 1024, ttl_sec: float = 3600.0) -> None:
+        self.max_entries = max(int(max_entries), 1)
+        self.ttl_sec = max(float(ttl_sec), 0.0)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_sec and now - entry[0] > self.ttl_sec:
+                del self._entries[key]
+                self.evicted += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, reply: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), reply)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "ttl_sec": self.ttl_sec,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evicted": self.evicted,
+        }
+
+
+__all__ = ["ResponseCache", "cache_key"]
@@ -0,0 +1,338 @@
+"""
+Server-side conversation sessions for the orchestrator.
+
+Clients open a session once and then send only a ``session_id`` with each turn
+instead of the full ``history`` JSON. Conversations are append-only: a turn
+adds the user utterance and the reply and never rewrites earlier messages.
+
+:meth:`ConversationStore.history` builds the prompt history from a frozen
+summary checkpoint followed by every message since. A new checkpoint is cut
+only when that exceeds the token budget, so between checkpoints the prompt
+for turn N+1 starts with exactly the messages sent for turn N and backends
+with prefix/KV caching (LM Studio, llama.cpp) can reuse it.
+
+Sessions live in memory and expire after a period of inactivity. When
+``ORCHESTRATOR_SESSION_DB_URL`` is set, each new session and every appended
+message is also written (PHI-scrubbed) to SQLite or Postgres, and a session
+that is not in memory, for example after a restart, is reloaded from there.
+
+Database work runs on one background writer thread, so writes never block the
+caller and are applied in order. Only a reload touches the database
+synchronously; callers on an event loop check :meth:`ConversationStore.resident`
+first and run the call in a worker thread when it returns ``False``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.orchestrator.history import count_tokens, fold_point, summary_message
+from src.security.deid import scrub
+from src.utils.logger import configure_logger
+
+logger = configure_logger("sos.orchestrator.sessions")
+
+Message = Dict[str, str]
+
+
+@dataclass
+class _Session:
+    messages: List[Message] = field(default_factory=list)
+    last_active: float = field(default_factory=time.time)
+    # Checkpoint: ``summary`` stands in for ``messages[:summary_upto]``.
+    summary: Optional[Message] = None
+    summary_upto: int = 0
+
+    def view(self) -> List[Message]:
+        head = [dict(self.summary)] if self.summary else []
+        return head + [dict(message) for message in self.messages[self.summary_upto :]]
+
+
+class SessionNotFound(KeyError):
+    """Raised for unknown or expired session IDs."""
+
+
+class ConversationStore:
+    """
+    In-memory map of session IDs to append-only message lists.
+
+    ``idle_sec`` of ``0`` disables expiry; ``max_sessions`` bounds memory by
+    dropping the least recently active sessions first.
+    """
+
+    def __init__(
+        self,
+        *,
+        idle_sec: float = 1800.0,
+        max_sessions: int = 1000,
+        db_url: Optional[str] = None,
+    ) -> None:
+        self.idle_sec = max(float(idle_sec), 0.0)
+        self.max_sessions = max(int(max_sessions), 1)
+        self.expired = 0
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._engine = None
+        self._db: Optional[ThreadPoolExecutor] = None
+        if db_url:
+            self._engine = self._open_db(db_url)
+            self._db = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-db")
+
+    # ------------------------------------------------------------------ API
+    @property
+    def persistent(self) -> bool:
+        return self._engine is not None
+
+    def create(self) -> str:
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            self._sessions[session_id] = _Session()
+            self._evict()
+        self._submit(self._persist_session, session_id)
+        return session_id
+
+    def resident(self, session_id: str) -> bool:
+        """True when reading ``session_id`` needs no database I/O."""
+        with self._lock:
+            return self._engine is None or session_id in self._sessions
+
+    def messages(self, session_id: str) -> List[Message]:
+        """Return a copy of the conversation; raises :class:`SessionNotFound`."""
+        with self._session(session_id) as session:
+            return [dict(message) for message in session.messages]
+
+    def append(self, session_id: str, messages: Sequence[Message]) -> int:
+        """Append ``messages`` and return the new conversation length."""
+        cleaned = [{"role": str(m["role"]), "content": str(m["content"])} for m in messages]
+        with self._session(session_id) as session:
+            start = len(session.messages)
+            session.messages.extend(cleaned)
+            length = len(session.messages)
+        if cleaned:
+            self._submit(self._persist, session_id, start, cleaned)
+        return length
+
+    def delete(self, session_id: str) -> bool:
+        """Forget ``session_id``; blocks on the database when the store is persistent."""
+        with self._lock:
+            removed = self._sessions.pop(session_id, None) is not None
+        if self._db is not None:
+            removed = self._db.submit(self._purge, session_id).result() or removed
+        return removed
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Wait until every queued database write has been applied."""
+        if self._db is not None:
+            self._db.submit(lambda: None).result(timeout)
+
+    def history(self, session_id: str, *, token_budget: int, keep_turns: int) -> Tuple[List[Message], int]:
+        """
+        Return ``(messages, tokens_saved)`` for the next prompt.
+
+        The messages are the checkpoint summary, if any, followed by every
+        message since. When they exceed ``token_budget`` (``0`` disables
+        compaction) a new checkpoint folds the older turns into a fresh
+        summary and cuts the prompt to about half the budget; the summary
+        then stays unchanged until the budget is hit again.
+        """
+        with self._session(session_id) as session:
+            view = session.view()
+            messages = [dict(message) for message in session.messages]
+            upto = session.summary_upto
+        total = count_tokens(messages)
+        if token_budget <= 0 or count_tokens(view) <= token_budget:
+            return view, total - count_tokens(view)
+
+        # Compact to half the budget so the next checkpoint is several turns away.
+        target = token_budget // 2
+        split = fold_point(messages, token_budget=token_budget, keep_turns=keep_turns, reserved=target)
+        if split <= upto:
+            return view, total - count_tokens(view)
+        recent = messages[split:]
+        summary = summary_message(messages[:split], target - count_tokens(recent))
+        with self._lock:
+            current = self._sessions.get(session_id)
+            # Another turn may have cut a checkpoint while we summarized.
+            if current is not None and current.summary_upto == upto:
+                current.summary, current.summary_upto = summary, split
+        self._submit(self._persist_checkpoint, session_id, split, summary)
+        view = ([summary] if summary else []) + recent
+        return view, total - count_tokens(view)
+
+    def prefix_digest(self, session_id: str) -> str:
+        """Hash of the current prompt history; it changes on appends and at checkpoints."""
+        with self._session(session_id) as session:
+            view = session.view()
+        body = json.dumps(view, separators=(",", ":"), sort_keys=True)
+        return hashlib.sha256(body.encode("utf-8")).hexdigest()[:16]
+
+    def evict_idle(self) -> int:
+        with self._lock:
+            return self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "idle_sec": self.idle_sec,
+            "expired": self.expired,
+            "persistent": self._engine is not None,
+        }
+
+    # ------------------------------------------------------------- internals
+    @contextmanager
+    def _session(self, session_id: str) -> Iterator[_Session]:
+        """Yield the session with the lock held, reloading it first (lock released) if needed."""
+        with self._lock:
+            self._evict()
+            resident = session_id in self._sessions
+        loaded = None
+        if not resident and self._db is not None:
+            # Queued behind pending writes, so the reload sees everything appended so far.
+            loaded = self._db.submit(self._load, session_id).result()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                if loaded is None:
+                    raise SessionNotFound(session_id)
+                session = self._sessions[session_id] = loaded
+            session.last_active = time.time()
+            self._sessions.move_to_end(session_id)
+            yield session
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> None:
+        if self._db is not None:
+            self._db.submit(fn, *args)
+
+    def _evict(self) -> int:
+        removed = 0
+        if self.idle_sec:
+            cutoff = time.time() - self.idle_sec
+            while self._sessions:
+                session_id, session = next(iter(self._sessions.items()))
+                if session.last_active >= cutoff:
+                    break
+                del self._sessions[session_id]
+                removed += 1
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            removed += 1
+        self.expired += removed
+        return removed
+
+    @staticmethod
+    def _open_db(db_url: str):
+        from sqlalchemy import create_engine
+
+        from src.schema.db_models import Base, ConversationMessage, ConversationSession
+
+        engine = create_engine(db_url, pool_pre_ping=True)
+        Base.metadata.create_all(engine, tables=[ConversationMessage.__table__, ConversationSession.__table__])
+        return engine
+
+    def _persist_session(self, session_id: str) -> None:
+        from sqlalchemy.orm import Session
+
+        from src.schema.db_models import ConversationSession
+
+        try:
+            with Session(self._engine) as db:
+                db.add(ConversationSession(session_id=session_id))
+                db.commit()
+        except Exception as exc:
+            logger.warning("Failed to persist session %s: %s", session_id, exc)
+
+    def _persist_checkpoint(self, session_id: str, upto: int, summary: Optional[Message]) -> None:
+        from sqlalchemy.orm import Session
+
+        from src.schema.db_models import ConversationSession
+
+        content = scrub(summary["content"]) if summary else None
+        try:
+            with Session(self._engine) as db:
+                db.merge(ConversationSession(session_id=session_id, summary=content, summary_upto=upto))
+                db.commit()
+        except Exception as exc:
+            logger.warning("Failed to persist checkpoint for session %s: %s", session_id, exc)
+
+    def _persist(self, session_id: str, start: int, messages: List[Message]) -> None:
+        from sqlalchemy import insert
+        from sqlalchemy.orm import Session
+
+        from src.schema.db_models import ConversationMessage
+
+        rows = [
+            {
+                "session_id": session_id,
+                "seq": start + offset,
+                "role": message["role"],
+                "content": scrub(message["content"]),
+            }
+            for offset, message in enumerate(messages)
+        ]
+        try:
+            with Session(self._engine) as db:
+                db.execute(insert(ConversationMessage), rows)
+                db.commit()
+        except Exception as exc:
+            logger.warning("Failed to persist session %s: %s", session_id, exc)
+
+    def _purge(self, session_id: str) -> bool:
+        from sqlalchemy import delete
+        from sqlalchemy.orm import Session
+
+        from src.schema.db_models import ConversationMessage, ConversationSession
+
+        try:
+            with Session(self._engine) as db:
+                messages = db.execute(delete(ConversationMessage).where(ConversationMessage.session_id == session_id))
+                sessions = db.execute(delete(ConversationSession).where(ConversationSession.session_id == session_id))
+                db.commit()
+        except Exception as exc:
+            logger.warning("Failed to delete session %s: %s", session_id, exc)
+            return False
+        return bool(messages.rowcount or sessions.rowcount)
+
+    def _load(self, session_id: str) -> Optional[_Session]:
+        from sqlalchemy import select
+        from sqlalchemy.orm import Session
+
+        from src.schema.db_models import ConversationMessage, ConversationSession
+
+        try:
+            with Session(self._engine) as db:
+                header = db.get(ConversationSession, session_id)
+                rows = db.execute(
+                    select(ConversationMessage)
+                    .where(ConversationMessage.session_id == session_id)
+                    .order_by(ConversationMessage.seq)
+                ).scalars().all()
+        except Exception as exc:
+            logger.warning("Failed to load session %s: %s", session_id, exc)
+            return None
+        if not rows and header is None:
+            return None
+        last = rows[-1].ts if rows else header.created_at
+        last_active = last.replace(tzinfo=timezone.utc).timestamp() if isinstance(last, datetime) else time.time()
+        if self.idle_sec and time.time() - last_active > self.idle_sec:
+            return None
+        summary = header.summary if header is not None else None
+        return _Session(
+            messages=[{"role": row.role, "content": row.content} for row in rows],
+            last_active=last_active,
+            summary={"role": "system", "content": summary} if summary else None,
+            summary_upto=(header.summary_upto or 0) if header is not None else 0,
+        )
+
+
+__all__ = ["ConversationStore", "SessionNotFound"]
@@ -0,0 +1,64 @@
+"""
+Helpers for the streaming ``/turn/stream`` pipeline.
+
+The orchestrator forwards LLM tokens as they arrive and hands each completed
+sentence to TTS while generation continues, so the client can start playback
+before the full reply exists.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+from src.llm.sse import parse_sse_delta
+
+# Split after terminal punctuation (optionally followed by a closing quote or
+# bracket) when whitespace follows. Abbreviations such as "mg." are rare in
+# the short replies we synthesize, so a regex is sufficient here.
+_SENTENCE_END = re.compile(r"(?<=[.!?])[\"')\]]*\s+")
+_MIN_SENTENCE_CHARS = 12
+
+
+class SentenceChunker:
+    """
+    Accumulate streamed tokens and emit complete sentences.
+
+    Very short fragments ("OK.") are held back and merged with the next
+    sentence so TTS is not invoked for a handful of characters.
+    """
+
+    def __init__(self, min_chars: int = _MIN_SENTENCE_CHARS) -> None:
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, token: str) -> List[str]:
+        """Append ``token`` and return any sentences that are now complete."""
+        if not token:
+            return []
+        self._buffer += token
+        sentences: List[str] = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self._buffer):
+            candidate = self._buffer[start:match.end()].strip()
+            if len(candidate) < self.min_chars:
+                continue
+            sentences.append(candidate)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """Return whatever text remains once the token stream has ended."""
+        remainder = self._buffer.strip()
+        self._buffer = ""
+        return remainder or None
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Encode a server-sent event frame."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+__all__ = ["SentenceChunker", "format_sse", "parse_sse_delta"]
@@ -7,7 +7,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Float, JSON, String
+from sqlalchemy import Column, DateTime, Float, Integer, JSON, String, Text
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
@@ -22,3 +22,23 @@ class Metric(Base):
     ok = Column(String)
     latency_sec = Column(Float)
     extra = Column(JSON)
+
+
+class ConversationMessage(Base):
+    __tablename__ = "conversation_messages"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    session_id = Column(String, index=True, nullable=False)
+    seq = Column(Integer, nullable=False)
+    ts = Column(DateTime, default=datetime.utcnow)
+    role = Column(String, nullable=False)
+    content = Column(Text, nullable=False)
+
+
+class ConversationSession(Base):
+    __tablename__ = "conversation_sessions"
+
+    session_id = Column(String, primary_key=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    summary = Column(Text, nullable=True)
+    summary_upto = Column(Integer, nullable=False, default=0)
@@ -1,9 +1,14 @@
 """
 PHI de-identification helpers.
+
+All patterns are compiled into a single alternation so each string is scanned
+once. ``scrub_record`` walks dicts and lists directly instead of round-tripping
+through JSON, leaves non-string values alone, and skips values under keys that
+only ever hold system identifiers. Nothing is cached: a memo keyed on the raw
+input would keep unscrubbed PHI in process memory.
 """
 from __future__ import annotations
 
-import json
 import re
 from typing import Any, Dict
 
@@ -14,15 +19,44 @@ PHI_PATTERNS = [
     (r"\b([A-Z][a-z]+ ){1,3}[A-Z][a-z]+\b", "[NAME]")
 ]
 
+# Values under these keys are generated by the system (timestamps, event
+# names, chain hashes) and never carry free text.
+SAFE_KEYS = frozenset({"ts", "event", "hash", "prev_hash", "signature", "run_id"})
+
+_GROUPS = tuple(f"phi{index}" for index in range(len(PHI_PATTERNS)))
+_REPLACEMENTS = {group: repl for group, (_, repl) in zip(_GROUPS, PHI_PATTERNS)}
+_COMBINED = re.compile(
+    "|".join(f"(?P<{group}>{pattern})" for group, (pattern, _) in zip(_GROUPS, PHI_PATTERNS))
+)
+
+
+def _replace(match: re.Match) -> str:
+    for group in _GROUPS:
+        if match.group(group) is not None:
+            return _REPLACEMENTS[group]
+    return match.group(0)
+
+
 def scrub(text: str) -> str:
     if not text:
         return text
-    for pattern, repl in PHI_PATTERNS:
-        text = re.sub(pattern, repl, text)
-    return text
+    return _COMBINED.sub(_replace, text)
+
+
+def _scrub_value(value: Any) -> Any:
+    if isinstance(value, str):
+        return scrub(value)
+    if isinstance(value, dict):
+        return {
+            (scrub(key) if isinstance(key, str) else key): (
+                item if key in SAFE_KEYS and isinstance(item, str) else _scrub_value(item)
+            )
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [_scrub_value(item) for item in value]
+    return value
 
 
 def scrub_record(record: Dict[str, Any]) -> Dict[str, Any]:
-    serialized = json.dumps(record)
-    cleaned = re.sub(r'"([^"\\]|\\.)*"', lambda m: scrub(m.group(0)), serialized)
-    return json.loads(cleaned)
+    return _scrub_value(record)
@@ -8,3 +8,7 @@ metrics.set_meter_provider(provider)
 meter = metrics.get_meter('sos')
 turns_counter = meter.create_counter('turn_requests')
 latency_hist = meter.create_histogram('turn_latency')
+phrase_cache_hits = meter.create_counter('tts_phrase_cache_hits')
+phrase_cache_misses = meter.create_counter('tts_phrase_cache_misses')
+llm_queue_hist = meter.create_histogram('llm_queue_time')
+llm_rejected_counter = meter.create_counter('llm_admission_rejected')
@@ -17,7 +17,7 @@ from typing import Dict, Iterable, List, Optional, Tuple
 
 import yaml
 
-from src.llm.llm_client import LLMClient
+from src.llm.llm_client import LLMClient, PooledLLMClient
 from src.llm.lmstudio_runtime import LMStudioRuntime
 from src.schema.yaml_schema import EmergencyYAML
 
@@ -309,7 +309,7 @@ def build_client(base_url: Optional[str], model: Optional[str]) -> LLMClient:
     if model:
         runtime.target_model = model
     runtime.ensure_model_loaded()
-    return LLMClient(
+    return PooledLLMClient(
         api_url=f"{runtime.base_url.rstrip('/')}/v1/chat/completions",
         system_prompt="You are a simulation author producing realistic intraoperative crisis scenarios.",
         model=runtime.target_model,
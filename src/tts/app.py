@@ -4,24 +4,40 @@ Lightweight TTS microservice for the Windows SOS desktop build.
 When no external TTS engine is available the service synthesizes a simple tone
 representing the requested text. If ``TTS_FORWARD_URL`` is set, the request is
 proxied to a remote Kokoro-compatible endpoint.
+
+Stub clips are written to ``SOS_SHARED_AUDIO_DIR`` when it is set so the
+orchestrator can serve them without downloading a second copy. They are
+named after a hash of ``(text, format)``, so a repeated prompt is rendered
+once and then served from the audio store.
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import math
 import os
 import struct
-import uuid
+import sys
+from array import array
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 import httpx
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import FileResponse, JSONResponse
 from pydantic import BaseModel, Field
 
+from src.utils.audio_store import AudioStore, shared_audio_dir
+from src.utils.http_pool import create_pooled_client
 from src.utils.logger import configure_logger
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
 
 class TTSRequest(BaseModel):
     text: str = Field(..., description="Text to synthesize")
@@ -29,38 +45,68 @@ class TTSRequest(BaseModel):
     format: str = Field(default="wav")
 
 
-app = FastAPI(title="SOS TTS Service", version=0.1)
 logger = configure_logger("sos.tts")
 
 FORWARD_URL = os.environ.get("TTS_FORWARD_URL")
 HTTP_TIMEOUT = float(os.environ.get("TTS_HTTP_TIMEOUT", "120"))
-AUDIO_DIR = Path(os.environ.get("TTS_AUDIO_DIR", "_validation/audio")).resolve()
-AUDIO_DIR.mkdir(parents=True, exist_ok=True)
+SHARED_AUDIO_DIR = shared_audio_dir()
+AUDIO_DIR = SHARED_AUDIO_DIR or Path(os.environ.get("TTS_AUDIO_DIR", "_validation/audio")).resolve()
+AUDIO_MAX_BYTES = int(os.environ.get("TTS_AUDIO_MAX_BYTES", str(512 * 1024 * 1024)))
+AUDIO_TTL_SEC = float(os.environ.get("TTS_AUDIO_TTL_SEC", "86400"))
+AUDIO_STORE = AudioStore(
+    AUDIO_DIR,
+    max_bytes=AUDIO_MAX_BYTES,
+    ttl_sec=AUDIO_TTL_SEC,
+    shared=SHARED_AUDIO_DIR is not None,
+)
+
+STUB_SAMPLE_RATE = 24_000
+STUB_CACHE_STATS = {"hits": 0, "misses": 0}
+_STUB_PENDING: Dict[str, "asyncio.Task[Path]"] = {}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    client, transport = create_pooled_client("TTS", HTTP_TIMEOUT)
+    app.state.http = client
+    app.state.http_metrics = transport
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+app = FastAPI(title="SOS TTS Service", version=0.1, lifespan=lifespan)
 
 
 @app.get("/health")
-async def health() -> Dict[str, Any]:
+async def health(request: Request) -> Dict[str, Any]:
     return {
         "status": "ok",
         "mode": "proxy" if FORWARD_URL else "stub",
         "audio_dir": str(AUDIO_DIR),
+        "shared_audio": SHARED_AUDIO_DIR is not None,
+        "audio_store": AUDIO_STORE.stats(),
+        "stub_cache": dict(STUB_CACHE_STATS, vectorized=np is not None),
+        "backend_connections": request.app.state.http_metrics.stats() if FORWARD_URL else {},
     }
 
 
 @app.post("/tts")
-async def tts_endpoint(body: TTSRequest) -> JSONResponse:
+async def tts_endpoint(request: Request, body: TTSRequest) -> JSONResponse:
     text = body.text.strip()
     if not text:
         raise HTTPException(status_code=400, detail="Text must not be empty.")
 
     if FORWARD_URL:
-        return await _forward_to_backend(body)
+        return await _forward_to_backend(request.app.state.http, body)
 
-    file_path = _synthesize_stub_audio(text, body.format)
+    file_path = await _stub_audio(text, body.format)
     download_url = f"/audio/{file_path.name}"
     payload = {
         "status": "ok",
         "audio_url": download_url,
+        "file_name": file_path.name,
         "format": body.format,
         "voice": body.voice or "stub",
     }
@@ -69,51 +115,85 @@ async def tts_endpoint(body: TTSRequest) -> JSONResponse:
 
 @app.get("/audio/{file_name}")
 async def download_audio(file_name: str):
-    file_path = (AUDIO_DIR / file_name).resolve()
-    if not file_path.exists() or AUDIO_DIR not in file_path.parents:
+    file_path = AUDIO_STORE.resolve(file_name)
+    if file_path is None:
         raise HTTPException(status_code=404, detail="Audio file not found.")
     return FileResponse(file_path, media_type="audio/wav")
 
 
-async def _forward_to_backend(body: TTSRequest) -> JSONResponse:
-    async with httpx.AsyncClient(timeout=HTTP_TIMEOUT) as client:
-        try:
-            response = await client.post(
-                f"{FORWARD_URL.rstrip('/')}/tts",
-                json=body.model_dump(),
-            )
-            response.raise_for_status()
-        except httpx.HTTPError as exc:
-            logger.error("TTS backend request failed: %s", exc)
-            raise HTTPException(status_code=502, detail="TTS backend unavailable") from exc
+async def _forward_to_backend(client: httpx.AsyncClient, body: TTSRequest) -> JSONResponse:
+    try:
+        response = await client.post(
+            f"{FORWARD_URL.rstrip('/')}/tts",
+            json=body.model_dump(),
+        )
+        response.raise_for_status()
+    except httpx.HTTPError as exc:
+        logger.error("TTS backend request failed: %s", exc)
+        raise HTTPException(status_code=502, detail="TTS backend unavailable") from exc
     return JSONResponse(content=response.json())
 
 
-def _synthesize_stub_audio(text: str, fmt: str) -> Path:
+def _stub_clip_name(text: str, fmt: str) -> str:
+    digest = hashlib.sha256(f"{fmt}\0{text}".encode("utf-8")).hexdigest()
+    return f"stub-{digest[:32]}.wav"
+
+
+async def _stub_audio(text: str, fmt: str) -> Path:
     """
-    Generate a simple sine wave clip whose pitch varies with the characters in
-    the text. This keeps the pipeline functional without a real TTS engine.
+    Return the cached stub clip for ``(text, fmt)``, rendering it off the event
+    loop on a miss. Concurrent requests for the same clip share one render.
+    """
+    name = _stub_clip_name(text, fmt)
+    cached = AUDIO_STORE.resolve(name)
+    if cached is not None:
+        STUB_CACHE_STATS["hits"] += 1
+        return cached
+    task = _STUB_PENDING.get(name)
+    if task is None:
+        STUB_CACHE_STATS["misses"] += 1
+        task = asyncio.ensure_future(asyncio.to_thread(_synthesize_stub_audio, text, fmt))
+        _STUB_PENDING[name] = task
+        task.add_done_callback(lambda _: _STUB_PENDING.pop(name, None))
+    else:
+        STUB_CACHE_STATS["hits"] += 1
+    return await asyncio.shield(task)
+
+
+def _render_stub_pcm(text: str, sample_rate: int = STUB_SAMPLE_RATE) -> bytes:
+    """
+    Render a sine wave whose pitch varies with the characters in the text as
+    16-bit little-endian PCM.
     """
-    sample_rate = 24_000
     duration = max(1.0, min(len(text) * 0.1, 6.0))
     amplitude = 0.3
     total_frames = int(sample_rate * duration)
-    buffer = bytearray()
     base_freq = 220.0
 
+    if np is not None:
+        steps = np.array([ord(char) % 40 for char in text], dtype=np.float64)
+        index = np.arange(total_frames)
+        freqs = base_freq + steps[index % len(text)] * 5
+        samples = amplitude * np.sin(2 * np.pi * freqs * (index / sample_rate))
+        return (samples * 32767).astype("<i2").tobytes()
+
+    pcm = array("h")
     for i in range(total_frames):
-        char = text[i % len(text)]
-        freq = base_freq + (ord(char) % 40) * 5
-        sample = amplitude * math.sin(2 * math.pi * freq * (i / sample_rate))
-        packed = struct.pack("<h", int(sample * 32767))
-        buffer.extend(packed)
-
-    file_name = f"{uuid.uuid4().hex}.wav"
-    file_path = AUDIO_DIR / file_name
-    with file_path.open("wb") as handle:
-        handle.write(_wav_header(sample_rate, len(buffer)))
-        handle.write(buffer)
-    logger.info("Stub TTS generated %s (duration %.2fs)", file_path.name, duration)
+        freq = base_freq + (ord(text[i % len(text)]) % 40) * 5
+        pcm.append(int(amplitude * math.sin(2 * math.pi * freq * (i / sample_rate)) * 32767))
+    if sys.byteorder == "big":
+        pcm.byteswap()
+    return pcm.tobytes()
+
+
+def _synthesize_stub_audio(text: str, fmt: str) -> Path:
+    """
+    Generate a simple sine wave clip whose pitch varies with the characters in
+    the text. This keeps the pipeline functional without a real TTS engine.
+    """
+    pcm = _render_stub_pcm(text)
+    file_path = AUDIO_STORE.write(_wav_header(STUB_SAMPLE_RATE, len(pcm)) + pcm, name=_stub_clip_name(text, fmt))
+    logger.info("Stub TTS generated %s (%d bytes)", file_path.name, len(pcm))
     return file_path
 
 
@@ -0,0 +1,262 @@
+"""
+On-disk store for synthesized audio clips.
+
+The TTS service and the orchestrator can point at the same directory (set
+``SOS_SHARED_AUDIO_DIR`` for both) so a clip is written once by TTS and served
+directly by the orchestrator instead of being downloaded and copied.
+
+Each store keeps an in-memory index of the clips it knows about, ordered by
+last access, so counts and byte totals never require a directory scan and old
+clips can be evicted by age (TTL) or by least-recent use under a byte cap.
+
+In a shared directory only one process (TTS) owns eviction. The other
+(orchestrator) opens its store with ``owner=False``: it never unlinks files,
+and when it serves a clip it bumps the file's mtime. Before deleting a clip
+the owner re-checks that mtime, so a clip a peer just handed out is kept.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+SHARED_AUDIO_DIR_ENV = "SOS_SHARED_AUDIO_DIR"
+
+
+def shared_audio_dir() -> Optional[Path]:
+    """Return the shared audio directory when one is configured."""
+    raw = os.environ.get(SHARED_AUDIO_DIR_ENV)
+    return Path(raw).resolve() if raw else None
+
+
+@dataclass
+class _ClipInfo:
+    size: int
+    last_access: float
+
+
+class AudioStore:
+    """
+    Flat directory of audio files addressed by file name.
+
+    Writes go through a temporary file and ``os.replace`` so a reader in
+    another process never observes a partially written clip. ``max_bytes`` and
+    ``ttl_sec`` of ``0`` disable the respective eviction policy.
+
+    When several processes share a directory each one indexes the clips it
+    writes or serves; files written by a peer are adopted on first lookup.
+    Pass ``shared=True`` in that case, and ``owner=False`` in every process
+    but the one that should delete files. The owner rescans the directory
+    every ``rescan_sec`` (``0`` means on every eviction pass) so clips written
+    by readers are evicted too.
+    """
+
+    def __init__(
+        self,
+        root: Path | str,
+        suffix: str = ".wav",
+        *,
+        max_bytes: int = 0,
+        ttl_sec: float = 0.0,
+        shared: bool = False,
+        owner: bool = True,
+        rescan_sec: float = 60.0,
+    ) -> None:
+        self.root = Path(root).resolve()
+        self.suffix = suffix
+        self.max_bytes = max(int(max_bytes), 0)
+        self.ttl_sec = max(float(ttl_sec), 0.0)
+        self.shared = shared
+        self.owner = owner
+        self.rescan_sec = max(float(rescan_sec), 0.0)
+        self.evicted = 0
+        self._last_scan = time.monotonic()
+        self._index: "OrderedDict[str, _ClipInfo]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+
+    # ------------------------------------------------------------------ API
+    @property
+    def count(self) -> int:
+        return len(self._index)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def new_name(self) -> str:
+        return f"{uuid.uuid4().hex}{self.suffix}"
+
+    def write(self, data: bytes, name: Optional[str] = None) -> Path:
+        """Persist ``data`` atomically, index it and return the final path."""
+        file_name = name or self.new_name()
+        target = self.root / file_name
+        tmp_path = self.root / f".{file_name}.tmp"
+        with tmp_path.open("wb") as handle:
+            handle.write(data)
+        # Stamp the mtime with the time we index, so peers compare like with like.
+        now = time.time()
+        os.utime(tmp_path, (now, now))
+        os.replace(tmp_path, target)
+        with self._lock:
+            self._track(file_name, len(data), now)
+            self._evict(keep=file_name)
+        return target
+
+    def resolve(self, name: str) -> Optional[Path]:
+        """
+        Map a file name to a path inside the store and mark it as recently used.
+
+        Returns ``None`` for missing or expired files and for names that would
+        escape the store directory.
+        """
+        file_path = (self.root / name).resolve()
+        if file_path.parent != self.root:
+            return None
+        now = time.time()
+        with self._lock:
+            self._evict()
+            info = self._index.get(name)
+            if info is None:
+                try:
+                    stat = file_path.stat()
+                except OSError:
+                    return None
+                if not file_path.is_file() or name.startswith("."):
+                    return None
+                if self.ttl_sec and now - stat.st_mtime > self.ttl_sec:
+                    return None
+                self._track(name, stat.st_size, now)
+                info = self._index[name]
+            elif not file_path.exists():
+                self._forget(name)
+                return None
+            info.last_access = now
+            self._index.move_to_end(name)
+        if self.shared and not self.owner:
+            # Tell the owning process this clip is still in use.
+            try:
+                os.utime(file_path, (now, now))
+            except OSError:
+                pass
+        return file_path
+
+    def evict_expired(self) -> int:
+        """Apply TTL and size limits now; returns the number of clips removed."""
+        with self._lock:
+            return self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_sec": self.ttl_sec,
+            "evicted": self.evicted,
+            "shared": self.shared,
+            "owner": self.owner,
+        }
+
+    # ------------------------------------------------------------- internals
+    def _load_index(self) -> None:
+        entries = self._scan()
+        with self._lock:
+            for mtime, name, size in entries:
+                self._track(name, size, mtime)
+            self._evict()
+
+    def _scan(self) -> List[Tuple[float, str, int]]:
+        entries = []
+        for path in self.root.glob(f"*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.name, stat.st_size))
+        return sorted(entries)
+
+    def _adopt_peer_clips(self) -> None:
+        # Clips written by a reader process are invisible to the owner's index
+        # until adopted here; without this they would never be evicted.
+        if not (self.shared and self.owner):
+            return
+        if time.monotonic() - self._last_scan < self.rescan_sec:
+            return
+        self._last_scan = time.monotonic()
+        for mtime, name, size in self._scan():
+            if name not in self._index:
+                self._track(name, size, mtime)
+                self._index.move_to_end(name, last=False)
+
+    def _touched_by_peer(self, name: str, info: _ClipInfo) -> bool:
+        """Refresh ``info`` from the file mtime when a reader used the clip since we last did."""
+        if not self.shared:
+            return False
+        try:
+            mtime = (self.root / name).stat().st_mtime
+        except OSError:
+            return False
+        if mtime <= info.last_access:
+            return False
+        info.last_access = mtime
+        self._index.move_to_end(name)
+        return True
+
+    def _track(self, name: str, size: int, last_access: float) -> None:
+        previous = self._index.pop(name, None)
+        if previous is not None:
+            self._total_bytes -= previous.size
+        self._index[name] = _ClipInfo(size=size, last_access=last_access)
+        self._total_bytes += size
+
+    def _forget(self, name: str) -> None:
+        info = self._index.pop(name, None)
+        if info is not None:
+            self._total_bytes -= info.size
+
+    def _remove(self, name: str) -> None:
+        self._forget(name)
+        if not self.owner:
+            return
+        try:
+            (self.root / name).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return
+        self.evicted += 1
+
+    def _evict(self, keep: Optional[str] = None) -> int:
+        """Drop clips over the limits; readers only forget them, the owner deletes them."""
+        self._adopt_peer_clips()
+        removed = 0
+        if self.ttl_sec:
+            cutoff = time.time() - self.ttl_sec
+            # The index is ordered by last access, so expired clips sit at the front.
+            while self._index:
+                name, info = next(iter(self._index.items()))
+                if info.last_access >= cutoff or name == keep:
+                    break
+                if self._touched_by_peer(name, info) and info.last_access >= cutoff:
+                    continue
+                self._remove(name)
+                removed += 1
+        if self.max_bytes:
+            while self._total_bytes > self.max_bytes and len(self._index) > 1:
+                name, info = next(iter(self._index.items()))
+                if self._touched_by_peer(name, info):
+                    continue
+                self._remove(name)
+                removed += 1
+        return removed
+
+
+__all__ = ["AudioStore", "SHARED_AUDIO_DIR_ENV", "shared_audio_dir"]
@@ -1,39 +1,260 @@
 """
 Tamper-evident audit logging utilities.
+
+Every entry stores the SHA-256 of the previous entry, forming a hash chain.
+The writer keeps the chain head in memory and only reads the tail of the file
+when it starts (or when another writer has appended behind its back), so an
+append costs the same at the end of a shift as at the beginning.
+
+When the active file grows past ``SOS_AUDIT_SEGMENT_BYTES`` it is rotated to
+``audit_log.NNNNNN.jsonl`` and the new file opens with a ``segment_link``
+entry. The link carries the previous segment name and head hash plus an
+HMAC signature, so segments cannot be dropped or reordered unnoticed.
+
+The HMAC key comes from ``SOS_AUDIT_KEY`` (or a non-default ``TOKEN_SECRET``).
+Without one, a signature would prove nothing, so the writer logs an error and
+keeps appending to a single segment instead of rotating.
 """
 from __future__ import annotations
 
 import hashlib
+import hmac
 import json
+import os
+import re
+import threading
 import time
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, List, Optional
 
 from src.security.deid import scrub_record
+from src.utils.logger import configure_logger
+
+logger = configure_logger('sos.audit')
 
 AUDIT_FILE = Path('_validation/audit_log.jsonl')
 AUDIT_FILE.parent.mkdir(parents=True, exist_ok=True)
+GENESIS_HASH = '0' * 64
+SEGMENT_LINK_EVENT = 'segment_link'
+SEGMENT_BYTES = int(os.getenv('SOS_AUDIT_SEGMENT_BYTES', str(64 * 1024 * 1024)))
+_TAIL_BLOCK = 4096
+_DEFAULT_SECRET = 'change-me'
 
 
-def append_audit(event: str, user: str, payload: Dict[str, Any]) -> None:
-    payload = scrub_record(payload)
-    last_hash = '0' * 64
-    if AUDIT_FILE.exists():
-        with AUDIT_FILE.open('r', encoding='utf-8') as handle:
-            lines = handle.readlines()
-            if lines:
+def _signing_key() -> Optional[bytes]:
+    """Return the segment-link HMAC key, or ``None`` when only the default secret is configured."""
+    raw = os.getenv('SOS_AUDIT_KEY') or os.getenv('TOKEN_SECRET', '')
+    if not raw or raw == _DEFAULT_SECRET:
+        return None
+    return raw.encode()
+
+
+def _entry_hash(entry: Dict[str, Any]) -> str:
+    body = {key: value for key, value in entry.items() if key != 'hash'}
+    return hashlib.sha256(json.dumps(body, sort_keys=True).encode()).hexdigest()
+
+
+def _link_signature(key: bytes, prev_segment: str, prev_hash: str) -> str:
+    return hmac.new(key, f'{prev_segment}:{prev_hash}'.encode(), hashlib.sha256).hexdigest()
+
+
+def _read_last_line(path: Path) -> Optional[bytes]:
+    """Return the last non-empty line of ``path`` by reading backwards from the end."""
+    with path.open('rb') as handle:
+        handle.seek(0, os.SEEK_END)
+        position = handle.tell()
+        buffer = b''
+        while position > 0:
+            step = min(_TAIL_BLOCK, position)
+            position -= step
+            handle.seek(position)
+            buffer = handle.read(step) + buffer
+            stripped = buffer.rstrip(b'\r\n')
+            newline = stripped.rfind(b'\n')
+            if newline != -1:
+                return stripped[newline + 1:]
+        stripped = buffer.strip()
+        return stripped or None
+
+
+def segment_paths(active: Path = AUDIT_FILE) -> List[Path]:
+    """Return rotated segments in chain order followed by the active file."""
+    pattern = re.compile(rf'^{re.escape(active.stem)}\.(\d+){re.escape(active.suffix)}$')
+    rotated = []
+    for path in active.parent.glob(f'{active.stem}.*{active.suffix}'):
+        match = pattern.match(path.name)
+        if match:
+            rotated.append((int(match.group(1)), path))
+    paths = [path for _, path in sorted(rotated)]
+    if active.exists():
+        paths.append(active)
+    return paths
+
+
+class AuditWriter:
+    """
+    Append-only writer for one hash-chained audit log.
+
+    Appends are serialized with a lock; the cached head is revalidated against
+    the file size before each write so a second process appending to the same
+    file does not fork the chain.
+    """
+
+    def __init__(self, path: Path, *, segment_bytes: int = SEGMENT_BYTES, key: Optional[bytes] = None) -> None:
+        self.path = Path(path)
+        self.segment_bytes = max(int(segment_bytes), 0)
+        self.key = key if key is not None else _signing_key()
+        if self.key is None and self.segment_bytes:
+            logger.error(
+                'SOS_AUDIT_KEY is not set; audit log %s will not be rotated because segment links '
+                'cannot be signed. Set SOS_AUDIT_KEY to enable rotation.',
+                self.path,
+            )
+        self._lock = threading.Lock()
+        self._head = GENESIS_HASH
+        self._size = -1
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._recover_head()
+
+    @property
+    def head(self) -> str:
+        return self._head
+
+    def append(self, event: str, user: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        payload = scrub_record(payload)
+        with self._lock:
+            if self._current_size() != self._size:
+                self._recover_head()
+            if self.key is not None and self.segment_bytes and self._size >= self.segment_bytes:
+                self._rotate()
+            return self._write_entry(event, user, payload)
+
+    # ------------------------------------------------------------- internals
+    def _current_size(self) -> int:
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _recover_head(self) -> None:
+        self._head = GENESIS_HASH
+        self._size = self._current_size()
+        if self._size == 0:
+            previous = segment_paths(self.path)
+            if previous:
+                self._head = self._head_of(previous[-1])
+            return
+        self._head = self._head_of(self.path)
+
+    @staticmethod
+    def _head_of(path: Path) -> str:
+        try:
+            line = _read_last_line(path)
+        except FileNotFoundError:
+            return GENESIS_HASH
+        if not line:
+            return GENESIS_HASH
+        try:
+            return json.loads(line).get('hash', GENESIS_HASH)
+        except json.JSONDecodeError:
+            return GENESIS_HASH
+
+    def _rotate(self) -> None:
+        rotated = segment_paths(self.path)[:-1]
+        sequence = 1
+        if rotated:
+            sequence = int(rotated[-1].name[len(self.path.stem) + 1:-len(self.path.suffix)]) + 1
+        target = self.path.with_name(f'{self.path.stem}.{sequence:06d}{self.path.suffix}')
+        os.replace(self.path, target)
+        self._size = 0
+        self._write_entry(
+            SEGMENT_LINK_EVENT,
+            'system',
+            {
+                'prev_segment': target.name,
+                'prev_hash': self._head,
+                'signature': _link_signature(self.key, target.name, self._head),
+            },
+        )
+
+    def _write_entry(self, event: str, user: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        entry = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'user': user,
+            'event': event,
+            'payload': payload,
+            'prev_hash': self._head,
+        }
+        entry['hash'] = _entry_hash(entry)
+        line = (json.dumps(entry) + '\n').encode()
+        with self.path.open('ab') as handle:
+            handle.write(line)
+        self._head = entry['hash']
+        self._size += len(line)
+        return entry
+
+
+def verify_chain(paths: Optional[Iterable[Path]] = None, *, key: Optional[bytes] = None) -> Dict[str, Any]:
+    """
+    Stream through audit segments and check every hash and segment link.
+
+    Returns a report with ``ok``, the number of ``entries`` and ``segments``
+    checked, the final ``head`` and, on failure, the ``error`` with its
+    ``segment`` and ``line``. Rotated segments cannot be verified without a key.
+    """
+    key = key if key is not None else _signing_key()
+    segments = list(paths) if paths is not None else segment_paths()
+    report: Dict[str, Any] = {'ok': True, 'entries': 0, 'segments': 0, 'head': GENESIS_HASH, 'error': None}
+    previous_segment: Optional[str] = None
+
+    def fail(message: str, segment: Path, line_no: int) -> Dict[str, Any]:
+        report.update({'ok': False, 'error': message, 'segment': str(segment), 'line': line_no})
+        return report
+
+    for segment in segments:
+        segment = Path(segment)
+        report['segments'] += 1
+        with segment.open('r', encoding='utf-8') as handle:
+            for line_no, raw in enumerate(handle, start=1):
+                if not raw.strip():
+                    continue
                 try:
-                    last_hash = json.loads(lines[-1]).get('hash', last_hash)
+                    entry = json.loads(raw)
                 except json.JSONDecodeError:
-                    pass
-    entry = {
-        'ts': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
-        'user': user,
-        'event': event,
-        'payload': payload,
-        'prev_hash': last_hash,
-    }
-    digest = hashlib.sha256(json.dumps(entry, sort_keys=True).encode()).hexdigest()
-    entry['hash'] = digest
-    with AUDIT_FILE.open('a', encoding='utf-8') as handle:
-        handle.write(json.dumps(entry) + '\n')
+                    return fail('invalid JSON', segment, line_no)
+                if entry.get('prev_hash') != report['head']:
+                    return fail('prev_hash does not match previous entry', segment, line_no)
+                if entry.get('hash') != _entry_hash(entry):
+                    return fail('entry hash mismatch', segment, line_no)
+                if line_no == 1 and previous_segment is not None:
+                    payload = entry.get('payload') or {}
+                    if entry.get('event') != SEGMENT_LINK_EVENT or payload.get('prev_segment') != previous_segment:
+                        return fail('segment does not start with a link to the previous segment', segment, line_no)
+                    if key is None:
+                        return fail('SOS_AUDIT_KEY is required to verify segment links', segment, line_no)
+                    expected = _link_signature(key, previous_segment, entry['prev_hash'])
+                    if not hmac.compare_digest(expected, str(payload.get('signature', ''))):
+                        return fail('segment link signature mismatch', segment, line_no)
+                report['head'] = entry['hash']
+                report['entries'] += 1
+        previous_segment = segment.name
+    return report
+
+
+_writer: Optional[AuditWriter] = None
+_writer_lock = threading.Lock()
+
+
+def _default_writer() -> AuditWriter:
+    global _writer
+    with _writer_lock:
+        if _writer is None or _writer.path != AUDIT_FILE:
+            _writer = AuditWriter(AUDIT_FILE)
+        return _writer
+
+
+def append_audit(event: str, user: str, payload: Dict[str, Any]) -> None:
+    _default_writer().append(event, user, payload)
+
+
+__all__ = ['AUDIT_FILE', 'AuditWriter', 'append_audit', 'segment_paths', 'verify_chain']
@@ -23,6 +23,7 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from chaos_json_parser import safe_json_loads
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../llm')))
 from llm_client import LLMClient
 
@@ -101,25 +102,14 @@ Return only JSON.
 
 # --- Real LLM integration ---
 def make_llm_functions(api_url, system_prompt, model_name, temperature=0.7):
-    import requests
+    from src.llm.runtime import LLMRuntime
+    runtime = LLMRuntime(api_url, model=model_name, temperature=temperature)
     def call_llm(prompt, sys_prompt=None):
-        payload = {
-            "model": model_name,
-            "messages": [
-                {"role": "system", "content": sys_prompt or system_prompt},
-                {"role": "user", "content": prompt}
-            ],
-            "temperature": temperature,
-            "max_tokens": -1,
-            "stream": False
-        }
-        resp = requests.post(api_url, json=payload, timeout=60)
-        resp.raise_for_status()
-        data = resp.json()
-        # Try OpenAI format, fallback to 'response' key
-        if "choices" in data and data["choices"]:
-            return data["choices"][0]["message"]["content"]
-        return data.get("response", "")
+        messages = [
+            {"role": "system", "content": sys_prompt or system_prompt},
+            {"role": "user", "content": prompt}
+        ]
+        return runtime.complete(messages)["content"]
     return call_llm, call_llm, call_llm
 
 
@@ -3,10 +3,18 @@ Clinician data store for simulation responses.
 
 Loads structured scene data (vitals, medications, procedures, evaluations)
 and provides lightweight natural-language responses to LLM follow-up questions.
+
+Every series keeps a parallel list of timestamps built when the store is
+created, so "latest reading before t" and "readings over the last N seconds"
+are binary searches rather than scans. Entries are expected to be sorted by
+``t`` (``from_path`` sorts them); call ``reindex`` after mutating a series.
 """
 from __future__ import annotations
 
+import re
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Sequence
 
@@ -15,6 +23,24 @@ import yaml
 
 MetricMap = Dict[str, List[Dict[str, object]]]
 
+TREND_WINDOW_SEC = 60.0
+
+# Checked in order; the first route with a keyword in the question wins.
+_ROUTES = (
+    ("blood_pressure", ("blood pressure", "bp", "pressures")),
+    ("spo2", ("oxygen", "sat", "spo2")),
+    ("heart_rate", ("heart rate", "pulse")),
+    ("etco2", ("etco2", "co2")),
+    ("medications", ("medication", "drug", "dose", "phenylephrine", "pressors", "vasopressor")),
+    ("procedures", ("procedure", "decompression", "needle", "chest tube", "intervention", "line")),
+    ("evaluations", ("result", "response", "outcome", "evaluation")),
+    ("labs", ("lab", "blood gas", "abg", "lactate", "panel", "potassium", "hemoglobin")),
+    ("imaging", ("imaging", "ultrasound", "tee", "x-ray", "scan")),
+)
+_VITAL_ROUTES = frozenset({"blood_pressure", "spo2", "heart_rate", "etco2"})
+_TREND_PATTERN = re.compile(r"\btrend|\bover the (?:last|past)\b")
+_WINDOW_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*(s|secs?|seconds?|m|mins?|minutes?)\b")
+
 
 def _load_yaml(path: Path) -> dict:
     with path.open("r", encoding="utf-8") as handle:
@@ -25,6 +51,26 @@ def _keyword_match(question: str, keywords: Sequence[str]) -> bool:
     return any(keyword in question for keyword in keywords)
 
 
+@lru_cache(maxsize=1024)
+def _route(query: str) -> Optional[str]:
+    # The harness asks the same handful of questions on every iteration.
+    for route, keywords in _ROUTES:
+        if _keyword_match(query, keywords):
+            return route
+    return None
+
+
+def _trend_window(query: str) -> Optional[float]:
+    """Seconds requested by a trend question ("bp trend over the last 2 min"), else None."""
+    if not _TREND_PATTERN.search(query):
+        return None
+    match = _WINDOW_PATTERN.search(query)
+    if not match:
+        return TREND_WINDOW_SEC
+    amount = float(match.group(1))
+    return amount * 60.0 if match.group(2).startswith("m") else amount
+
+
 @dataclass
 class ClinicianDataStore:
     vitals: Dict[str, List[Dict[str, object]]]
@@ -33,6 +79,19 @@ class ClinicianDataStore:
     evaluations: List[Dict[str, object]]
     labs: List[Dict[str, object]] = field(default_factory=list)
     imaging: List[Dict[str, object]] = field(default_factory=list)
+    _vital_times: Dict[str, List[float]] = field(init=False, repr=False, compare=False, default_factory=dict)
+    _event_times: Dict[str, List[float]] = field(init=False, repr=False, compare=False, default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.reindex()
+
+    def reindex(self) -> None:
+        """Rebuild the timestamp arrays; needed only after a series is modified in place."""
+        self._vital_times = {metric: _timestamps(readings) for metric, readings in self.vitals.items()}
+        self._event_times = {
+            name: _timestamps(getattr(self, name))
+            for name in ("medications", "procedures", "evaluations", "labs", "imaging")
+        }
 
     @classmethod
     def from_path(cls, path: Path) -> "ClinicianDataStore":
@@ -60,42 +119,62 @@ class ClinicianDataStore:
             fields.append("imaging")
         return fields
 
+    def latest(self, metric: str, at: float = float("inf")) -> Optional[Dict[str, object]]:
+        """Newest ``metric`` reading at or before ``at`` (the first reading if all are later)."""
+        readings = self.vitals.get(metric)
+        if not readings:
+            return None
+        return _latest_before(readings, self._vital_times[metric], at)
+
+    def window(self, metric: str, start: float, end: float = float("inf")) -> List[Dict[str, object]]:
+        """``metric`` readings with ``start <= t <= end``, oldest first."""
+        readings = self.vitals.get(metric)
+        if not readings:
+            return []
+        times = self._vital_times[metric]
+        return readings[bisect_left(times, start) : bisect_right(times, end)]
+
+    def trend(self, metric: str, seconds: float, *, at: Optional[float] = None) -> List[Dict[str, object]]:
+        """
+        Readings from the ``seconds`` leading up to ``at``.
+
+        ``at`` defaults to the newest reading, so a trend asked without a
+        scene time covers the end of the recording.
+        """
+        times = self._vital_times.get(metric)
+        if not times:
+            return []
+        end = times[-1] if at is None or at == float("inf") else at
+        return self.window(metric, end - seconds, end)
+
     def respond(self, question: str, *, event_time: Optional[float] = None) -> str:
         query = question.lower()
         time_hint = event_time or float("inf")
 
-        vitals_map = {
-            "blood_pressure": ("blood pressure", "bp", "pressures"),
-            "spo2": ("oxygen", "sat", "spo2"),
-            "heart_rate": ("heart rate", "pulse"),
-            "etco2": ("etco2", "co2"),
-        }
-        for metric, keywords in vitals_map.items():
-            if _keyword_match(query, keywords):
-                return self._format_vital(metric, time_hint)
-
-        if _keyword_match(query, ("medication", "drug", "dose", "phenylephrine", "pressors", "vasopressor")):
+        route = _route(query)
+        if route in _VITAL_ROUTES:
+            seconds = _trend_window(query)
+            if seconds is not None:
+                return self._format_trend(route, time_hint, seconds)
+            return self._format_vital(route, time_hint)
+        if route == "medications":
             return self._format_medication(time_hint)
-        if _keyword_match(
-            query,
-            ("procedure", "decompression", "needle", "chest tube", "intervention", "line"),
-        ):
+        if route == "procedures":
             return self._format_procedure(time_hint)
-        if _keyword_match(query, ("result", "response", "outcome", "evaluation")):
+        if route == "evaluations":
             return self._format_evaluation(time_hint)
-        if _keyword_match(query, ("lab", "blood gas", "abg", "lactate", "panel", "potassium", "hemoglobin")):
+        if route == "labs":
             return self._format_lab(time_hint)
-        if _keyword_match(query, ("imaging", "ultrasound", "tee", "x-ray", "scan")):
+        if route == "imaging":
             return self._format_imaging(time_hint)
 
         suggestions = ", ".join(self.available_fields())
         return f"I can provide updates for: {suggestions}."
 
     def _format_vital(self, metric: str, time_hint: float) -> str:
-        readings = self.vitals.get(metric)
-        if not readings:
+        latest = self.latest(metric, time_hint)
+        if latest is None:
             return f"No {metric.replace('_', ' ')} data recorded."
-        latest = _latest_before(readings, time_hint)
         value = latest.get("value", "unknown")
         source = latest.get("source", "unknown source")
         note = latest.get("note")
@@ -103,10 +182,29 @@ class ClinicianDataStore:
         suffix = f" ({note})" if note else ""
         return f"{metric.replace('_', ' ').capitalize()} {value} at t={t_value:.1f}s via {source}{suffix}."
 
+    def _format_trend(self, metric: str, time_hint: float, seconds: float) -> str:
+        label = metric.replace("_", " ")
+        if not self.vitals.get(metric):
+            return f"No {label} data recorded."
+        readings = self.trend(metric, seconds, at=time_hint)
+        if not readings:
+            return f"No {label} readings in the last {seconds:.0f}s; {self._format_vital(metric, time_hint)}"
+        first, last = readings[0], readings[-1]
+        if len(readings) == 1:
+            return (
+                f"{label.capitalize()} over the last {seconds:.0f}s: "
+                f"{last.get('value', 'unknown')} at t={last.get('t', 0.0):.1f}s (1 reading)."
+            )
+        return (
+            f"{label.capitalize()} over the last {seconds:.0f}s: "
+            f"{first.get('value', 'unknown')} at t={first.get('t', 0.0):.1f}s -> "
+            f"{last.get('value', 'unknown')} at t={last.get('t', 0.0):.1f}s ({len(readings)} readings)."
+        )
+
     def _format_medication(self, time_hint: float) -> str:
         if not self.medications:
             return "No medications documented yet."
-        entry = _latest_before(self.medications, time_hint)
+        entry = _latest_before(self.medications, self._event_times["medications"], time_hint)
         name = entry.get("name", "medication")
         dose = entry.get("dose", "unspecified dose")
         response = entry.get("response")
@@ -119,7 +217,7 @@ class ClinicianDataStore:
     def _format_procedure(self, time_hint: float) -> str:
         if not self.procedures:
             return "No procedures performed yet."
-        entry = _latest_before(self.procedures, time_hint)
+        entry = _latest_before(self.procedures, self._event_times["procedures"], time_hint)
         name = entry.get("name", "procedure").replace("_", " ")
         t_value = entry.get("t", "unknown")
         detail_parts = []
@@ -133,7 +231,7 @@ class ClinicianDataStore:
     def _format_evaluation(self, time_hint: float) -> str:
         if not self.evaluations:
             return "No evaluation findings recorded yet."
-        entry = _latest_before(self.evaluations, time_hint)
+        entry = _latest_before(self.evaluations, self._event_times["evaluations"], time_hint)
         focus = entry.get("focus", "assessment").replace("_", " ")
         finding = entry.get("finding", "finding unavailable")
         t_value = entry.get("t", "unknown")
@@ -142,7 +240,7 @@ class ClinicianDataStore:
     def _format_lab(self, time_hint: float) -> str:
         if not self.labs:
             return "No laboratory data recorded yet."
-        entry = _latest_before(self.labs, time_hint)
+        entry = _latest_before(self.labs, self._event_times["labs"], time_hint)
         name = entry.get("test", entry.get("name", "lab"))
         result = entry.get("result", "result pending")
         t_value = entry.get("t", "unknown")
@@ -153,7 +251,7 @@ class ClinicianDataStore:
     def _format_imaging(self, time_hint: float) -> str:
         if not self.imaging:
             return "No imaging assessments recorded yet."
-        entry = _latest_before(self.imaging, time_hint)
+        entry = _latest_before(self.imaging, self._event_times["imaging"], time_hint)
         modality = entry.get("modality", entry.get("name", "imaging")).upper()
         finding = entry.get("finding", "finding unavailable")
         t_value = entry.get("t", "unknown")
@@ -167,16 +265,15 @@ def _sort_entries(vitals: Dict[str, List[Dict[str, object]]]) -> Dict[str, List[
     return sorted_vitals
 
 
-def _latest_before(entries: List[Dict[str, object]], cutoff: float) -> Dict[str, object]:
+def _timestamps(entries: Sequence[Dict[str, object]]) -> List[float]:
+    return [float(entry.get("t", 0.0)) for entry in entries]
+
+
+def _latest_before(entries: List[Dict[str, object]], times: List[float], cutoff: float) -> Dict[str, object]:
     if not entries:
         raise ValueError("No entries available for lookup")
-    latest = entries[0]
-    for entry in entries:
-        if float(entry.get("t", 0.0)) <= cutoff:
-            latest = entry
-        else:
-            break
-    return latest
+    index = bisect_right(times, cutoff) - 1
+    return entries[max(index, 0)]
 
 
-__all__ = ["ClinicianDataStore"]
+__all__ = ["ClinicianDataStore", "TREND_WINDOW_SEC"]
@@ -5,9 +5,10 @@ Database helpers for telemetry persistence.
 from __future__ import annotations
 
 import os
-from typing import Optional
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, insert
 from sqlalchemy.orm import Session
 
 from src.schema.db_models import Base, Metric
@@ -26,8 +27,35 @@ def get_engine():
     return _engine
 
 
+_METRIC_COLUMNS = {"event", "ok", "latency_sec"}
+
+
+def _metric_row(record: dict) -> Dict[str, Any]:
+    """Map a JSONL metric record onto the ``metrics`` table columns."""
+    row: Dict[str, Any] = {key: record.get(key) for key in _METRIC_COLUMNS}
+    if row["ok"] is not None:
+        row["ok"] = str(bool(row["ok"])).lower()
+    ts = record.get("ts")
+    if isinstance(ts, str):
+        try:
+            row["ts"] = datetime.strptime(ts, "%Y-%m-%dT%H:%M:%SZ")
+        except ValueError:
+            pass
+    extra = {key: value for key, value in record.items() if key not in _METRIC_COLUMNS and key != "ts"}
+    row["extra"] = extra or None
+    return row
+
+
 def record_metric(record: dict) -> None:
+    record_metrics([record])
+
+
+def record_metrics(records: Iterable[dict]) -> None:
+    """Insert a batch of metric records with a single executemany statement."""
+    rows = [_metric_row(record) for record in records]
+    if not rows:
+        return
     engine = get_engine()
     with Session(engine) as session:
-        session.add(Metric(**record))
+        session.execute(insert(Metric), rows)
         session.commit()
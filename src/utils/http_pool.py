@@ -0,0 +1,106 @@
+"""
+Pooled ``httpx.AsyncClient`` factory for the proxy microservices.
+
+Each service owns one client for its lifetime so backend connections are kept
+alive across requests. Pool limits are tunable per service through
+environment variables sharing a prefix (``ASR_HTTP_MAX_CONNECTIONS`` and so
+on), and every request is counted by :class:`MeteredTransport` so ``/health``
+can report per-backend traffic.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from src.utils.logger import configure_logger
+
+try:
+    import h2  # noqa: F401 - only needed to enable HTTP/2 in httpx
+except ImportError:  # pragma: no cover - optional dependency
+    h2 = None
+
+logger = configure_logger("sos.http_pool")
+
+
+class MeteredTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper that counts requests, failures and latency."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport) -> None:
+        self._inner = inner
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.total_latency = 0.0
+        self.last_error: Optional[str] = None
+        self.http_versions: Dict[str, int] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            response = await self._inner.handle_async_request(request)
+        except Exception as exc:
+            self.errors += 1
+            self.last_error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            self.in_flight -= 1
+            self.total_latency += time.perf_counter() - start
+        version = response.extensions.get("http_version", b"HTTP/1.1")
+        if isinstance(version, bytes):
+            version = version.decode("ascii", "replace")
+        self.http_versions[version] = self.http_versions.get(version, 0) + 1
+        if response.status_code >= 500:
+            self.errors += 1
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "avg_latency_sec": round(self.total_latency / self.requests, 4) if self.requests else 0.0,
+            "http_versions": dict(self.http_versions),
+            "last_error": self.last_error,
+        }
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def create_pooled_client(prefix: str, timeout: float) -> Tuple[httpx.AsyncClient, MeteredTransport]:
+    """
+    Build a keep-alive client configured from ``{prefix}_HTTP_*`` variables.
+
+    Returns the client together with its metered transport so callers can
+    expose the counters.
+
+    ``{prefix}_HTTP2=true`` enables HTTP/2 when the optional ``h2`` package is
+    installed; httpx negotiates it per backend and falls back to HTTP/1.1.
+    """
+    limits = httpx.Limits(
+        max_connections=_env_int(f"{prefix}_HTTP_MAX_CONNECTIONS", 20),
+        max_keepalive_connections=_env_int(f"{prefix}_HTTP_MAX_KEEPALIVE", 10),
+        keepalive_expiry=float(os.environ.get(f"{prefix}_HTTP_KEEPALIVE_EXPIRY", "30")),
+    )
+    http2 = os.environ.get(f"{prefix}_HTTP2", "false").lower() == "true"
+    if http2 and h2 is None:
+        logger.warning("%s_HTTP2 requested but the 'h2' package is not installed; using HTTP/1.1", prefix)
+        http2 = False
+    transport = MeteredTransport(httpx.AsyncHTTPTransport(limits=limits, http2=http2))
+    return httpx.AsyncClient(timeout=timeout, transport=transport), transport
+
+
+__all__ = ["MeteredTransport", "create_pooled_client"]
@@ -3,17 +3,25 @@ Lightweight runtime wrapper for interacting with LM Studio's chat completions AP
 
 The helper intentionally focuses on the subset of functionality needed by the
 SBAR chaos harness so it can run locally without additional infrastructure.
+
+Availability probes are cached per endpoint and model for the whole process,
+so harness instances created back to back share one probe instead of each
+sending a "ping" completion to the GPU. While an endpoint is in use, a daemon
+thread re-probes it in the background so the cached answer stays fresh.
 """
 
 from __future__ import annotations
 
 import os
+import threading
 import time
 from dataclasses import dataclass
-from typing import Dict, Optional, Sequence
+from typing import Callable, Dict, Optional, Sequence, Tuple
 
 import requests
 
+from src.llm.runtime import LLMRuntime, RetryPolicy, shared_session
+
 
 def _default_api_url() -> str:
     return os.environ.get("LLM_API_URL", "http://100.111.223.74:1234/v1/chat/completions")
@@ -31,6 +39,18 @@ def _default_timeout() -> int:
         return 30
 
 
+def _default_probe_ttl() -> float:
+    raw = os.environ.get("LM_STUDIO_PROBE_TTL", "30")
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return 30.0
+
+
+def _default_probe_refresh() -> bool:
+    return os.environ.get("LM_STUDIO_PROBE_REFRESH", "true").lower() == "true"
+
+
 def _normalise_chat_url(base_url: str) -> str:
     url = base_url.rstrip("/")
     if url.endswith("/chat/completions"):
@@ -53,20 +73,102 @@ def _models_endpoint(chat_url: str) -> str:
     return f"{root}/models"
 
 
-def _extract_token_count(payload: Dict) -> int:
-    usage = payload.get("usage")
-    if isinstance(usage, dict):
-        for key in ("total_tokens", "completion_tokens", "input_tokens", "prompt_tokens"):
-            value = usage.get(key)
-            if isinstance(value, int):
-                return int(value)
-    meta = payload.get("meta")
-    if isinstance(meta, dict):
-        for key in ("total_tokens", "tokens"):
-            value = meta.get(key)
-            if isinstance(value, int):
-                return int(value)
-    return 0
+@dataclass
+class _ProbeEntry:
+    available: bool = False
+    checked_at: float = 0.0
+    read_since_refresh: bool = False
+    probe: Optional[Callable[[], bool]] = None
+
+
+class _ProbeCache:
+    """
+    Process-wide availability results keyed by ``(chat_url, model)``.
+
+    A result is served until it is ``ttl`` seconds old. With the refresher
+    enabled, entries that were read since the last refresh are re-probed every
+    ``ttl`` seconds; entries nobody reads are left alone, so an idle process
+    does not keep pinging the server.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[str, str], _ProbeEntry] = {}
+        self._lock = threading.Lock()
+        self._probe_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._refresher: Optional[threading.Thread] = None
+        self._interval = 0.0
+        self.probes = 0
+        self.hits = 0
+
+    def get(self, key: Tuple[str, str], probe: Callable[[], bool], ttl: float, *, refresh: bool) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and ttl > 0 and time.monotonic() - entry.checked_at < ttl:
+                entry.read_since_refresh = True
+                self.hits += 1
+                return entry.available
+            probe_lock = self._probe_locks.setdefault(key, threading.Lock())
+        with probe_lock:
+            # Another thread may have probed while we waited for the lock.
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and ttl > 0 and time.monotonic() - entry.checked_at < ttl:
+                    self.hits += 1
+                    return entry.available
+            available = self.run(key, probe)
+        if refresh and ttl > 0:
+            self._ensure_refresher(ttl)
+        return available
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "probes": self.probes,
+                "hits": self.hits,
+                "refreshing": self._refresher is not None and self._refresher.is_alive(),
+            }
+
+    def run(self, key: Tuple[str, str], probe: Callable[[], bool]) -> bool:
+        """Probe now and store the result."""
+        available = probe()
+        with self._lock:
+            self.probes += 1
+            self._entries[key] = _ProbeEntry(available, time.monotonic(), False, probe)
+        return available
+
+    # ------------------------------------------------------------- internals
+    def _ensure_refresher(self, interval: float) -> None:
+        with self._lock:
+            self._interval = interval if not self._interval else min(self._interval, interval)
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            self._refresher = threading.Thread(target=self._refresh_loop, name="lmstudio-probe", daemon=True)
+            self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        while True:
+            time.sleep(self._interval)
+            with self._lock:
+                due = [
+                    (key, entry.probe)
+                    for key, entry in self._entries.items()
+                    if entry.read_since_refresh and entry.probe is not None
+                ]
+                for key, _ in due:
+                    self._entries[key].read_since_refresh = False
+            for key, probe in due:
+                try:
+                    self.run(key, probe)
+                except Exception:  # pragma: no cover - probes swallow request errors
+                    pass
+
+
+PROBE_CACHE = _ProbeCache()
 
 
 @dataclass
@@ -78,17 +180,38 @@ class LMStudioRuntime:
     base_url: str = _default_api_url()
     model: str = _default_model()
     timeout: int = _default_timeout()
+    retries: int = 0
+    probe_ttl: float = _default_probe_ttl()
+    probe_refresh: bool = _default_probe_refresh()
 
     def __post_init__(self) -> None:
         self._chat_url = _normalise_chat_url(self.base_url)
         self._models_url = _models_endpoint(self._chat_url)
+        self._runtime = LLMRuntime(
+            self._chat_url,
+            model=self.model,
+            connect_timeout=min(self.timeout, 5),
+            read_timeout=self.timeout,
+            retry=RetryPolicy(attempts=self.retries + 1),
+            sender=shared_session(),
+        )
 
-    def is_available(self) -> bool:
+    def is_available(self, *, force: bool = False) -> bool:
         """
         Best-effort probe to determine whether LM Studio is reachable.
+
+        Results are shared across instances for ``probe_ttl`` seconds; pass
+        ``force=True`` to bypass the cache.
         """
+        key = (self._chat_url, self.model)
+        if force:
+            return PROBE_CACHE.run(key, self._probe)
+        return PROBE_CACHE.get(key, self._probe, self.probe_ttl, refresh=self.probe_refresh)
+
+    def _probe(self) -> bool:
+        session = shared_session()
         try:
-            response = requests.get(self._models_url, timeout=min(self.timeout, 5))
+            response = session.get(self._models_url, timeout=min(self.timeout, 5))
             if response.ok or response.status_code in (401, 403):
                 return True
         except requests.RequestException:
@@ -103,7 +226,7 @@ class LMStudioRuntime:
             "temperature": 0.0,
         }
         try:
-            response = requests.post(self._chat_url, json=probe_payload, timeout=min(self.timeout, 5))
+            response = session.post(self._chat_url, json=probe_payload, timeout=min(self.timeout, 5))
             return response.ok
         except requests.RequestException:
             return False
@@ -121,39 +244,16 @@ class LMStudioRuntime:
         """
         Issue a chat completion request and return the parsed response plus basic telemetry.
         """
-        payload: Dict[str, object] = {
-            "model": model or self.model,
-            "messages": list(messages),
-            "temperature": float(temperature),
-            "stream": bool(stream),
-        }
-        if max_tokens is not None:
-            payload["max_tokens"] = int(max_tokens)
-        if response_format:
-            payload["response_format"] = response_format
-
-        start = time.perf_counter()
-        response = requests.post(self._chat_url, json=payload, timeout=self.timeout)
-        latency = time.perf_counter() - start
-        response.raise_for_status()
-        data: Dict = response.json() if response.content else {}
-
-        content = ""
-        if isinstance(data, dict):
-            choices = data.get("choices")
-            if isinstance(choices, list) and choices:
-                first = choices[0] or {}
-                message = first.get("message")
-                if isinstance(message, dict):
-                    content = message.get("content", "") or ""
-
-        return {
-            "content": content.strip(),
-            "usage": data.get("usage") if isinstance(data, dict) else None,
-            "tokens": _extract_token_count(data) if isinstance(data, dict) else 0,
-            "latency": latency,
-            "raw": data,
-        }
+        result = self._runtime.complete(
+            messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=stream,
+            model=model,
+            response_format=response_format,
+        )
+        result["content"] = result["content"].strip()
+        return result
 
 
-__all__ = ["LMStudioRuntime"]
+__all__ = ["LMStudioRuntime", "PROBE_CACHE"]
@@ -4,19 +4,13 @@ Shared logging helpers for microservices and the Windows launcher.
 
 from __future__ import annotations
 
-import json
 import logging
 import os
 import time
 from pathlib import Path
 from typing import Optional
 
-from src.security.deid import scrub_record
-
-try:
-    from src.utils import db as db_utils
-except Exception:
-    db_utils = None
+from src.utils.metrics_sink import MetricsSink, write_metric_records
 
 
 def configure_logger(name: str, level: Optional[str] = None) -> logging.Logger:
@@ -44,10 +38,36 @@ def configure_logger(name: str, level: Optional[str] = None) -> logging.Logger:
 METRICS_PATH = Path("_validation/orchestrator_metrics.jsonl")
 METRICS_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+METRICS_SINK = MetricsSink(
+    METRICS_PATH,
+    batch_size=int(os.environ.get("SOS_METRICS_BATCH_SIZE", "100")),
+    flush_interval=float(os.environ.get("SOS_METRICS_FLUSH_SEC", "0.5")),
+    max_queue=int(os.environ.get("SOS_METRICS_QUEUE_MAX", "10000")),
+)
+
+
+def start_metrics_sink() -> MetricsSink:
+    """
+    Route ``log_turn_metric`` through the background sink.
+
+    Long-running services call this at startup; scripts and tests that never
+    start the sink keep writing synchronously.
+    """
+    METRICS_SINK.start()
+    return METRICS_SINK
+
+
+def stop_metrics_sink(timeout: float = 5.0) -> None:
+    """Flush queued metrics and return to synchronous writes."""
+    METRICS_SINK.stop(timeout)
+
 
 def log_turn_metric(event: str, ok: bool, latency_sec: float, extra: Optional[dict] = None) -> None:
     """
     Append a structured JSON line describing a turn request.
+
+    When the background sink is running the record is only queued here;
+    scrubbing, file and database I/O happen on the sink's worker thread.
     """
     record: dict = {
         "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
@@ -63,15 +83,17 @@ def log_turn_metric(event: str, ok: bool, latency_sec: float, extra: Optional[di
                 record[key] = str(value)
             else:
                 record[key] = value
-    record = scrub_record(record)
-    METRICS_PATH.touch(exist_ok=True)
-    with METRICS_PATH.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(record, ensure_ascii=False) + "\n")
-    if db_utils and os.getenv("DATABASE_URL"):
-        try:
-            db_utils.record_metric(record)
-        except Exception:
-            pass
-
-
-__all__ = ["configure_logger", "log_turn_metric", "METRICS_PATH"]
+    if METRICS_SINK.running:
+        METRICS_SINK.submit(record)
+        return
+    write_metric_records(METRICS_PATH, [record])
+
+
+__all__ = [
+    "configure_logger",
+    "log_turn_metric",
+    "start_metrics_sink",
+    "stop_metrics_sink",
+    "METRICS_PATH",
+    "METRICS_SINK",
+]
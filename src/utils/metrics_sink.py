@@ -0,0 +1,167 @@
+"""
+Background writer for turn metrics.
+
+Request handlers hand records to :class:`MetricsSink`, which queues them in
+memory and lets a worker thread scrub, append and bulk-insert them in batches.
+The queue is bounded; when it is full new records are dropped and counted
+rather than blocking the caller.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.security.deid import scrub_record
+
+try:
+    from src.utils import db as db_utils
+except Exception:
+    db_utils = None
+
+
+def write_metric_records(path: Path, records: Sequence[Dict[str, Any]]) -> int:
+    """
+    Scrub ``records``, append them to ``path`` and persist them to the database.
+
+    Returns the number of records written to the JSONL file. Database failures
+    are swallowed so telemetry never breaks a caller.
+    """
+    if not records:
+        return 0
+    cleaned = [scrub_record(record) for record in records]
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in cleaned))
+    if db_utils and os.getenv("DATABASE_URL"):
+        try:
+            db_utils.record_metrics(cleaned)
+        except Exception:
+            pass
+    return len(cleaned)
+
+
+class _FlushRequest:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class MetricsSink:
+    """
+    Queue-backed metrics writer flushed by size or age.
+
+    ``batch_size`` records or ``flush_interval`` seconds, whichever comes
+    first, trigger a write of everything collected so far.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        max_queue: int = 10_000,
+    ) -> None:
+        self.path = Path(path)
+        self.batch_size = max(int(batch_size), 1)
+        self.flush_interval = max(float(flush_interval), 0.01)
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(int(max_queue), 1))
+        self._thread: Optional[threading.Thread] = None
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name="metrics-sink", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush outstanding records and stop the worker."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        self._thread = None
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """Queue ``record`` without blocking; returns ``False`` when it was dropped."""
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.submitted += 1
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued before this call has been written."""
+        if not self.running:
+            return True
+        request = _FlushRequest()
+        self._queue.put(request)
+        return request.done.wait(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "queued": self._queue.qsize(),
+            "submitted": self.submitted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "errors": self.errors,
+        }
+
+    # ------------------------------------------------------------- internals
+    def _run(self) -> None:
+        batch: List[Dict[str, Any]] = []
+        deadline = 0.0
+        while True:
+            if batch:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+                except queue.Empty:
+                    item = None
+            else:
+                item = self._queue.get()
+                deadline = time.monotonic() + self.flush_interval
+
+            if isinstance(item, dict):
+                batch.append(item)
+                if len(batch) < self.batch_size and time.monotonic() < deadline:
+                    continue
+
+            self._write(batch)
+            batch = []
+            if isinstance(item, _FlushRequest):
+                item.done.set()
+            elif item is _STOP:
+                return
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        if not batch:
+            return
+        try:
+            self.written += write_metric_records(self.path, batch)
+            self.flushes += 1
+        except Exception:
+            self.errors += 1
+
+
+__all__ = ["MetricsSink", "write_metric_records"]
@@ -10,7 +10,7 @@ import argparse
 from pathlib import Path
 from typing import Callable
 
-from src.llm.llm_client import LLMClient
+from src.llm.llm_client import LLMClient, PooledLLMClient
 from src.llm.lmstudio_runtime import LMStudioRuntime
 from src.utils.sbar_monitor import LLMChangeDetector, SBARMonitor, print_snapshot
 from src.utils.scene_player import SceneEvent, play_scene
@@ -28,7 +28,7 @@ def run_scene(scene_path: Path, speed: float, realtime: bool) -> None:
     active_model = runtime.ensure_model_loaded()
     print(f"[LM Studio] Active model: {active_model}")
 
-    client = LLMClient(
+    client = PooledLLMClient(
         api_url=f"{runtime.base_url.rstrip('/')}/v1/chat/completions",
         system_prompt=(
             "You monitor a patient during surgery. When given context and a new observation, "
@@ -0,0 +1,336 @@
+"""
+Batch driver for the SBAR chaos harness across every scene and registry topic.
+
+Every ``scenes/<name>/dialogue.jsonl`` becomes one job. Topics from
+``data/emergencies/registry.yaml`` are matched to scenes through the scene
+directory name and ``scene_metadata.yaml`` tags; topics no scene covers are
+listed in the metrics so gaps in the library stay visible.
+
+Jobs run in a process pool. Each job is assigned an LLM backend, and no
+backend ever has more than its cap of jobs in flight. Finished jobs are
+appended to a JSONL checkpoint as they complete, so a crashed batch can be
+resumed: successful jobs are skipped and failed ones are retried. When a
+worker process dies, the jobs it took down with the pool are recorded as
+failed and the pool is restarted for the rest. When the batch ends, the
+checkpoint is folded into one consolidated metrics file.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import yaml
+
+from src.utils.logger import configure_logger
+
+logger = configure_logger("sos.sbar_batch")
+
+STUB_BACKEND = "stub"
+CHECKPOINT_PATH = Path("_validation/sbar_batch_checkpoint.jsonl")
+BATCH_METRICS_PATH = Path("_validation/sbar_batch_metrics.json")
+
+
+@dataclass
+class BatchJob:
+    job_id: str
+    scene_path: str
+    topics: List[str] = field(default_factory=list)
+
+
+def load_registry_topics(registry_path: Path | str, library_dir: Path | str) -> List[str]:
+    """Topic ids from the registry that have a YAML book in ``library_dir``, in registry order."""
+    registry_path = Path(registry_path)
+    library_dir = Path(library_dir)
+    if not registry_path.exists():
+        return []
+    with registry_path.open("r", encoding="utf-8") as handle:
+        entries = yaml.safe_load(handle) or []
+    topics: List[str] = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        for raw in [entry.get("id"), *(entry.get("children") or [])]:
+            topic = str(raw or "").strip().lower()
+            if topic and topic not in topics and (library_dir / f"{topic}.yaml").exists():
+                topics.append(topic)
+    return topics
+
+
+def discover_jobs(
+    scenes_dir: Path | str = Path("scenes"),
+    *,
+    registry_path: Path | str = Path("data/emergencies/registry.yaml"),
+    library_dir: Path | str = Path("data/emergencies"),
+) -> Tuple[List[BatchJob], List[str]]:
+    """Return ``(jobs, uncovered_topics)``; jobs are sorted by scene name."""
+    scenes_dir = Path(scenes_dir)
+    topics = load_registry_topics(registry_path, library_dir)
+    known = set(topics)
+    jobs: List[BatchJob] = []
+    for dialogue in sorted(scenes_dir.glob("*/dialogue.jsonl")):
+        scene_dir = dialogue.parent
+        tags = [scene_dir.name]
+        meta_path = scene_dir / "scene_metadata.yaml"
+        if meta_path.exists():
+            with meta_path.open("r", encoding="utf-8") as handle:
+                tags.extend((yaml.safe_load(handle) or {}).get("tags", []) or [])
+        covered: List[str] = []
+        for tag in tags:
+            topic = str(tag).strip().lower().replace("-", "_")
+            if topic in known and topic not in covered:
+                covered.append(topic)
+        jobs.append(BatchJob(job_id=scene_dir.name, scene_path=str(dialogue), topics=covered))
+    covered_all = {topic for job in jobs for topic in job.topics}
+    return jobs, [topic for topic in topics if topic not in covered_all]
+
+
+class Checkpoint:
+    """Append-only JSONL of finished jobs; the last record per job wins."""
+
+    def __init__(self, path: Path | str = CHECKPOINT_PATH) -> None:
+        self.path = Path(path)
+
+    def load(self) -> Dict[str, Dict[str, object]]:
+        records: Dict[str, Dict[str, object]] = {}
+        if not self.path.exists():
+            return records
+        with self.path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write leaves a torn last line; that job simply reruns.
+                    continue
+                if isinstance(record, dict) and record.get("job_id"):
+                    records[str(record["job_id"])] = record
+        return records
+
+    def record(self, record: Mapping[str, object]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(dict(record), ensure_ascii=False) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+
+
+def run_scene_job(
+    job: Dict[str, object],
+    backend: str,
+    iters: int,
+    output_dir: str,
+) -> Dict[str, object]:
+    """Run one scene through :class:`SBARChaosHarness`; executed in a worker process."""
+    from src.utils.llm_runtime import LMStudioRuntime
+    from src.utils.sbar_scene_harness import SBARChaosHarness
+
+    started = time.perf_counter()
+    record: Dict[str, object] = {"job_id": job["job_id"], "scene": job["scene_path"], "backend": backend}
+    try:
+        with_llm = backend != STUB_BACKEND
+        runtime = LMStudioRuntime(base_url=backend) if with_llm else None
+        # Scene files are all named dialogue.jsonl, so give each scene its own log root.
+        harness = SBARChaosHarness(
+            dialogue_path=str(job["scene_path"]),
+            output_dir=Path(output_dir) / str(job["job_id"]),
+        )
+        results = harness.run(iters=iters, with_llm=with_llm, runtime=runtime)
+    except Exception as exc:
+        record.update(
+            ok=False,
+            error=f"{type(exc).__name__}: {exc}",
+            wall_time=round(time.perf_counter() - started, 3),
+        )
+        return record
+    latencies = [float(item["latency"]) for item in results]
+    record.update(
+        ok=all(bool(item["ok"]) for item in results),
+        iterations=len(results),
+        with_llm=any(bool(item["with_llm"]) for item in results),
+        tokens=sum(int(item["tokens"]) for item in results),
+        avg_latency=round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        run_dir=results[-1]["run_dir"] if results else None,
+        wall_time=round(time.perf_counter() - started, 3),
+    )
+    return record
+
+
+def next_assignment(
+    pending: Sequence[BatchJob],
+    in_flight: Mapping[str, int],
+    caps: Mapping[str, int],
+) -> Optional[Tuple[BatchJob, str]]:
+    """Pair the first pending job with the least loaded backend that is under its cap."""
+    if not pending:
+        return None
+    open_backends = [backend for backend, cap in caps.items() if in_flight.get(backend, 0) < cap]
+    if not open_backends:
+        return None
+    backend = min(open_backends, key=lambda name: (in_flight.get(name, 0), list(caps).index(name)))
+    return pending[0], backend
+
+
+def run_batch(
+    jobs: Sequence[BatchJob],
+    *,
+    backend_caps: Mapping[str, int],
+    workers: int = 2,
+    iters: int = 1,
+    output_dir: Path | str = Path("_validation/sbar_chaos_logs"),
+    checkpoint: Optional[Checkpoint] = None,
+    metrics_path: Path | str = BATCH_METRICS_PATH,
+    uncovered_topics: Sequence[str] = (),
+    resume: bool = True,
+    runner: Callable[..., Dict[str, object]] = run_scene_job,
+) -> Dict[str, object]:
+    """
+    Run ``jobs`` and write the consolidated metrics file; returns its content.
+
+    ``backend_caps`` maps backend URLs (or :data:`STUB_BACKEND`) to the number
+    of jobs that may use it at once. ``workers`` bounds the process pool.
+    """
+    if not backend_caps or not any(cap > 0 for cap in backend_caps.values()):
+        raise ValueError("run_batch needs at least one backend with a positive cap")
+    checkpoint = checkpoint or Checkpoint()
+    done = checkpoint.load() if resume else {}
+    if not resume and checkpoint.path.exists():
+        checkpoint.path.unlink()
+    pending = [job for job in jobs if not done.get(job.job_id, {}).get("ok")]
+    skipped = len(jobs) - len(pending)
+    if skipped:
+        logger.info("Resuming batch: %d of %d jobs already complete", skipped, len(jobs))
+
+    caps = {backend: int(cap) for backend, cap in backend_caps.items() if int(cap) > 0}
+    in_flight: Dict[str, int] = {backend: 0 for backend in caps}
+    running: Dict[Future, Tuple[BatchJob, str]] = {}
+    started = time.perf_counter()
+    pool_size = max(1, min(int(workers), sum(caps.values())))
+
+    def finish(job: BatchJob, record: Dict[str, object]) -> None:
+        record["topics"] = list(job.topics)
+        record["finished_at"] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+        checkpoint.record(record)
+        done[job.job_id] = record
+        logger.info("Batch job %s finished (ok=%s)", job.job_id, record.get("ok"))
+
+    pool = ProcessPoolExecutor(max_workers=pool_size)
+    # Every restart follows a crash that failed at least one job, so this only
+    # trips when a fresh pool cannot even accept work.
+    restarts_left = len(pending) + 1
+    try:
+        while pending or running:
+            broken: Optional[BaseException] = None
+            while len(running) < pool_size:
+                assignment = next_assignment(pending, in_flight, caps)
+                if assignment is None:
+                    break
+                job, backend = assignment
+                try:
+                    future = pool.submit(runner, asdict(job), backend, iters, str(output_dir))
+                except BrokenProcessPool as exc:
+                    broken = exc
+                    break
+                pending.remove(job)
+                in_flight[backend] += 1
+                running[future] = (job, backend)
+            if running:
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    job, backend = running.pop(future)
+                    in_flight[backend] -= 1
+                    try:
+                        record = future.result()
+                    except Exception as exc:  # worker crashed before it could report
+                        if isinstance(exc, BrokenProcessPool):
+                            broken = exc
+                        record = _failure_record(job, backend, exc)
+                    finish(job, record)
+            if broken is None:
+                continue
+            if running:
+                continue  # the other jobs on the broken pool fail on the next wait
+            pool.shutdown(wait=False, cancel_futures=True)
+            restarts_left -= 1
+            if restarts_left < 0:
+                logger.error("Process pool keeps breaking; failing %d remaining jobs", len(pending))
+                for job in pending:
+                    finish(job, _failure_record(job, None, broken))
+                pending = []
+                break
+            logger.warning("Process pool broke (%s); restarting it for %d remaining jobs", broken, len(pending))
+            pool = ProcessPoolExecutor(max_workers=pool_size)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    return write_batch_metrics(
+        [done[job.job_id] for job in jobs if job.job_id in done],
+        metrics_path,
+        uncovered_topics=uncovered_topics,
+        wall_time=time.perf_counter() - started,
+        resumed=skipped,
+    )
+
+
+def _failure_record(job: BatchJob, backend: Optional[str], exc: BaseException) -> Dict[str, object]:
+    return {
+        "job_id": job.job_id,
+        "scene": job.scene_path,
+        "backend": backend,
+        "ok": False,
+        "error": f"{type(exc).__name__}: {exc}",
+    }
+
+
+def write_batch_metrics(
+    records: Sequence[Mapping[str, object]],
+    metrics_path: Path | str = BATCH_METRICS_PATH,
+    *,
+    uncovered_topics: Sequence[str] = (),
+    wall_time: float = 0.0,
+    resumed: int = 0,
+) -> Dict[str, object]:
+    succeeded = [record for record in records if record.get("ok")]
+    iterations = sum(int(record.get("iterations", 0) or 0) for record in records)
+    payload: Dict[str, object] = {
+        "generated_at": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "totals": {
+            "jobs": len(records),
+            "succeeded": len(succeeded),
+            "failed": len(records) - len(succeeded),
+            "resumed": resumed,
+            "iterations": iterations,
+            "tokens": sum(int(record.get("tokens", 0) or 0) for record in records),
+            "wall_time": round(wall_time, 3),
+            "throughput_per_min": round(iterations / wall_time * 60.0, 3) if wall_time > 0 else 0.0,
+        },
+        "jobs": list(records),
+        "uncovered_topics": list(uncovered_topics),
+    }
+    metrics_path = Path(metrics_path)
+    metrics_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = metrics_path.with_suffix(metrics_path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+    tmp_path.replace(metrics_path)
+    return payload
+
+
+__all__ = [
+    "BATCH_METRICS_PATH",
+    "BatchJob",
+    "CHECKPOINT_PATH",
+    "Checkpoint",
+    "STUB_BACKEND",
+    "discover_jobs",
+    "load_registry_topics",
+    "next_assignment",
+    "run_batch",
+    "run_scene_job",
+    "write_batch_metrics",
+]
@@ -0,0 +1,158 @@
+"""
+Bounded SBAR update history with spill-to-disk and incremental export.
+
+``SBARManager`` records every field update. Over a long surgical case that is
+thousands of ASR fragments, so only the newest ``max_in_memory`` records are
+kept in a ring buffer. Older ones are appended to a spill file, either an
+anonymous temporary file or ``spill_path``, and read back only when the full
+history is iterated or exported.
+
+``export_jsonl`` is incremental. The first export to a path writes everything;
+later exports to the same path append only the records added since then.
+"""
+
+from __future__ import annotations
+
+import json
+import tempfile
+from collections import deque
+from pathlib import Path
+from typing import IO, Any, Deque, Dict, Iterator, List, NamedTuple, Optional
+
+
+class HistoryRecord(NamedTuple):
+    field: str
+    value: str
+    confidence: float
+    t: float
+    source: str
+    value_norm: str
+    conflict: bool
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "t": self.t,
+                "field": self.field,
+                "value": self.value,
+                "value_norm": self.value_norm,
+                "confidence": self.confidence,
+                "conflict": self.conflict,
+                "source": self.source,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, line: str) -> "HistoryRecord":
+        data = json.loads(line)
+        return cls(
+            data["field"],
+            data["value"],
+            data["confidence"],
+            data["t"],
+            data["source"],
+            data["value_norm"],
+            data["conflict"],
+        )
+
+
+class SBARHistory:
+    """
+    Append-only history whose memory use is bounded by ``max_in_memory`` records.
+
+    Iteration yields every record in insertion order, spilled ones first.
+    """
+
+    def __init__(self, max_in_memory: int = 1024, *, spill_path: Optional[Path | str] = None) -> None:
+        self.max_in_memory = max(int(max_in_memory), 1)
+        self.spill_path = Path(spill_path) if spill_path else None
+        self._recent: Deque[HistoryRecord] = deque()
+        self._spill: Optional[IO[str]] = None
+        self._spilled = 0
+        self._exports: Dict[Path, int] = {}
+
+    def append(self, record: HistoryRecord) -> None:
+        if len(self._recent) >= self.max_in_memory:
+            self._spill_oldest()
+        self._recent.append(record)
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._recent)
+
+    def __iter__(self) -> Iterator[HistoryRecord]:
+        yield from self._iter_spilled()
+        yield from list(self._recent)
+
+    def recent(self, n: Optional[int] = None) -> List[HistoryRecord]:
+        """The newest ``n`` in-memory records (all of them when ``n`` is None)."""
+        records = list(self._recent)
+        return records if n is None else records[-n:] if n > 0 else []
+
+    @property
+    def spilled(self) -> int:
+        return self._spilled
+
+    def export_jsonl(self, path: Path | str) -> int:
+        """Write the records not yet exported to ``path``; returns how many were written."""
+        path = Path(path)
+        start = self._exports.get(path)
+        mode = "a" if start is not None and path.exists() else "w"
+        start = start if mode == "a" else 0
+        written = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open(mode, encoding="utf-8") as handle:
+            batch: List[str] = []
+            for record in self._iter_from(start):
+                batch.append(record.to_json())
+                written += 1
+                if len(batch) >= 512:
+                    handle.write("\n".join(batch) + "\n")
+                    batch.clear()
+            if batch:
+                handle.write("\n".join(batch) + "\n")
+        self._exports[path] = start + written
+        return written
+
+    def close(self) -> None:
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"records": len(self), "in_memory": len(self._recent), "spilled": self._spilled}
+
+    # ------------------------------------------------------------- internals
+    def _spill_oldest(self) -> None:
+        if self._spill is None:
+            if self.spill_path is not None:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                self._spill = self.spill_path.open("w+", encoding="utf-8")
+            else:
+                self._spill = tempfile.TemporaryFile("w+", encoding="utf-8", prefix="sbar_history_")
+        self._spill.seek(0, 2)
+        self._spill.write(self._recent.popleft().to_json() + "\n")
+        self._spilled += 1
+
+    def _iter_spilled(self) -> Iterator[HistoryRecord]:
+        if self._spill is None:
+            return
+        # Read one line at a time and remember the offset, so appends made
+        # while a caller is iterating do not disturb the read position.
+        self._spill.flush()
+        offset = 0
+        for _ in range(self._spilled):
+            self._spill.seek(offset)
+            line = self._spill.readline()
+            offset = self._spill.tell()
+            yield HistoryRecord.from_json(line)
+
+    def _iter_from(self, start: int) -> Iterator[HistoryRecord]:
+        if start >= self._spilled:
+            yield from self.recent()[start - self._spilled :]
+            return
+        for index, record in enumerate(self):
+            if index >= start:
+                yield record
+
+
+__all__ = ["HistoryRecord", "SBARHistory"]
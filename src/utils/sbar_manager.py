@@ -6,38 +6,123 @@ SBARManager and ContextManager for Chaotic Input
 - Handles token budgeting and context window management
 - Includes a test harness to simulate chaotic, noisy input
 """
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Callable, Optional, Dict, Any, List, Tuple
+import itertools
 import time
 
 from collections import deque, Counter
 
+from src.utils.sbar_history import HistoryRecord, SBARHistory
+from src.utils.sbar_normalizer import SynonymNormalizer, default_normalizer
+
+# Rebase a field's reference timestamp once it is this many half-lives old so
+# the stored weights (which grow as 2 ** (age / half_life)) never overflow.
+_REBASE_HALF_LIVES = 64.0
+
+_CLARIFICATION_PROMPTS = {
+    "situation": "Current oxygen saturation (number + %)?",
+    "background": "Current blood pressure (systolic/diastolic)?",
+    "assessment": "Patient appearance (cyanotic/pink/alert)?",
+    "recommendation": "Action to take now (e.g., epi dose/CPR)?",
+}
+
+
+class _FieldTally:
+    """
+    Running decayed vote totals over one field's recent window.
+
+    Weights are stored relative to ``ref``: ``conf * 2 ** ((t - ref) / half_life)``.
+    Every value then decays by the same factor, so the ranking only changes
+    when the window changes and the top two can be kept on update. Reading a
+    score applies the decay from ``ref`` to ``now`` with one multiplication.
+    """
+
+    __slots__ = ("half_life", "ref", "window", "votes", "counts", "last_seen", "top")
+
+    def __init__(self, half_life: float, maxlen: int):
+        self.half_life = half_life
+        self.ref: Optional[float] = None
+        # (t, value_norm, conf, source, weight)
+        self.window: deque = deque(maxlen=maxlen)
+        self.votes: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.last_seen: Dict[str, float] = {}
+        self.top: Tuple[Optional[str], float, float] = (None, 0.0, 0.0)
+
+    def add(self, t: float, value: str, conf: float, source: str) -> None:
+        if self.ref is None:
+            self.ref = t
+        elif t - self.ref > _REBASE_HALF_LIVES * self.half_life:
+            self._rebase(t)
+        if len(self.window) == self.window.maxlen:
+            self._evict(self.window[0])
+        weight = conf * 2.0 ** ((t - self.ref) / self.half_life)
+        self.window.append((t, value, conf, source, weight))
+        self.votes[value] = self.votes.get(value, 0.0) + weight
+        self.counts[value] = self.counts.get(value, 0) + 1
+        self.last_seen[value] = t
+        self._rank()
+
+    def best(self, now: float) -> Tuple[Optional[str], float, float]:
+        value, first, second = self.top
+        if value is None:
+            return None, 0.0, 0.0
+        scale = 2.0 ** (-(now - self.ref) / self.half_life)
+        return value, first * scale, second * scale
+
+    def _evict(self, item) -> None:
+        _, value, _, _, weight = item
+        self.counts[value] -= 1
+        if self.counts[value] == 0:
+            del self.counts[value], self.votes[value], self.last_seen[value]
+        else:
+            self.votes[value] -= weight
+
+    def _rebase(self, t: float) -> None:
+        factor = 2.0 ** (-(t - self.ref) / self.half_life)
+        self.votes = {value: weight * factor for value, weight in self.votes.items()}
+        self.window = deque(
+            ((t0, v0, c0, s0, w0 * factor) for t0, v0, c0, s0, w0 in self.window),
+            maxlen=self.window.maxlen,
+        )
+        self.ref = t
+
+    def _rank(self) -> None:
+        first_value, first, second = None, 0.0, 0.0
+        for value, weight in self.votes.items():
+            if first_value is None or weight > first:
+                if first_value is not None:
+                    second = first
+                first_value, first = value, weight
+            elif weight > second:
+                second = weight
+        self.top = (first_value, first, second)
+
+
 class SBARManager:
-    def __init__(self, max_tokens_per_field: int = 12):
+    def __init__(self, max_tokens_per_field: int = 12, history_in_memory: int = 1024):
         self.fields = ["situation", "background", "assessment", "recommendation"]
         self.sbar = {field: {"value": None, "confidence": 0.0, "conflict": False} for field in self.fields}
-        # history: (field, value, confidence, t, source, value_norm, conflict)
-        self.history: List[Tuple[str, str, float, float, str, str, bool]] = []
-        self._recent = {f: deque(maxlen=6) for f in self.fields}  # (t, value_norm, conf, source)
+        # Every update as a HistoryRecord; older records spill to a temp file.
+        self.history = SBARHistory(history_in_memory)
         self.half_life_sec = 120
+        self.window_size = 6
+        self._tallies = {f: _FieldTally(self.half_life_sec, self.window_size) for f in self.fields}
         self.max_tokens_per_field = max_tokens_per_field
         self.conflict_threshold = 0.2
-        self.synonyms = {
-            "spo2": "sats",
-            "oxygen": "sats",
-            "o2": "sats",
-            "bp": "blood pressure",
-        }
+        # Synonyms come from data/sbar_synonyms.yaml; assign ``synonyms`` to override.
+        self._normalizer: SynonymNormalizer = default_normalizer()
 
-    def _norm(self, field, value):
-        v = (value or "").strip().lower()
-        for k, rep in self.synonyms.items():
-            v = v.replace(k, rep)
-        v = v.replace("%", "").replace("/", " ").replace(",", " ")
-        return v
+    @property
+    def synonyms(self) -> Dict[str, str]:
+        return dict(self._normalizer.synonyms)
 
-    def _decay(self, conf, t_then):
-        dt = max(0.0, time.time() - t_then)
-        return conf * (0.5 ** (dt / self.half_life_sec))
+    @synonyms.setter
+    def synonyms(self, table: Dict[str, str]) -> None:
+        self._normalizer = SynonymNormalizer(table, field_synonyms=self._normalizer.field_synonyms)
+
+    def _norm(self, field, value):
+        return self._normalizer.normalize(field, value)
 
     def update_field(self, field: str, value: str, confidence: float = 0.8, source: str = "asr"):
         if field not in self.sbar:
@@ -53,99 +138,142 @@ class SBARManager:
         if conflict:
             confidence = min(confidence, 0.5)
         self.sbar[field].update({"value": value, "confidence": confidence, "conflict": conflict})
-        self.history.append((field, value, confidence, t, source, value_norm, conflict))
-        self._recent[field].append((t, value_norm, confidence, source))
+        self.history.append(HistoryRecord(field, value, confidence, t, source, value_norm, conflict))
+        self._tally(field).add(t, value_norm, confidence, source)
 
-    def best_current(self, field: str):
-        items = list(self._recent[field])
-        if not items:
+    def best_current(self, field: str, now: Optional[float] = None):
+        value, s1, s2 = self._tally(field).best(time.time() if now is None else now)
+        if value is None:
             return None, 0.0, False
-        votes = {}
-        for t, v, c, source in items:
-            w = self._decay(c, t)
-            votes[v] = votes.get(v, 0.0) + w
-        if not votes:
-            return None, 0.0, True
-        top = sorted(votes.items(), key=lambda x: x[1], reverse=True)
-        (v1, s1) = top[0]
-        s2 = top[1][1] if len(top) > 1 else 0.0
         contested = (s1 - s2) < self.conflict_threshold
-        return v1, s1, contested
+        return value, s1, contested
 
-    def consensus_sbar(self):
-        out = {}
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Consensus, clarification prompts and the LLM line from one pass.
+
+        All four fields are scored against the same ``now``, so the three
+        views are consistent with each other.
+        """
+        now = time.time() if now is None else now
+        consensus = {}
+        prompts = []
+        lines = []
         for f in self.fields:
-            v, score, contested = self.best_current(f)
-            out[f] = {"consensus": v, "score": round(score, 3), "contested": contested}
-        return out
+            v, score, contested = self.best_current(f, now)
+            consensus[f] = {"consensus": v, "score": round(score, 3), "contested": contested}
+            if (v is None) or contested or score < 0.5:
+                prompts.append(_CLARIFICATION_PROMPTS[f])
+            if v and not contested and score >= 0.5:
+                t = self._tally(f).last_seen.get(v)
+                t_str = time.strftime("%H:%M:%S", time.localtime(t)) if t else ""
+                lines.append(f"{f[:1].upper()}={v}@{t_str}")
+        return {"consensus": consensus, "prompts": prompts, "serialized": " ".join(lines)}
+
+    def consensus_sbar(self):
+        return self.snapshot()["consensus"]
 
     def needs_clarification(self, field: str) -> bool:
         v, score, contested = self.best_current(field)
         return (v is None) or contested or score < 0.5
 
     def clarification_prompts(self):
-        prompts = []
-        for f in self.fields:
-            v, score, contested = self.best_current(f)
-            if (v is None) or contested or score < 0.5:
-                if f == "situation":
-                    prompts.append("Current oxygen saturation (number + %)?")
-                elif f == "background":
-                    prompts.append("Current blood pressure (systolic/diastolic)?")
-                elif f == "assessment":
-                    prompts.append("Patient appearance (cyanotic/pink/alert)?")
-                elif f == "recommendation":
-                    prompts.append("Action to take now (e.g., epi dose/CPR)?")
-        return prompts
+        return self.snapshot()["prompts"]
 
     def serialize_for_llm(self) -> str:
-        lines = []
-        for f in self.fields:
-            v, score, contested = self.best_current(f)
-            if v and not contested and score >= 0.5:
-                t = None
-                for t0, v0, _, _ in reversed(self._recent[f]):
-                    if v0 == v:
-                        t = t0
-                        break
-                t_str = time.strftime("%H:%M:%S", time.localtime(t)) if t else ""
-                lines.append(f"{f[:1].upper()}={v}@{t_str}")
-        return " ".join(lines)
+        return self.snapshot()["serialized"]
+
+    def _tally(self, field: str) -> _FieldTally:
+        tally = self._tallies[field]
+        if tally.half_life != self.half_life_sec or tally.window.maxlen != self.window_size:
+            # Settings changed after construction: rebuild the window under the new ones.
+            rebuilt = _FieldTally(self.half_life_sec, self.window_size)
+            for t, v, c, source, _ in tally.window:
+                rebuilt.add(t, v, c, source)
+            self._tallies[field] = tally = rebuilt
+        return tally
 
     def export_history_jsonl(self, path):
-        import json
-        with open(path, "w") as f:
-            for h in self.history:
-                field, value, conf, t, source, value_norm, conflict = h
-                f.write(json.dumps({
-                    "t": t,
-                    "field": field,
-                    "value": value,
-                    "value_norm": value_norm,
-                    "confidence": conf,
-                    "conflict": conflict,
-                    "source": source
-                }) + "\n")
+        """Append updates not yet exported to ``path`` (the first export to a path rewrites it)."""
+        return self.history.export_jsonl(path)
+
+def whitespace_tokens(text: str) -> int:
+    return len(text.split())
+
+
+def bpe_tokenizer(tokenizer: Any) -> Callable[[str], int]:
+    """
+    Token counter built from the served model's own tokenizer.
+
+    ``tokenizer`` is anything with ``encode(text)`` returning token IDs, e.g. a
+    ``sentencepiece.SentencePieceProcessor`` loaded from the model's
+    ``tokenizer.model``. Counts only match the model when this is the
+    tokenizer it was trained with; there is no default.
+    """
+    encode = getattr(tokenizer, "encode", None)
+    if isinstance(tokenizer, (str, bytes)) or not callable(encode):
+        raise TypeError("tokenizer must be a tokenizer object providing encode(text)")
+    return lambda text: len(encode(text)) if text else 0
+
 
 class ContextManager:
-    def __init__(self, sbar_manager: SBARManager, max_total_tokens: int = 256):
+    """
+    Rolling window of recent inputs kept within ``max_total_tokens``.
+
+    Token counts are computed once per input by ``tokenizer`` and kept as a
+    running total, so adding an input and pruning the oldest ones costs
+    O(1) per input. SBAR field counts are cached until the field value changes.
+    """
+
+    def __init__(
+        self,
+        sbar_manager: SBARManager,
+        max_total_tokens: int = 256,
+        tokenizer: Callable[[str], int] = whitespace_tokens,
+    ):
         self.sbar_manager = sbar_manager
         self.max_total_tokens = max_total_tokens
-        self.recent_inputs: List[str] = []
+        self.tokenizer = tokenizer
+        self._inputs: deque = deque()  # (text, tokens)
+        self._input_tokens = 0
+        self._field_tokens: Dict[str, Tuple[Optional[str], int]] = {}
+        self._tail: Optional[str] = None
+
+    @property
+    def recent_inputs(self) -> List[str]:
+        return [text for text, _ in self._inputs]
 
     def add_input(self, text: str):
         # Only keep the most recent, relevant inputs
-        self.recent_inputs.append(text)
+        tokens = self.tokenizer(text)
+        self._inputs.append((text, tokens))
+        self._input_tokens += tokens
+        self._tail = None
         # Prune if over token budget
-        while self.token_count() > self.max_total_tokens:
-            self.recent_inputs.pop(0)
+        budget = self.max_total_tokens - self._sbar_tokens()
+        while self._inputs and self._input_tokens > budget:
+            _, dropped = self._inputs.popleft()
+            self._input_tokens -= dropped
 
     def token_count(self) -> int:
-        return sum(len(t.split()) for t in self.recent_inputs) + sum(len((self.sbar_manager.sbar[f]["value"] or "").split()) for f in self.sbar_manager.fields)
+        return self._input_tokens + self._sbar_tokens()
 
     def get_context_for_llm(self) -> str:
         # Combine recent inputs and SBAR summary
-        return "\n".join(self.recent_inputs[-3:]) + "\n" + self.sbar_manager.serialize_for_llm()
+        if self._tail is None:
+            last = [text for text, _ in itertools.islice(reversed(self._inputs), 3)]
+            self._tail = "\n".join(reversed(last))
+        return self._tail + "\n" + self.sbar_manager.serialize_for_llm()
+
+    def _sbar_tokens(self) -> int:
+        total = 0
+        for f in self.sbar_manager.fields:
+            value = self.sbar_manager.sbar[f]["value"]
+            cached = self._field_tokens.get(f)
+            if cached is None or cached[0] is not value:
+                cached = self._field_tokens[f] = (value, self.tokenizer(value or ""))
+            total += cached[1]
+        return total
 
 # --- Test Harness ---
 import random
@@ -0,0 +1,118 @@
+"""
+Synonym normalization for SBAR field values.
+
+Values are lower-cased, synonyms are rewritten using one compiled
+word-boundary regex per field (longest key first, so overlapping keys such as
+``spo2``/``o2`` cannot clash), and ``%``, ``/`` and ``,`` are dropped or
+turned into spaces. Results are memoized per ``(field, value)`` because the
+live path normalizes every update and the value it replaces.
+
+The synonym table lives in ``data/sbar_synonyms.yaml``.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Pattern, Tuple
+
+import yaml
+
+DEFAULT_SYNONYMS_PATH = Path("data/sbar_synonyms.yaml")
+DEFAULT_SYNONYMS: Dict[str, str] = {
+    "spo2": "sats",
+    "oxygen": "sats",
+    "o2": "sats",
+    "bp": "blood pressure",
+}
+_PUNCTUATION = str.maketrans({"%": None, "/": " ", ",": " "})
+
+
+def load_synonyms(path: Path | str = DEFAULT_SYNONYMS_PATH) -> Dict[str, Dict[str, str]]:
+    """
+    Read a synonym file into ``{section: {term: replacement}}``.
+
+    Falls back to :data:`DEFAULT_SYNONYMS` under ``"all"`` when the file is
+    missing or empty.
+    """
+    path = Path(path)
+    data = {}
+    if path.exists():
+        with path.open("r", encoding="utf-8") as handle:
+            data = yaml.safe_load(handle) or {}
+    if not data:
+        return {"all": dict(DEFAULT_SYNONYMS)}
+    sections: Dict[str, Dict[str, str]] = {}
+    for section, terms in data.items():
+        sections[str(section).strip().lower()] = {
+            str(term).strip().lower(): str(replacement).strip().lower() for term, replacement in (terms or {}).items()
+        }
+    return sections
+
+
+class SynonymNormalizer:
+    """Compiled, memoized normalizer; build a new one to change the table."""
+
+    def __init__(
+        self,
+        synonyms: Optional[Mapping[str, str]] = None,
+        *,
+        field_synonyms: Optional[Mapping[str, Mapping[str, str]]] = None,
+        cache_size: int = 4096,
+    ) -> None:
+        self.synonyms = {k.lower(): v for k, v in (DEFAULT_SYNONYMS if synonyms is None else synonyms).items() if k}
+        self.field_synonyms = {
+            field: {k.lower(): v for k, v in terms.items() if k}
+            for field, terms in (field_synonyms or {}).items()
+        }
+        self._compiled: Dict[Optional[str], Tuple[Optional[Pattern[str]], Dict[str, str]]] = {}
+        self.normalize = lru_cache(maxsize=cache_size)(self._normalize)
+
+    @classmethod
+    def from_file(cls, path: Path | str = DEFAULT_SYNONYMS_PATH, **kwargs) -> "SynonymNormalizer":
+        sections = load_synonyms(path)
+        common = sections.pop("all", {})
+        return cls(common, field_synonyms=sections, **kwargs)
+
+    def cache_info(self):
+        return self.normalize.cache_info()
+
+    # ------------------------------------------------------------- internals
+    def _normalize(self, field: Optional[str], value: Optional[str]) -> str:
+        text = (value or "").strip().lower()
+        pattern, table = self._pattern(field)
+        if pattern is not None:
+            text = pattern.sub(lambda match: table[match.group(0)], text)
+        return text.translate(_PUNCTUATION)
+
+    def _pattern(self, field: Optional[str]) -> Tuple[Optional[Pattern[str]], Dict[str, str]]:
+        key = field if field in self.field_synonyms else None
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            table = dict(self.synonyms)
+            if key is not None:
+                table.update(self.field_synonyms[key])
+            terms = sorted(table, key=len, reverse=True)
+            # (?<!\w)/(?!\w) rather than \b so keys that start or end with
+            # punctuation still only match whole words.
+            pattern = None
+            if terms:
+                pattern = re.compile(r"(?<!\w)(?:" + "|".join(map(re.escape, terms)) + r")(?!\w)")
+            compiled = self._compiled[key] = (pattern, table)
+        return compiled
+
+
+@lru_cache(maxsize=1)
+def default_normalizer() -> SynonymNormalizer:
+    """Process-wide normalizer for the default synonym file, sharing one memo."""
+    return SynonymNormalizer.from_file(DEFAULT_SYNONYMS_PATH)
+
+
+__all__ = [
+    "DEFAULT_SYNONYMS",
+    "DEFAULT_SYNONYMS_PATH",
+    "SynonymNormalizer",
+    "default_normalizer",
+    "load_synonyms",
+]
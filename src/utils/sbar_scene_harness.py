@@ -10,6 +10,7 @@ from __future__ import annotations
 import os
 import time
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
@@ -42,9 +43,24 @@ QuestionFn = Callable[
 ]
 
 
+def _default_llm_capacity() -> int:
+    raw = os.environ.get("SBAR_CHAOS_LLM_CAPACITY", "4")
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return 4
+
+
 class SBARChaosHarness:
     """
     Minimal chaos harness that replays dialogue JSONL files through the SBAR generator.
+
+    Iterations can run concurrently (``workers``); with the LLM enabled the
+    pool is capped at ``llm_capacity`` so the backend is not oversubscribed.
+    Each concurrent iteration writes its own progress log. ``summary.md``
+    sections and metrics are written in iteration order as soon as each
+    iteration and all earlier ones have finished; a failed iteration gets a
+    short section of its own before the error is re-raised.
     """
 
     def __init__(
@@ -53,8 +69,10 @@ class SBARChaosHarness:
         *,
         output_dir: Path | str = Path("_validation/sbar_chaos_logs"),
         retain_runs: int = 5,
+        llm_capacity: Optional[int] = None,
     ) -> None:
         self.dialogue_path = Path(dialogue_path)
+        self.llm_capacity = max(int(llm_capacity), 1) if llm_capacity else _default_llm_capacity()
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.archive_dir = self.output_dir / "archive"
@@ -67,9 +85,14 @@ class SBARChaosHarness:
         with_llm: bool = True,
         runtime: Optional[LMStudioRuntime] = None,
         scene_path: Optional[Path | str] = None,
+        workers: int = 1,
     ) -> List[Dict[str, object]]:
         """
         Execute the chaos harness for the provided number of iterations.
+
+        ``workers`` above one runs iterations in a thread pool; results,
+        metrics and ``summary.md`` sections are still emitted in iteration
+        order.
         """
         if iters < 1:
             raise ValueError("iters must be >= 1")
@@ -99,23 +122,27 @@ class SBARChaosHarness:
         ]
         aggregated_path.write_text("\n".join(header_lines), encoding="utf-8")
 
-        results: List[Dict[str, object]] = []
+        pool_size = max(1, min(int(workers), iters))
+        if effective_with_llm:
+            pool_size = min(pool_size, self.llm_capacity)
+        llm = runtime_obj if effective_with_llm else None
 
-        for iteration in range(1, iters + 1):
+        def run_iteration(iteration: int) -> Dict[str, object]:
             tmp_output = run_dir / f".{scene_name}_{run_id}_iter{iteration:02d}.md"
+            # Concurrent iterations must not append to the same progress log.
+            progress_name = "progress.md" if pool_size == 1 else f"progress_iter{iteration:02d}.md"
             start = time.perf_counter()
             try:
                 result = generate_sbar_report(
                     scene_path,
                     tmp_output,
-                    llm=runtime_obj if effective_with_llm else None,
+                    llm=llm,
                     with_llm=effective_with_llm,
                 )
-                progress_path = run_dir / "progress.md"
                 progress_result = generate_progressive_sbar_log(
                     scene_path,
-                    progress_path,
-                    runtime=runtime_obj if effective_with_llm else None,
+                    run_dir / progress_name,
+                    runtime=llm,
                     with_llm=effective_with_llm,
                     run_id=run_id,
                     iteration=iteration,
@@ -135,8 +162,23 @@ class SBARChaosHarness:
                     },
                 )
                 raise
+            report_content = Path(result["output_path"]).read_text(encoding="utf-8")
+            if tmp_output.exists():
+                tmp_output.unlink()
+            return {
+                "result": result,
+                "progress": progress_result,
+                "report": report_content,
+                "elapsed": time.perf_counter() - start,
+            }
+
+        results: List[Dict[str, object]] = []
 
-            elapsed = time.perf_counter() - start
+        def emit(iteration: int, outcome: Dict[str, object]) -> None:
+            result = outcome["result"]
+            progress_result = outcome["progress"]
+            report_content = outcome["report"]
+            elapsed = float(outcome["elapsed"])
             reported_latency = float(result.get("latency", 0.0)) + float(
                 progress_result.get("latency", 0.0) or 0.0
             )
@@ -153,7 +195,6 @@ class SBARChaosHarness:
             scene_summary_latency = float(scene_summary.get("latency", 0.0) or 0.0)
             scene_summary_with_llm = bool(scene_summary.get("with_llm"))
 
-            report_content = Path(result["output_path"]).read_text(encoding="utf-8")
             with aggregated_path.open("a", encoding="utf-8") as handle:
                 handle.write(f"## Iteration {iteration} — {run_started_display}\n\n")
                 handle.write(report_content.strip())
@@ -163,9 +204,6 @@ class SBARChaosHarness:
                     handle.write("\n\n")
                 handle.write("---\n\n")
 
-            if tmp_output.exists():
-                tmp_output.unlink()
-
             log_turn_metric(
                 "sbar_chaos",
                 ok=ok,
@@ -222,6 +260,68 @@ class SBARChaosHarness:
                 }
             )
 
+        def emit_failure(iteration: int, exc: BaseException) -> None:
+            with aggregated_path.open("a", encoding="utf-8") as handle:
+                handle.write(f"## Iteration {iteration} — failed\n\n{exc}\n\n---\n\n")
+
+        # Each iteration is written out as soon as it and every earlier one
+        # have finished, so a failure never discards completed sections.
+        wall_start = time.perf_counter()
+        if pool_size == 1:
+            for iteration in range(1, iters + 1):
+                try:
+                    outcome = run_iteration(iteration)
+                except Exception as exc:
+                    emit_failure(iteration, exc)
+                    raise
+                emit(iteration, outcome)
+        else:
+            with ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="sbar-chaos") as pool:
+                futures = [pool.submit(run_iteration, iteration) for iteration in range(1, iters + 1)]
+                for iteration, future in enumerate(futures, start=1):
+                    try:
+                        outcome = future.result()
+                    except Exception as exc:
+                        emit_failure(iteration, exc)
+                        for pending in futures[iteration:]:
+                            pending.cancel()
+                        # Later iterations that were already running still get written.
+                        for later, pending in enumerate(futures[iteration:], start=iteration + 1):
+                            if pending.cancelled() or pending.exception() is not None:
+                                continue
+                            emit(later, pending.result())
+                        raise
+                    emit(iteration, outcome)
+        wall_time = time.perf_counter() - wall_start
+
+        throughput = iters / wall_time * 60.0 if wall_time > 0 else 0.0
+        total_tokens = sum(int(item["tokens"]) for item in results)
+        with aggregated_path.open("a", encoding="utf-8") as handle:
+            handle.write("## Run Summary\n\n")
+            handle.write(f"- Iterations: {iters}\n")
+            handle.write(f"- Workers: {pool_size}\n")
+            handle.write(f"- Wall time: {wall_time:.2f}s\n")
+            handle.write(f"- Throughput: {throughput:.2f} iterations/min\n")
+            handle.write(f"- Tokens: {total_tokens}\n")
+        log_turn_metric(
+            "sbar_chaos_run",
+            ok=all(bool(item["ok"]) for item in results),
+            latency_sec=round(wall_time, 3),
+            extra={
+                "scene": scene_name,
+                "run_id": run_id,
+                "iterations": iters,
+                "workers": pool_size,
+                "throughput_per_min": round(throughput, 3),
+                "tokens": total_tokens,
+                "run_dir": str(run_dir),
+            },
+        )
+        for item in results:
+            item["run_wall_time"] = round(wall_time, 3)
+            item["run_throughput_per_min"] = round(throughput, 3)
+            item["workers"] = pool_size
+
         self._enforce_retention(scene_dir)
 
         return results
@@ -0,0 +1,101 @@
+"""
+Stream uploaded audio to a backend as a chunked multipart body.
+
+FastAPI spools ``UploadFile`` contents to a temporary file once they outgrow a
+small in-memory buffer. Reading that file in fixed-size chunks and framing them
+as ``multipart/form-data`` on the fly means a clip is never materialized in
+memory as a whole, and the backend starts receiving bytes immediately. The
+byte limit is enforced while streaming so an oversized upload is cut off as
+soon as it crosses the limit.
+"""
+
+from __future__ import annotations
+
+import os
+import uuid
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from fastapi import UploadFile
+
+CHUNK_SIZE = 64 * 1024
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds the configured byte limit."""
+
+    def __init__(self, limit: int) -> None:
+        super().__init__(f"upload exceeds {limit} bytes")
+        self.limit = limit
+
+
+def _quote(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\r", "").replace("\n", "")
+
+
+async def iter_upload(
+    upload: UploadFile,
+    *,
+    max_bytes: int = 0,
+    chunk_size: int = CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """Yield the contents of ``upload`` chunk by chunk; ``max_bytes`` of ``0`` disables the limit."""
+    if max_bytes and upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLarge(max_bytes)
+    await upload.seek(0)
+    sent = 0
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            return
+        sent += len(chunk)
+        if max_bytes and sent > max_bytes:
+            raise UploadTooLarge(max_bytes)
+        yield chunk
+
+
+def multipart_upload(
+    upload: UploadFile,
+    *,
+    field: str,
+    fields: Optional[Dict[str, str]] = None,
+    filename: Optional[str] = None,
+    content_type: Optional[str] = None,
+    max_bytes: int = 0,
+    chunk_size: int = CHUNK_SIZE,
+) -> Tuple[Dict[str, str], AsyncIterator[bytes]]:
+    """
+    Build headers and a streaming body that post ``upload`` as form field ``field``.
+
+    Plain ``fields`` are sent first so the backend sees them before the file.
+    The returned iterator raises :class:`UploadTooLarge` once more than
+    ``max_bytes`` of file content has been read. The limit is also checked here
+    when the upload size is already known, so no request is started for an
+    upload that is known to be too large.
+    """
+    if max_bytes and upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLarge(max_bytes)
+    boundary = uuid.uuid4().hex
+    name = filename or upload.filename or "input.wav"
+    media_type = content_type or upload.content_type or "audio/wav"
+
+    async def body() -> AsyncIterator[bytes]:
+        for key, value in (fields or {}).items():
+            yield (
+                f"--{boundary}\r\n"
+                f'Content-Disposition: form-data; name="{_quote(key)}"\r\n\r\n'
+                f"{value}\r\n"
+            ).encode("utf-8")
+        yield (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{_quote(field)}"; filename="{_quote(os.path.basename(name))}"\r\n'
+            f"Content-Type: {media_type}\r\n\r\n"
+        ).encode("utf-8")
+        async for chunk in iter_upload(upload, max_bytes=max_bytes, chunk_size=chunk_size):
+            yield chunk
+        yield f"\r\n--{boundary}--\r\n".encode("utf-8")
+
+    headers = {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+    return headers, body()
+
+
+__all__ = ["CHUNK_SIZE", "UploadTooLarge", "iter_upload", "multipart_upload"]
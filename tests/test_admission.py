@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+from pathlib import Path
+
+import httpx
+from fastapi.testclient import TestClient
+
+from src.orchestrator.admission import (
+    PRIORITY_AUDIO,
+    PRIORITY_BATCH,
+    AdmissionController,
+    AdmissionRegistry,
+    Overloaded,
+)
+
+orchestrator_app = importlib.import_module("src.orchestrator.app")
+
+TOKEN_PATH = Path("_validation/security/sos_token.txt")
+
+
+def _auth_headers() -> dict:
+    if TOKEN_PATH.exists():
+        return {"Authorization": f"Bearer {TOKEN_PATH.read_text(encoding='utf-8').strip()}"}
+    return {}
+
+
+def test_waiters_are_admitted_by_priority_then_arrival():
+    async def scenario() -> list:
+        controller = AdmissionController(max_in_flight=1, max_queue=4, queue_timeout=5)
+        release = asyncio.Event()
+        order = []
+
+        async def job(name: str, priority: int) -> None:
+            async with controller.slot(priority):
+                order.append(name)
+                if name == "running":
+                    await release.wait()
+
+        running = asyncio.create_task(job("running", PRIORITY_AUDIO))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(job("batch", PRIORITY_BATCH)),
+            asyncio.create_task(job("audio-1", PRIORITY_AUDIO)),
+            asyncio.create_task(job("audio-2", PRIORITY_AUDIO)),
+        ]
+        await asyncio.sleep(0)
+        assert controller.queued == 3
+        release.set()
+        await asyncio.gather(running, *waiters)
+        assert controller.in_flight == 0
+        return order
+
+    assert asyncio.run(scenario()) == ["running", "audio-1", "audio-2", "batch"]
+
+
+def test_full_queue_and_queue_timeout_raise_overloaded():
+    async def scenario() -> AdmissionController:
+        controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=0.05)
+        async with controller.slot():
+            waiter = asyncio.create_task(controller.slot().__aenter__())
+            await asyncio.sleep(0)
+            try:
+                async with controller.slot():
+                    pass
+            except Overloaded as exc:
+                assert exc.retry_after >= 1
+            else:
+                raise AssertionError("queue should be full")
+            try:
+                await waiter
+            except Overloaded:
+                pass
+            else:
+                raise AssertionError("waiter should time out")
+        return controller
+
+    controller = asyncio.run(scenario())
+    stats = controller.stats()
+    assert stats["rejected"] == 1
+    assert stats["timed_out"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_turn_text_returns_503_with_retry_after_when_llm_is_saturated(monkeypatch):
+    registry = AdmissionRegistry(max_in_flight=1, max_queue=0, queue_timeout=1)
+    monkeypatch.setattr(orchestrator_app, "LLM_ADMISSION", registry)
+    url = orchestrator_app.get_llm_url()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+    app = orchestrator_app.create_app()
+    app.state.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = TestClient(app)
+    body = {"transcript": "Patient desaturating after induction", "enable_tts": False}
+
+    registry.for_backend(url)._in_flight = 1
+    busy = client.post("/turn_text", json=body, headers=_auth_headers())
+    registry.for_backend(url)._in_flight = 0
+    ok = client.post("/turn_text", json=body, headers=_auth_headers())
+
+    assert busy.status_code == 503
+    assert int(busy.headers["Retry-After"]) >= 1
+    assert ok.status_code == 200
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import importlib
+from pathlib import Path
+
+import httpx
+from fastapi.testclient import TestClient
+
+from src.utils.audio_store import AudioStore
+
+orchestrator_app = importlib.import_module("src.orchestrator.app")
+
+TOKEN_PATH = Path("_validation/security/sos_token.txt")
+
+
+def _auth_headers() -> dict:
+    if TOKEN_PATH.exists():
+        return {"Authorization": f"Bearer {TOKEN_PATH.read_text(encoding='utf-8').strip()}"}
+    return {}
+
+
+def test_audio_store_writes_atomically_and_rejects_escapes(tmp_path):
+    store = AudioStore(tmp_path / "audio")
+    path = store.write(b"RIFF-data")
+
+    assert path.read_bytes() == b"RIFF-data"
+    assert store.resolve(path.name) == path
+    assert not list(store.root.glob(".*.tmp"))
+    assert store.resolve("../secret.wav") is None
+    assert store.resolve("missing.wav") is None
+
+
+def test_audio_store_evicts_least_recently_used_under_byte_cap(tmp_path):
+    store = AudioStore(tmp_path, max_bytes=25)
+    first = store.write(b"a" * 10)
+    second = store.write(b"b" * 10)
+    assert store.resolve(first.name) == first  # touch first so second becomes LRU
+    third = store.write(b"c" * 10)
+
+    assert store.count == 2
+    assert store.total_bytes == 20
+    assert not second.exists()
+    assert first.exists() and third.exists()
+    assert store.stats()["evicted"] == 1
+
+
+def test_audio_store_expires_clips_and_reloads_index(tmp_path, monkeypatch):
+    clock = [1_000.0]
+    monkeypatch.setattr("src.utils.audio_store.time.time", lambda: clock[0])
+    store = AudioStore(tmp_path, ttl_sec=60)
+    old = store.write(b"old")
+    clock[0] += 90
+    fresh = store.write(b"fresh")
+
+    assert not old.exists()
+    assert store.resolve(old.name) is None
+    assert store.count == 1
+
+    reloaded = AudioStore(tmp_path)
+    assert reloaded.count == 1
+    assert reloaded.total_bytes == len(b"fresh")
+    assert reloaded.resolve(fresh.name) == fresh
+
+
+def test_shared_reader_never_deletes_and_owner_spares_clips_in_use(tmp_path, monkeypatch):
+    clock = [1_000.0]
+    monkeypatch.setattr("src.utils.audio_store.time.time", lambda: clock[0])
+    owner = AudioStore(tmp_path, ttl_sec=60, shared=True)
+    reader = AudioStore(tmp_path, ttl_sec=60, shared=True, owner=False)
+    served = owner.write(b"served")
+    idle = owner.write(b"idle")
+    peer = reader.write(b"peer")
+
+    clock[0] += 50
+    assert reader.resolve(served.name) == served  # bumps the mtime for the owner
+    clock[0] += 20
+    reader.evict_expired()
+    assert served.exists() and idle.exists() and peer.exists()
+
+    owner.evict_expired()
+    assert served.exists()
+    assert not idle.exists()
+    assert peer.exists()  # adopted only on the owner's next rescan
+
+    owner.rescan_sec = 0.0
+    owner.evict_expired()
+    assert not peer.exists()
+
+def test_shared_mode_serves_tts_clip_without_download(tmp_path, monkeypatch):
+    store = AudioStore(tmp_path)
+    clip = store.write(b"RIFF-shared")
+    monkeypatch.setattr(orchestrator_app, "AUDIO_STORE", store)
+    monkeypatch.setattr(orchestrator_app, "TTS_AUDIO_MODE", "shared")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/chat/completions"):
+            return httpx.Response(200, json={"choices": [{"message": {"content": "Check the airway."}}]})
+        if request.url.path.endswith("/tts"):
+            return httpx.Response(200, json={"audio_url": f"/audio/{clip.name}", "file_name": clip.name})
+        raise AssertionError(f"unexpected request to {request.url}")
+
+    app = orchestrator_app.create_app()
+    app.state.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = TestClient(app)
+    response = client.post(
+        "/turn_text",
+        json={"text": "Patient is hypoxic after induction"},
+        headers=_auth_headers(),
+    )
+
+    assert response.status_code == 200
+    audio_url = response.json()["audio_url"]
+    assert audio_url.endswith(f"/audio/{clip.name}")
+    assert client.get(audio_url).content == b"RIFF-shared"
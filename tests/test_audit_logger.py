@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+
+from src.utils.audit_logger import AuditWriter, segment_paths, verify_chain
+
+
+def test_audit_writer_recovers_head_and_keeps_chain_valid(tmp_path):
+    log_path = tmp_path / "audit_log.jsonl"
+    writer = AuditWriter(log_path, segment_bytes=0, key=b"k")
+    for index in range(3):
+        writer.append("turn_text", "tester", {"reply_len": index})
+
+    restarted = AuditWriter(log_path, segment_bytes=0, key=b"k")
+    assert restarted.head == writer.head
+    restarted.append("turn_text", "tester", {"reply_len": 3})
+
+    report = verify_chain([log_path], key=b"k")
+    assert report["ok"], report
+    assert report["entries"] == 4
+    assert report["head"] == restarted.head
+
+
+def test_audit_writer_rotates_with_signed_links(tmp_path):
+    log_path = tmp_path / "audit_log.jsonl"
+    writer = AuditWriter(log_path, segment_bytes=400, key=b"k")
+    for index in range(8):
+        writer.append("turn_text", "tester", {"reply_len": index})
+
+    segments = segment_paths(log_path)
+    assert len(segments) > 2
+    assert segments[-1] == log_path
+    first = json.loads(log_path.read_text(encoding="utf-8").splitlines()[0])
+    assert first["event"] == "segment_link"
+    assert first["payload"]["prev_segment"] == segments[-2].name
+
+    assert verify_chain(segments, key=b"k")["ok"]
+    assert not verify_chain(segments, key=b"other")["ok"]
+    dropped = verify_chain([segments[0]] + segments[2:], key=b"k")
+    assert not dropped["ok"]
+
+
+def test_verify_chain_detects_tampering(tmp_path):
+    log_path = tmp_path / "audit_log.jsonl"
+    writer = AuditWriter(log_path, segment_bytes=0, key=b"k")
+    for index in range(3):
+        writer.append("turn_text", "tester", {"reply_len": index})
+
+    lines = log_path.read_text(encoding="utf-8").splitlines()
+    entry = json.loads(lines[1])
+    entry["payload"]["reply_len"] = 99
+    lines[1] = json.dumps(entry)
+    log_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    report = verify_chain([log_path], key=b"k")
+    assert not report["ok"]
+    assert report["line"] == 2
+
+
+def test_audit_writer_without_key_never_rotates(tmp_path, monkeypatch):
+    monkeypatch.delenv("SOS_AUDIT_KEY", raising=False)
+    monkeypatch.setenv("TOKEN_SECRET", "change-me")
+    log_path = tmp_path / "audit_log.jsonl"
+    writer = AuditWriter(log_path, segment_bytes=200)
+    for index in range(5):
+        writer.append("turn_text", "tester", {"reply_len": index})
+
+    assert writer.key is None
+    assert segment_paths(log_path) == [log_path]
+    assert verify_chain([log_path])["ok"]
@@ -25,3 +25,41 @@ def test_data_store_handles_lab_and_imaging():
     assert "abg" in lower_lab or "hemoglobin" in lower_lab
     imaging_response = store.respond("What did ultrasound show?", event_time=220.0)
     assert "pocus" in imaging_response.lower()
+
+
+def _synthetic_store() -> ClinicianDataStore:
+    readings = [{"t": float(t), "value": f"{60 + t % 40}", "source": "monitor"} for t in range(0, 1000, 10)]
+    return ClinicianDataStore(
+        vitals={"heart_rate": readings},
+        medications=[{"t": 50.0, "name": "epinephrine", "dose": "1 mg"}],
+        procedures=[],
+        evaluations=[],
+    )
+
+
+def test_latest_matches_linear_scan_semantics():
+    store = _synthetic_store()
+    assert store.latest("heart_rate", 505.0)["t"] == 500.0
+    assert store.latest("heart_rate", 500.0)["t"] == 500.0
+    assert store.latest("heart_rate", -1.0)["t"] == 0.0  # falls back to the first reading
+    assert store.latest("heart_rate")["t"] == 990.0
+    assert store.latest("spo2") is None
+    assert "epinephrine" in store.respond("Any drug given?", event_time=10.0)
+
+
+def test_window_and_trend_queries():
+    store = _synthetic_store()
+    assert [entry["t"] for entry in store.window("heart_rate", 95.0, 130.0)] == [100.0, 110.0, 120.0, 130.0]
+    assert [entry["t"] for entry in store.trend("heart_rate", 30.0, at=505.0)] == [480.0, 490.0, 500.0]
+    assert store.trend("heart_rate", 20.0)[-1]["t"] == 990.0
+
+    response = store.respond("What's the pulse trend over the last 2 minutes?", event_time=600.0)
+    assert "over the last 120s" in response
+    assert "t=480.0s -> " in response and "t=600.0s (13 readings)" in response
+
+
+def test_reindex_picks_up_appended_readings():
+    store = _synthetic_store()
+    store.vitals["heart_rate"].append({"t": 2000.0, "value": "150", "source": "monitor"})
+    store.reindex()
+    assert store.latest("heart_rate")["value"] == "150"
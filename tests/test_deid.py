@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from src.security.deid import scrub, scrub_record
+
+
+def test_scrub_replaces_each_phi_pattern():
+    text = "John Smith DOB 4/12/1961, phone 555-123-4567, SSN 123-45-6789."
+    assert scrub(text) == "[NAME] DOB [DATE], phone [PHONE], SSN [SSN]."
+
+
+def test_scrub_record_walks_nested_values_without_touching_other_types():
+    record = {
+        "ts": "2025-10-17T21:36:04Z",
+        "event": "turn_text",
+        "ok": True,
+        "latency_sec": 1.5,
+        "extra": {"notes": ["Seen by Mary Jones", 42, None], "count": 3},
+    }
+    cleaned = scrub_record(record)
+    assert cleaned == {
+        "ts": "2025-10-17T21:36:04Z",
+        "event": "turn_text",
+        "ok": True,
+        "latency_sec": 1.5,
+        "extra": {"notes": ["Seen by [NAME]", 42, None], "count": 3},
+    }
+    assert record["extra"]["notes"][0] == "Seen by Mary Jones"
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from src.orchestrator.history import DIGEST_PREFIX, SUMMARY_PREFIX, compact_history, count_tokens
+
+
+def _session() -> list[dict]:
+    messages = [{"role": "system", "content": "Anesthesia drill, adult patient."}]
+    exchanges = [
+        ("65 year old with history of diabetes and hypertension.", "Noted the background."),
+        ("SpO2 88% after induction.", "Increase FiO2 to 100% and check the circuit."),
+        ("Patient looks cyanotic.", "Confirm tube position with capnography."),
+        ("HR 130 and BP 80/40.", "Give a fluid bolus and consider phenylephrine."),
+        ("Sats back to 96%.", "Good, keep reassessing every minute."),
+    ]
+    for user, assistant in exchanges:
+        messages.append({"role": "user", "content": user})
+        messages.append({"role": "assistant", "content": assistant})
+    return messages
+
+
+def test_history_under_budget_is_untouched():
+    messages = _session()
+    assert compact_history(messages, token_budget=1000, keep_turns=2) == (messages, 0)
+    assert compact_history(messages, token_budget=0, keep_turns=2) == (messages, 0)
+
+
+def test_older_turns_fold_into_sbar_summary():
+    messages = _session()
+    compacted, saved = compact_history(messages, token_budget=45, keep_turns=2)
+
+    assert compacted[0] == messages[0]
+    summary = compacted[1]
+    assert summary["role"] == "system"
+    assert summary["content"].startswith(SUMMARY_PREFIX)
+    assert "B=65 year old" in summary["content"]
+    assert compacted[2:] == messages[-4:]
+    assert saved == count_tokens(messages) - count_tokens(compacted)
+    assert saved > 0
+    assert count_tokens(compacted) <= 45
+
+
+def test_empty_summary_falls_back_to_verbatim_digest(monkeypatch):
+    monkeypatch.setattr("src.orchestrator.history.summarize_turns", lambda messages: "")
+    messages = _session()
+    compacted, _ = compact_history(messages, token_budget=45, keep_turns=2)
+
+    digest = compacted[1]["content"]
+    assert digest.startswith(DIGEST_PREFIX)
+    assert digest.endswith("Confirm tube position with capnography.")
+    assert count_tokens(compacted) <= 45
+
+
+def test_long_recent_turns_are_trimmed_to_the_budget():
+    messages = _session()
+    messages[-2]["content"] = "Sats back to 96% " + "and stable " * 20
+    compacted, _ = compact_history(messages, token_budget=60, keep_turns=2)
+
+    assert compacted[-1] == messages[-1]
+    assert messages[-2] not in compacted  # folded into the summary
+    assert compacted[1]["content"].startswith(SUMMARY_PREFIX)
+    assert count_tokens(compacted) <= 60
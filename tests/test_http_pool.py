@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.utils.http_pool import MeteredTransport, create_pooled_client
+
+
+def test_metered_transport_counts_requests_and_failures():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/boom":
+            raise httpx.ConnectError("refused", request=request)
+        if request.url.path == "/fail":
+            return httpx.Response(503)
+        return httpx.Response(200, json={"ok": True})
+
+    transport = MeteredTransport(httpx.MockTransport(handler))
+
+    async def exercise() -> None:
+        async with httpx.AsyncClient(transport=transport, base_url="http://backend") as client:
+            assert (await client.get("/health")).status_code == 200
+            assert (await client.get("/fail")).status_code == 503
+            with pytest.raises(httpx.ConnectError):
+                await client.get("/boom")
+
+    asyncio.run(exercise())
+    stats = transport.stats()
+    assert stats["requests"] == 3
+    assert stats["errors"] == 2
+    assert stats["in_flight"] == 0
+    assert stats["http_versions"] == {"HTTP/1.1": 2}
+    assert stats["last_error"].startswith("ConnectError")
+
+
+def test_create_pooled_client_reads_prefixed_limits(monkeypatch):
+    monkeypatch.setenv("TESTSVC_HTTP_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("TESTSVC_HTTP_MAX_KEEPALIVE", "3")
+    client, transport = create_pooled_client("TESTSVC", 5.0)
+    try:
+        pool = transport._inner._pool
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 3
+        assert client.timeout.read == 5.0
+    finally:
+        asyncio.run(client.aclose())
@@ -1,13 +1,19 @@
 """
 Test harness for LLM Client Module
 """
+import asyncio
+import json
 import unittest
-from unittest.mock import patch
-from src.llm.llm_client import LLMClient
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+from src.llm.llm_client import AsyncLLMClient, LLMClient, PooledLLMClient
 
 class TestLLMClient(unittest.TestCase):
-    @patch('src.llm.llm_client.requests.post')
-    def test_ask_builds_chat_completion_payload(self, mock_post):
+    @patch('src.llm.llm_client.shared_session')
+    def test_ask_builds_chat_completion_payload(self, mock_shared):
+        mock_post = mock_shared.return_value.post
         mock_post.return_value.status_code = 200
         mock_post.return_value.json.return_value = {
             "choices": [{"message": {"content": "SIGNIFICANT change in rhyme"}}]
@@ -31,8 +37,9 @@ class TestLLMClient(unittest.TestCase):
         self.assertEqual(payload["messages"][-1]["content"], "What day is it today?")
         self.assertEqual(payload["messages"][0]["role"], "system")
 
-    @patch('src.llm.llm_client.requests.post')
-    def test_ask_includes_context_and_history(self, mock_post):
+    @patch('src.llm.llm_client.shared_session')
+    def test_ask_includes_context_and_history(self, mock_shared):
+        mock_post = mock_shared.return_value.post
         mock_post.return_value.status_code = 200
         mock_post.return_value.json.return_value = {"response": "fallback"}
         client = LLMClient(api_url="http://fake-api", system_prompt="system")
@@ -45,5 +52,58 @@ class TestLLMClient(unittest.TestCase):
         self.assertEqual(messages[2], history[0])
         self.assertEqual(messages[-1]["role"], "user")
 
+    def test_default_client_sends_through_the_shared_session(self):
+        from src.llm.runtime import shared_session
+
+        client = LLMClient(api_url="http://fake-api", system_prompt="system")
+        self.assertIs(client.runtime().sender, shared_session())
+
+    def test_pooled_client_reuses_session_and_reports_telemetry(self):
+        session = MagicMock()
+        session.post.return_value.json.return_value = {
+            "choices": [{"message": {"content": "NO CHANGE"}}],
+            "usage": {"total_tokens": 42},
+        }
+        client = PooledLLMClient(
+            api_url="http://fake-api",
+            system_prompt="system",
+            session=session,
+            connect_timeout=2,
+            read_timeout=30,
+        )
+        client.ask("first")
+        stats = client.chat("second")
+        self.assertEqual(session.post.call_count, 2)
+        self.assertEqual(session.post.call_args.kwargs["timeout"], (2, 30))
+        self.assertEqual(stats["content"], "NO CHANGE")
+        self.assertEqual(stats["tokens"], 42)
+        self.assertGreaterEqual(stats["latency"], 0.0)
+
+    def test_async_client_chat_and_stream(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            payload = json.loads(request.content)
+            if payload["stream"]:
+                chunks = "".join(
+                    "data: " + json.dumps({"choices": [{"delta": {"content": token}}]}) + "\n\n"
+                    for token in ["Check ", "the ", "airway."]
+                ) + "data: [DONE]\n\n"
+                return httpx.Response(200, text=chunks, headers={"content-type": "text/event-stream"})
+            return httpx.Response(200, json={"choices": [{"message": {"content": "ready"}}], "usage": {"total_tokens": 3}})
+
+        async def scenario():
+            transport = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            async with AsyncLLMClient(api_url="http://fake-api", system_prompt="system", client=transport) as client:
+                stats = await client.chat("ping")
+                tokens = [token async for token in client.stream_tokens("status?")]
+                return stats, tokens, client.last_stats
+
+        stats, tokens, stream_stats = asyncio.run(scenario())
+        self.assertEqual(stats["content"], "ready")
+        self.assertEqual(stats["tokens"], 3)
+        self.assertEqual(tokens, ["Check ", "the ", "airway."])
+        self.assertEqual(stream_stats["content"], "Check the airway.")
+        self.assertIsNotNone(stream_stats["first_token_latency"])
+
+
 if __name__ == "__main__":
     unittest.main()
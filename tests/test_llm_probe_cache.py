@@ -0,0 +1,56 @@
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.utils import llm_runtime
+from src.utils.llm_runtime import PROBE_CACHE, LMStudioRuntime
+
+
+@pytest.fixture()
+def session():
+    PROBE_CACHE.clear()
+    fake = MagicMock()
+    fake.get.return_value = MagicMock(ok=True, status_code=200)
+    with patch.object(llm_runtime, "shared_session", return_value=fake):
+        yield fake
+    PROBE_CACHE.clear()
+
+
+def test_probe_is_shared_across_instances(session):
+    first = LMStudioRuntime(base_url="http://lm:1234", probe_ttl=60, probe_refresh=False)
+    second = LMStudioRuntime(base_url="http://lm:1234/v1", probe_ttl=60, probe_refresh=False)
+
+    assert first.is_available()
+    assert second.is_available()
+    assert session.get.call_count == 1
+    session.post.assert_not_called()
+
+
+def test_probe_expires_and_force_bypasses_cache(session):
+    runtime = LMStudioRuntime(base_url="http://lm:1234", probe_ttl=0.05, probe_refresh=False)
+    runtime.is_available()
+    runtime.is_available(force=True)
+    assert session.get.call_count == 2
+    time.sleep(0.06)
+    runtime.is_available()
+    assert session.get.call_count == 3
+
+
+def test_background_refresher_only_reprobes_entries_in_use(session):
+    session.get.return_value = MagicMock(ok=False, status_code=404)
+    session.post.return_value = MagicMock(ok=False)
+    runtime = LMStudioRuntime(base_url="http://lm:1234", probe_ttl=0.05, probe_refresh=True)
+
+    assert not runtime.is_available()
+    session.get.return_value = MagicMock(ok=True, status_code=200)
+    time.sleep(0.01)
+    assert not runtime.is_available()  # served from the cache, marks the entry as in use
+    time.sleep(0.15)
+
+    probes = session.get.call_count
+    assert probes >= 2
+    with PROBE_CACHE._lock:
+        assert PROBE_CACHE._entries[(runtime._chat_url, runtime.model)].available
+    time.sleep(0.15)
+    assert session.get.call_count <= probes + 1
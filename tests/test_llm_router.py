@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from src.orchestrator.llm_router import CLOSED, HALF_OPEN, OPEN, LLMRouter
+
+
+def test_pick_prefers_fewest_outstanding_then_lowest_latency():
+    router = LLMRouter(["http://a", "http://b", "http://c"])
+    a, b, c = router.backends
+    a.outstanding, b.outstanding, c.outstanding = 2, 1, 1
+    b.ewma_latency, c.ewma_latency = 3.0, 1.5
+    assert router.pick() is c
+
+
+def test_failing_backend_is_ejected_then_probed_half_open(monkeypatch):
+    router = LLMRouter(["http://a", "http://b"], eject_after=2, cooldown_sec=5)
+    a, b = router.backends
+
+    async def fail(url: str) -> str:
+        raise RuntimeError(url)
+
+    async def ok(url: str) -> str:
+        return url
+
+    b.outstanding = 1  # steer the first calls to "a"
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            asyncio.run(router.call(fail))
+    b.outstanding = 0
+    assert a.state == OPEN
+    assert asyncio.run(router.call(ok)) == "http://b"
+
+    later = time.monotonic() + 6
+    monkeypatch.setattr(time, "monotonic", lambda: later)
+    b.outstanding = 1
+    assert router.pick() is a and a.state == HALF_OPEN
+    assert asyncio.run(router.call(ok)) == "http://a"
+    assert a.state == CLOSED
+    assert router.stats()["backends"]["http://a"]["errors"] == 2
+
+
+def test_hedged_request_returns_faster_backend():
+    router = LLMRouter(["http://slow", "http://fast"], hedge=True, min_samples=3)
+    slow, fast = router.backends
+    slow.latencies.extend([0.01] * 3)
+    fast.ewma_latency = 1.0  # prefer "slow" as the primary
+
+    async def send(url: str) -> str:
+        with router.upstream():
+            await asyncio.sleep(1.0 if url == "http://slow" else 0.01)
+        return url
+
+    started = time.perf_counter()
+    assert asyncio.run(router.call(send)) == "http://fast"
+    assert time.perf_counter() - started < 0.5
+    assert router.stats()["hedged"] == 1
+    assert router.stats()["hedge_wins"] == 1
+
+
+def test_hedge_ignores_local_queueing_and_never_doubles_up_on_a_backend():
+    router = LLMRouter(["http://a", "http://b", "http://c"], hedge=True, min_samples=3)
+    a, b, c = router.backends
+    a.latencies.extend([0.05] * 3)
+    b.ewma_latency, c.ewma_latency = 1.0, 2.0
+    urls = []
+
+    async def send(url: str) -> str:
+        urls.append(url)
+        await asyncio.sleep(0.2)  # queued for a local slot: neither timed nor hedged
+        with router.upstream():
+            await asyncio.sleep(0.01)
+        return url
+
+    async def scenario():
+        first = asyncio.ensure_future(router.call(send))
+        await asyncio.sleep(0)
+        assert a.outstanding == 1  # leased before the task first ran
+        second = asyncio.ensure_future(router.call(send))
+        return await asyncio.gather(first, second)
+
+    assert asyncio.run(scenario()) == ["http://a", "http://b"]
+    assert router.stats()["hedged"] == 0
+    assert a.latencies[-1] < 0.1
+    assert all(backend.outstanding == 0 for backend in router.backends)
@@ -0,0 +1,105 @@
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import httpx
+
+from src.llm.runtime import LLMRuntime, RetryPolicy, RuntimeMetrics, build_payload
+
+
+def _reply(content: str, tokens: int = 5) -> dict:
+    return {"choices": [{"message": {"content": content}}], "usage": {"total_tokens": tokens}}
+
+
+def test_build_payload_omits_negative_max_tokens():
+    messages = [{"role": "user", "content": "hi"}]
+    assert "max_tokens" not in build_payload(messages, model="m", temperature=0.2, max_tokens=-1)
+    assert build_payload(messages, model="m", temperature=0.2, max_tokens=64)["max_tokens"] == 64
+    assert "cache_prompt" not in build_payload(messages, model="m", temperature=0.2)
+    assert build_payload(messages, model="m", temperature=0.2, cache_prompt=True)["cache_prompt"] is True
+
+
+def test_complete_retries_retryable_status_then_succeeds():
+    busy = MagicMock(status_code=503)
+    ok = MagicMock(status_code=200, content=b"{}")
+    ok.json.return_value = _reply("stable", tokens=7)
+    sender = MagicMock()
+    sender.post.side_effect = [busy, ok]
+    metrics = RuntimeMetrics()
+    runtime = LLMRuntime(
+        "http://llm/v1/chat/completions",
+        model="m",
+        retry=RetryPolicy(attempts=3, base_delay=0.0),
+        sender=sender,
+        metrics=metrics,
+    )
+
+    result = runtime.complete([{"role": "user", "content": "status?"}], temperature=0.0)
+
+    assert result["content"] == "stable"
+    assert result["tokens"] == 7
+    assert result["attempts"] == 2
+    assert sender.post.call_args.kwargs["json"]["temperature"] == 0.0
+    assert sender.post.call_args.kwargs["timeout"] == (5.0, 60.0)
+    stats = metrics.stats()
+    assert stats["requests"] == 1
+    assert stats["retries"] == 1
+    assert stats["tokens"] == 7
+
+
+def test_retry_delay_is_jittered_and_capped():
+    policy = RetryPolicy(attempts=5, base_delay=1.0, max_delay=2.0)
+    delays = [policy.delay(4) for _ in range(50)]
+    assert all(0.0 <= delay <= 2.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_acomplete_retries_connection_errors():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json=_reply("ok"))
+
+    metrics = RuntimeMetrics()
+    runtime = LLMRuntime(model="m", retry=RetryPolicy(attempts=2, base_delay=0.0), metrics=metrics)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await runtime.acomplete([{"role": "user", "content": "hi"}], url="http://llm", client=client)
+
+    result = asyncio.run(scenario())
+    assert result["content"] == "ok"
+    assert len(calls) == 2
+    assert metrics.stats()["errors"] == 0
+
+
+def test_astream_yields_sse_deltas_and_tolerates_json_bodies():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "sse":
+            body = "".join(
+                "data: " + json.dumps({"choices": [{"delta": {"content": token}}]}) + "\n\n"
+                for token in ["Airway ", "clear."]
+            )
+            return httpx.Response(200, text=body + "data: [DONE]\n\n", headers={"content-type": "text/event-stream"})
+        return httpx.Response(200, json=_reply("Whole reply."))
+
+    runtime = LLMRuntime(model="m", metrics=RuntimeMetrics())
+    finished = []
+
+    async def collect(url: str):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return [
+                token
+                async for token in runtime.astream(
+                    [{"role": "user", "content": "hi"}], url=url, client=client, on_complete=finished.append
+                )
+            ]
+
+    assert asyncio.run(collect("http://sse")) == ["Airway ", "clear."]
+    assert asyncio.run(collect("http://json")) == ["Whole reply."]
+    assert finished[0]["content"] == "Airway clear."
+    assert finished[0]["first_token_latency"] is not None
+    assert runtime.metrics.stats()["requests"] == 2
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import json
+
+from src.utils.metrics_sink import MetricsSink
+
+
+def _read(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def test_metrics_sink_batches_and_scrubs_records(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    sink = MetricsSink(path, batch_size=3, flush_interval=60)
+    sink.start()
+    try:
+        for index in range(5):
+            assert sink.submit({"event": "turn_text", "ok": True, "index": index, "note": "SSN 123-45-6789"})
+        assert sink.flush()
+    finally:
+        sink.stop()
+
+    entries = _read(path)
+    assert [entry["index"] for entry in entries] == list(range(5))
+    assert all(entry["note"] == "SSN [SSN]" for entry in entries)
+    stats = sink.stats()
+    assert stats["written"] == 5
+    assert stats["flushes"] == 2
+    assert stats["dropped"] == 0
+
+
+def test_metrics_sink_drops_when_queue_is_full(tmp_path):
+    sink = MetricsSink(tmp_path / "metrics.jsonl", max_queue=2)
+    assert sink.submit({"event": "a"})
+    assert sink.submit({"event": "b"})
+    assert not sink.submit({"event": "c"})
+    assert sink.stats()["dropped"] == 1
+
+    sink.start()
+    sink.stop()
+    assert [entry["event"] for entry in _read(tmp_path / "metrics.jsonl")] == ["a", "b"]
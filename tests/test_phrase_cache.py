@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+from pathlib import Path
+
+import httpx
+from fastapi.testclient import TestClient
+
+from src.orchestrator.phrase_cache import PhraseCache, load_phrase_file
+from src.utils.audio_store import AudioStore
+
+orchestrator_app = importlib.import_module("src.orchestrator.app")
+
+TOKEN_PATH = Path("_validation/security/sos_token.txt")
+
+
+def _auth_headers() -> dict:
+    if TOKEN_PATH.exists():
+        return {"Authorization": f"Bearer {TOKEN_PATH.read_text(encoding='utf-8').strip()}"}
+    return {}
+
+
+def test_phrase_cache_warms_once_and_rerenders_evicted_clips(tmp_path):
+    store = AudioStore(tmp_path / "audio")
+    cache = PhraseCache(store, ["Check the  airway.", "Call for help."])
+    rendered = []
+
+    async def render(text: str):
+        rendered.append(text)
+        return "wav", f"clip:{text}".encode()
+
+    assert asyncio.run(cache.warm(render)) == 2
+    assert asyncio.run(cache.warm(render)) == 0
+    assert rendered == ["Check the airway.", "Call for help."]
+
+    audio_format, path = cache.lookup("Check the airway.")
+    assert audio_format == "wav"
+    assert path.read_bytes() == b"clip:Check the airway."
+    assert "Not a phrase" not in cache
+
+    path.unlink()
+    assert cache.lookup("Check the airway.") is None
+    assert cache.stats() == {"phrases": 2, "hits": 1, "misses": 1}
+
+
+def test_load_phrase_file_skips_comments_and_blanks(tmp_path):
+    phrases = tmp_path / "phrases.txt"
+    phrases.write_text("# header\n\nCall for help.\n  Bring the cart.  \n", encoding="utf-8")
+    assert load_phrase_file(phrases) == ["Call for help.", "Bring the cart."]
+    assert load_phrase_file(tmp_path / "missing.txt") == []
+
+
+def test_turn_text_serves_clarifying_prompt_from_phrase_cache(monkeypatch, tmp_path):
+    store = AudioStore(tmp_path / "audio")
+    monkeypatch.setattr(orchestrator_app, "AUDIO_STORE", store)
+    monkeypatch.setattr(
+        orchestrator_app,
+        "PHRASE_CACHE",
+        PhraseCache(store, [orchestrator_app.CLARIFYING_PROMPT]),
+    )
+    tts_calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/tts"):
+            tts_calls.append(request.url.path)
+            return httpx.Response(200, json={"format": "wav", "audio_url": "/audio/clip.wav"})
+        if request.url.path.endswith("/audio/clip.wav"):
+            return httpx.Response(200, content=b"RIFF-clarify")
+        return httpx.Response(404)
+
+    app = orchestrator_app.create_app()
+    app.state.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = TestClient(app)
+    replies = [
+        client.post("/turn_text", json={"transcript": "help"}, headers=_auth_headers()).json()
+        for _ in range(2)
+    ]
+
+    assert all(reply["clarifying"] for reply in replies)
+    assert replies[0]["audio_url"] == replies[1]["audio_url"]
+    assert len(tts_calls) == 1
+    assert orchestrator_app.PHRASE_CACHE.stats()["hits"] == 1
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import importlib
+import time
+from pathlib import Path
+
+import httpx
+from fastapi.testclient import TestClient
+
+from src.orchestrator.response_cache import ResponseCache, cache_key
+
+orchestrator_app = importlib.import_module("src.orchestrator.app")
+
+TOKEN_PATH = Path("_validation/security/sos_token.txt")
+
+
+def _auth_headers() -> dict:
+    if TOKEN_PATH.exists():
+        return {"Authorization": f"Bearer {TOKEN_PATH.read_text(encoding='utf-8').strip()}"}
+    return {}
+
+
+def test_cache_key_normalizes_text_but_not_model_or_temperature():
+    base = [{"role": "user", "content": "SpO2 falling  after induction"}]
+    same = [{"role": "user", "content": " spo2 falling after induction "}]
+    assert cache_key(base, "default", 0.7) == cache_key(same, "default", 0.7)
+    assert cache_key(base, "default", 0.7) != cache_key(base, "default", 0.0)
+    assert cache_key(base, "default", 0.7) != cache_key(base, "other", 0.7)
+
+
+def test_response_cache_evicts_by_size_and_ttl(monkeypatch):
+    cache = ResponseCache(max_entries=2, ttl_sec=10)
+    cache.put("a", "reply a")
+    cache.put("b", "reply b")
+    assert cache.get("a") == "reply a"
+    cache.put("c", "reply c")
+    assert cache.get("b") is None
+    assert cache.get("a") == "reply a"
+
+    later = time.monotonic() + 11
+    monkeypatch.setattr(time, "monotonic", lambda: later)
+    assert cache.get("a") is None
+    assert cache.stats()["evicted"] == 2
+
+
+def test_turn_text_reuses_cached_reply_unless_opted_out(monkeypatch):
+    monkeypatch.setattr(orchestrator_app, "RESPONSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(orchestrator_app, "RESPONSE_CACHE", ResponseCache())
+    llm_calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/chat/completions"):
+            llm_calls.append(request.content)
+            return httpx.Response(200, json={"choices": [{"message": {"content": f"Reply {len(llm_calls)}"}}]})
+        return httpx.Response(404)
+
+    app = orchestrator_app.create_app()
+    app.state.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = TestClient(app)
+    body = {"transcript": "Patient desaturating after induction", "enable_tts": False}
+
+    first = client.post("/turn_text", json=body, headers=_auth_headers()).json()
+    second = client.post("/turn_text", json=body, headers=_auth_headers()).json()
+    bypass = client.post(
+        "/turn_text",
+        json=body,
+        headers={**_auth_headers(), "Cache-Control": "no-cache"},
+    ).json()
+
+    assert first["response_text"] == second["response_text"] == "Reply 1"
+    assert bypass["response_text"] == "Reply 2"
+    assert len(llm_calls) == 2
@@ -0,0 +1,117 @@
+import json
+import os
+from pathlib import Path
+
+from src.utils.sbar_batch import (
+    STUB_BACKEND,
+    BatchJob,
+    Checkpoint,
+    discover_jobs,
+    next_assignment,
+    run_batch,
+)
+
+
+def _fake_runner(job, backend, iters, output_dir):
+    if "broken" in str(job["job_id"]):
+        return {"job_id": job["job_id"], "backend": backend, "ok": False, "error": "boom"}
+    return {"job_id": job["job_id"], "backend": backend, "ok": True, "iterations": iters, "tokens": 10}
+
+
+def _crashing_runner(job, backend, iters, output_dir):
+    if "crash" in str(job["job_id"]):
+        os._exit(1)  # kills the worker and breaks the pool
+    return _fake_runner(job, backend, iters, output_dir)
+
+
+def _scene(root: Path, name: str, tags) -> None:
+    (root / name).mkdir(parents=True)
+    (root / name / "dialogue.jsonl").write_text("", encoding="utf-8")
+    (root / name / "scene_metadata.yaml").write_text(f"tags: {json.dumps(tags)}\n", encoding="utf-8")
+
+
+def test_discover_jobs_maps_scenes_to_registry_topics(tmp_path):
+    library = tmp_path / "library"
+    library.mkdir()
+    for topic in ("airway", "hypoxemia", "pneumothorax", "cardiac_arrest"):
+        (library / f"{topic}.yaml").write_text("{}", encoding="utf-8")
+    registry = library / "registry.yaml"
+    registry.write_text(
+        "- id: airway\n  children: [hypoxemia, pneumothorax]\n- id: circulation\n  children: [cardiac_arrest]\n",
+        encoding="utf-8",
+    )
+    scenes = tmp_path / "scenes"
+    _scene(scenes, "tension_pneumo", ["Pneumothorax", "anesthesia"])
+    _scene(scenes, "hypoxemia", [])
+
+    jobs, uncovered = discover_jobs(scenes, registry_path=registry, library_dir=library)
+
+    assert [job.job_id for job in jobs] == ["hypoxemia", "tension_pneumo"]
+    assert jobs[1].topics == ["pneumothorax"]
+    assert uncovered == ["airway", "cardiac_arrest"]
+
+
+def test_next_assignment_respects_backend_caps():
+    jobs = [BatchJob("a", "a.jsonl"), BatchJob("b", "b.jsonl")]
+    caps = {"http://gpu1": 1, "http://gpu2": 2}
+    assert next_assignment(jobs, {"http://gpu1": 0, "http://gpu2": 0}, caps) == (jobs[0], "http://gpu1")
+    assert next_assignment(jobs, {"http://gpu1": 1, "http://gpu2": 0}, caps) == (jobs[0], "http://gpu2")
+    assert next_assignment(jobs, {"http://gpu1": 1, "http://gpu2": 2}, caps) is None
+
+
+def test_run_batch_checkpoints_and_resumes(tmp_path):
+    jobs = [BatchJob("scene_a", "a.jsonl"), BatchJob("scene_broken", "b.jsonl"), BatchJob("scene_c", "c.jsonl")]
+    checkpoint = Checkpoint(tmp_path / "checkpoint.jsonl")
+    metrics_path = tmp_path / "metrics.json"
+
+    first = run_batch(
+        jobs,
+        backend_caps={STUB_BACKEND: 2},
+        workers=2,
+        checkpoint=checkpoint,
+        metrics_path=metrics_path,
+        uncovered_topics=["cardiac_arrest"],
+        runner=_fake_runner,
+    )
+    assert first["totals"]["succeeded"] == 2
+    assert first["totals"]["failed"] == 1
+    assert set(checkpoint.load()) == {"scene_a", "scene_broken", "scene_c"}
+
+    with checkpoint.path.open("a", encoding="utf-8") as handle:
+        handle.write('{"job_id": "scene_c", "ok": tr')  # torn write from a crash
+
+    second = run_batch(
+        jobs,
+        backend_caps={STUB_BACKEND: 2},
+        workers=2,
+        checkpoint=checkpoint,
+        metrics_path=metrics_path,
+        runner=_fake_runner,
+    )
+    assert second["totals"]["resumed"] == 2
+    assert [record["job_id"] for record in second["jobs"]] == ["scene_a", "scene_broken", "scene_c"]
+    saved = json.loads(metrics_path.read_text(encoding="utf-8"))
+    assert saved["totals"]["jobs"] == 3
+    assert saved["totals"]["iterations"] == 2
+
+
+def test_run_batch_survives_a_crashed_worker(tmp_path):
+    jobs = [BatchJob("scene_crash", "a.jsonl")] + [BatchJob(f"scene_{n}", f"{n}.jsonl") for n in range(4)]
+    checkpoint = Checkpoint(tmp_path / "checkpoint.jsonl")
+    metrics_path = tmp_path / "metrics.json"
+
+    result = run_batch(
+        jobs,
+        backend_caps={STUB_BACKEND: 1},
+        workers=1,
+        checkpoint=checkpoint,
+        metrics_path=metrics_path,
+        runner=_crashing_runner,
+    )
+
+    records = {record["job_id"]: record for record in result["jobs"]}
+    assert records["scene_crash"]["ok"] is False
+    assert "BrokenProcessPool" in records["scene_crash"]["error"]
+    assert all(records[f"scene_{n}"]["ok"] for n in range(4))
+    assert set(checkpoint.load()) == {job.job_id for job in jobs}
+    assert json.loads(metrics_path.read_text(encoding="utf-8"))["totals"]["failed"] == 1
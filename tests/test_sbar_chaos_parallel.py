@@ -0,0 +1,98 @@
+from pathlib import Path
+
+import pytest
+
+from src.utils import sbar_scene_harness
+from src.utils.sbar_scene_harness import SBARChaosHarness
+
+SCENE = Path("scenes/tension_pneumo/dialogue.jsonl")
+
+
+def test_parallel_iterations_are_isolated_and_ordered(tmp_path, monkeypatch):
+    metrics = []
+    monkeypatch.setattr(
+        sbar_scene_harness,
+        "log_turn_metric",
+        lambda event, ok, latency_sec, extra=None: metrics.append((event, extra or {})),
+    )
+    harness = SBARChaosHarness(dialogue_path=SCENE, output_dir=tmp_path, retain_runs=0)
+
+    results = harness.run(iters=4, with_llm=False, workers=3)
+
+    assert [item["iteration"] for item in results] == [1, 2, 3, 4]
+    progress_paths = {item["progress_path"] for item in results}
+    assert len(progress_paths) == 4
+    assert all(Path(path).exists() for path in progress_paths)
+    assert results[0]["workers"] == 3
+
+    summary = Path(results[0]["report_path"]).read_text(encoding="utf-8")
+    positions = [summary.index(f"## Iteration {n} ") for n in range(1, 5)]
+    assert positions == sorted(positions)
+    assert "## Run Summary" in summary
+    assert "- Workers: 3" in summary
+    assert "iterations/min" in summary
+
+    chaos_events = [extra["iteration"] for event, extra in metrics if event == "sbar_chaos"]
+    assert chaos_events == [1, 2, 3, 4]
+    run_events = [extra for event, extra in metrics if event == "sbar_chaos_run"]
+    assert run_events and run_events[0]["iterations"] == 4
+
+
+def test_llm_runs_are_capped_by_backend_capacity(tmp_path, monkeypatch):
+    monkeypatch.setattr(sbar_scene_harness, "log_turn_metric", lambda *args, **kwargs: None)
+
+    class AvailableRuntime:
+        def is_available(self):
+            return True
+
+    calls = []
+
+    def fake_report(scene_path, output_path, *, llm, with_llm):
+        calls.append(llm)
+        Path(output_path).write_text("## Situation\nok\n", encoding="utf-8")
+        return {"ok": True, "output_path": str(output_path), "with_llm": with_llm, "tokens": 3, "latency": 0.1}
+
+    def fake_progress(scene_path, progress_path, *, runtime, with_llm, run_id, iteration):
+        return {"progress_path": str(progress_path), "snapshots": [], "tokens": 2}
+
+    monkeypatch.setattr(sbar_scene_harness, "generate_sbar_report", fake_report)
+    monkeypatch.setattr(sbar_scene_harness, "generate_progressive_sbar_log", fake_progress)
+    harness = SBARChaosHarness(dialogue_path=SCENE, output_dir=tmp_path, retain_runs=0, llm_capacity=2)
+
+    results = harness.run(iters=5, with_llm=True, runtime=AvailableRuntime(), workers=8)
+
+    assert len(calls) == 5
+    assert {item["workers"] for item in results} == {2}
+    assert sum(item["tokens"] for item in results) == 25
+
+
+def test_completed_iterations_are_written_before_a_failure_is_raised(tmp_path, monkeypatch):
+    metrics = []
+    monkeypatch.setattr(
+        sbar_scene_harness,
+        "log_turn_metric",
+        lambda event, ok, latency_sec, extra=None: metrics.append((event, ok, extra or {})),
+    )
+
+    def fake_report(scene_path, output_path, *, llm, with_llm):
+        if "iter03" in Path(output_path).name:
+            raise RuntimeError("scene parser crashed")
+        Path(output_path).write_text("## Situation\nok\n", encoding="utf-8")
+        return {"ok": True, "output_path": str(output_path), "with_llm": with_llm, "tokens": 1}
+
+    def fake_progress(scene_path, progress_path, *, runtime, with_llm, run_id, iteration):
+        return {"progress_path": str(progress_path), "snapshots": []}
+
+    monkeypatch.setattr(sbar_scene_harness, "generate_sbar_report", fake_report)
+    monkeypatch.setattr(sbar_scene_harness, "generate_progressive_sbar_log", fake_progress)
+    harness = SBARChaosHarness(dialogue_path=SCENE, output_dir=tmp_path, retain_runs=0)
+
+    with pytest.raises(RuntimeError):
+        harness.run(iters=4, with_llm=False, workers=1)
+
+    summary = next(tmp_path.rglob("summary.md")).read_text(encoding="utf-8")
+    assert "## Iteration 1 " in summary and "## Iteration 2 " in summary
+    assert "## Iteration 3 — failed" in summary and "scene parser crashed" in summary
+    assert "## Iteration 4 " not in summary
+    written = [(extra["iteration"], ok) for event, ok, extra in metrics if event == "sbar_chaos"]
+    assert written == [(1, True), (2, True), (3, False)]
@@ -0,0 +1,51 @@
+import json
+
+from src.utils.sbar_history import HistoryRecord, SBARHistory
+from src.utils.sbar_manager import SBARManager
+
+
+def _record(index: int) -> HistoryRecord:
+    return HistoryRecord("situation", f"sats {index}%", 0.8, 1000.0 + index, "asr", f"sats {index}", False)
+
+
+def test_history_spills_beyond_memory_bound(tmp_path):
+    history = SBARHistory(max_in_memory=3, spill_path=tmp_path / "spill.jsonl")
+    for index in range(10):
+        history.append(_record(index))
+
+    assert len(history) == 10
+    assert history.stats() == {"records": 10, "in_memory": 3, "spilled": 7}
+    assert [record.t for record in history] == [1000.0 + index for index in range(10)]
+    assert history.recent(2) == [_record(8), _record(9)]
+    history.close()
+
+
+def test_export_appends_only_new_records(tmp_path):
+    history = SBARHistory(max_in_memory=2)
+    out = tmp_path / "history.jsonl"
+    for index in range(5):
+        history.append(_record(index))
+    assert history.export_jsonl(out) == 5
+
+    history.append(_record(5))
+    history.append(_record(6))
+    assert history.export_jsonl(out) == 2
+    assert history.export_jsonl(out) == 0
+
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [row["value"] for row in rows] == [f"sats {index}%" for index in range(7)]
+    assert list(rows[0]) == ["t", "field", "value", "value_norm", "confidence", "conflict", "source"]
+
+    out.unlink()
+    assert history.export_jsonl(out) == 7  # a missing target is rewritten in full
+
+
+def test_manager_history_stays_bounded(tmp_path):
+    manager = SBARManager(history_in_memory=4)
+    for index in range(12):
+        manager.update_field("situation", f"sats {90 + index % 3}%", 0.8)
+    assert len(manager.history) == 12
+    assert manager.history.stats()["in_memory"] == 4
+    assert manager.export_history_jsonl(tmp_path / "h.jsonl") == 12
+    field, value, *_ = next(iter(manager.history))
+    assert (field, value) == ("situation", "sats 90%")
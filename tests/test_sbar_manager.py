@@ -0,0 +1,121 @@
+import itertools
+import random
+
+import pytest
+
+from src.utils import sbar_manager
+from src.utils.sbar_manager import SBARManager
+
+
+class _Clock:
+    def __init__(self, start: float = 1_700_000_000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    fake = _Clock()
+    monkeypatch.setattr(sbar_manager.time, "time", fake)
+    return fake
+
+
+def _reference(history, field, now, half_life=120, window=6, threshold=0.2):
+    """The original rebuild-everything consensus, used as an oracle."""
+    items = [(t, norm, conf) for f, _, conf, t, _, norm, _ in history if f == field][-window:]
+    if not items:
+        return None, 0.0, False
+    votes = {}
+    for t, value, conf in items:
+        votes[value] = votes.get(value, 0.0) + conf * 0.5 ** (max(0.0, now - t) / half_life)
+    top = sorted(votes.items(), key=lambda item: item[1], reverse=True)
+    second = top[1][1] if len(top) > 1 else 0.0
+    return top[0][0], top[0][1], (top[0][1] - second) < threshold
+
+
+def test_incremental_tallies_match_full_recount(clock):
+    rng = random.Random(7)
+    manager = SBARManager()
+    values = ["sats 92%", "SpO2 88%", "oxygen 95%", "sats 72%"]
+    for _ in range(200):
+        clock.now += rng.uniform(0, 90)
+        manager.update_field("situation", rng.choice(values), rng.uniform(0.3, 1.0))
+        clock.now += rng.uniform(0, 30)
+        expected = _reference(manager.history, "situation", clock.now)
+        value, score, contested = manager.best_current("situation")
+        assert value == expected[0]
+        assert score == pytest.approx(expected[1], rel=1e-9, abs=1e-12)
+        assert contested == expected[2]
+
+
+def test_decay_survives_long_idle_gaps(clock):
+    manager = SBARManager()
+    manager.update_field("assessment", "pink", 0.9)
+    for step in itertools.islice(itertools.count(), 5):
+        clock.now += 120 * 100  # far beyond the rebase horizon
+        manager.update_field("assessment", "pink" if step % 2 else "cyanotic", 0.9)
+    value, score, _ = manager.best_current("assessment")
+    expected = _reference(manager.history, "assessment", clock.now)
+    assert value == expected[0]
+    assert score == pytest.approx(expected[1])
+
+
+def test_snapshot_combines_consensus_prompts_and_serialization(clock):
+    manager = SBARManager()
+    manager.update_field("situation", "sats 92%", 0.9)
+    manager.update_field("background", "BP 120/80", 0.8)
+
+    snapshot = manager.snapshot()
+
+    assert snapshot["consensus"] == manager.consensus_sbar()
+    assert snapshot["prompts"] == manager.clarification_prompts()
+    assert snapshot["serialized"] == manager.serialize_for_llm()
+    assert snapshot["serialized"].startswith("S=sats 92@")
+    assert snapshot["prompts"] == [
+        "Patient appearance (cyanotic/pink/alert)?",
+        "Action to take now (e.g., epi dose/CPR)?",
+    ]
+    assert manager.needs_clarification("assessment")
+    assert not manager.needs_clarification("situation")
+
+
+def test_context_manager_prunes_with_running_totals():
+    manager = SBARManager()
+    manager.update_field("situation", "sats 92%", 0.9)  # 2 tokens held by the SBAR
+    context = sbar_manager.ContextManager(manager, max_total_tokens=10)
+    for text in ["one two three", "four five", "six seven eight", "nine"]:
+        context.add_input(text)
+
+    assert context.recent_inputs == ["four five", "six seven eight", "nine"]
+    assert context.token_count() == 8
+    assert context.token_count() == sum(len(t.split()) for t in context.recent_inputs) + 2
+    assert context.get_context_for_llm().startswith("four five\nsix seven eight\nnine\nS=sats 92@")
+
+    manager.update_field("situation", "sats 92% on non-rebreather mask now", 0.9)
+    assert context.token_count() == 6 + 6
+    context.add_input("ten")
+    assert context.recent_inputs == ["nine", "ten"]
+
+
+def test_context_manager_accepts_a_custom_tokenizer():
+    context = sbar_manager.ContextManager(SBARManager(), max_total_tokens=5, tokenizer=len)
+    context.add_input("abc")
+    context.add_input("de")
+    context.add_input("f")
+    assert context.recent_inputs == ["de", "f"]
+    context.add_input("far too long")
+    assert context.recent_inputs == []
+
+
+def test_bpe_tokenizer_counts_with_the_given_tokenizer():
+    class CharTokenizer:
+        def encode(self, text):
+            return list(text)
+
+    count = sbar_manager.bpe_tokenizer(CharTokenizer())
+    assert count("SpO2") == 4
+    assert count("") == 0
+    with pytest.raises(TypeError):
+        sbar_manager.bpe_tokenizer("cl100k_base")
@@ -0,0 +1,40 @@
+from src.utils.sbar_manager import SBARManager
+from src.utils.sbar_normalizer import SynonymNormalizer, load_synonyms
+
+
+def test_synonyms_only_match_whole_words():
+    normalizer = SynonymNormalizer()
+    assert normalizer.normalize("situation", "SpO2 92%") == "sats 92"
+    assert normalizer.normalize("situation", "O2 sats 72%") == "sats sats 72"
+    assert normalizer.normalize("situation", "HR 120 bpm") == "hr 120 bpm"
+    assert normalizer.normalize("background", "BP 80/40, stable") == "blood pressure 80 40  stable"
+    assert normalizer.normalize("situation", "co2 rising") == "co2 rising"
+
+
+def test_normalizer_is_memoized_per_field_and_value():
+    normalizer = SynonymNormalizer()
+    normalizer.normalize("situation", "oxygen 95%")
+    normalizer.normalize("situation", "oxygen 95%")
+    info = normalizer.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+
+
+def test_synonym_file_supports_field_sections(tmp_path):
+    path = tmp_path / "synonyms.yaml"
+    path.write_text("all:\n  bp: blood pressure\nassessment:\n  Blue: cyanotic\n", encoding="utf-8")
+    assert load_synonyms(path) == {"all": {"bp": "blood pressure"}, "assessment": {"blue": "cyanotic"}}
+
+    normalizer = SynonymNormalizer.from_file(path)
+    assert normalizer.normalize("assessment", "blue lips") == "cyanotic lips"
+    assert normalizer.normalize("situation", "blue lips") == "blue lips"
+    assert load_synonyms(tmp_path / "missing.yaml")["all"]["spo2"] == "sats"
+
+
+def test_manager_uses_shared_table_and_accepts_overrides():
+    manager = SBARManager()
+    assert manager.synonyms["o2"] == "sats"
+    manager.synonyms = {"sat": "sats"}
+    assert manager._norm("situation", "sat 90%") == "sats 90"
+    assert manager._norm("situation", "o2 90%") == "o2 90"
+    assert SBARManager()._norm("situation", "o2 90%") == "sats 90"
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import importlib
+import json
+import time
+from pathlib import Path
+
+import httpx
+from fastapi.testclient import TestClient
+
+from src.orchestrator.sessions import ConversationStore, SessionNotFound
+
+orchestrator_app = importlib.import_module("src.orchestrator.app")
+
+TOKEN_PATH = Path("_validation/security/sos_token.txt")
+
+
+def _auth_headers() -> dict:
+    if TOKEN_PATH.exists():
+        return {"Authorization": f"Bearer {TOKEN_PATH.read_text(encoding='utf-8').strip()}"}
+    return {}
+
+
+def test_store_is_append_only_and_expires_idle_sessions(monkeypatch):
+    store = ConversationStore(idle_sec=60)
+    session_id = store.create()
+    store.append(session_id, [{"role": "user", "content": "SpO2 88%"}])
+    digest = store.prefix_digest(session_id)
+    store.append(session_id, [{"role": "assistant", "content": "Increase FiO2."}])
+
+    assert [m["content"] for m in store.messages(session_id)] == ["SpO2 88%", "Increase FiO2."]
+    assert store.prefix_digest(session_id) != digest
+
+    later = time.time() + 61
+    monkeypatch.setattr(time, "time", lambda: later)
+    try:
+        store.messages(session_id)
+    except SessionNotFound:
+        pass
+    else:
+        raise AssertionError("idle session should have expired")
+    assert store.stats()["expired"] == 1
+
+
+def test_history_checkpoints_keep_the_prompt_prefix_stable():
+    store = ConversationStore()
+    session_id = store.create()
+    prompts = []
+    for index in range(12):
+        store.append(
+            session_id,
+            [
+                {"role": "user", "content": f"Turn {index}: SpO2 {90 + index % 5}% and BP 90/50 after induction."},
+                {"role": "assistant", "content": f"Reply {index}: keep FiO2 at 100% and reassess."},
+            ],
+        )
+        messages, saved = store.history(session_id, token_budget=80, keep_turns=2)
+        assert sum(len(m["content"].split()) for m in messages) <= 80
+        prompts.append(messages)
+
+    summaries = [p[0]["content"] for p in prompts if p[0]["role"] == "system"]
+    assert summaries, "budget should have forced a checkpoint"
+    assert len(set(summaries)) < len(summaries)  # the summary is reused between checkpoints
+    for before, after in zip(prompts, prompts[1:]):
+        if len(after) > len(before):  # no checkpoint in between: append-only
+            assert after[: len(before)] == before
+    assert saved > 0
+
+
+def test_store_reloads_sessions_from_sqlite(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'sessions.db'}"
+    first = ConversationStore(db_url=db_url)
+    session_id = first.create()
+    first.append(session_id, [{"role": "user", "content": "BP 80/40"}, {"role": "assistant", "content": "Bolus."}])
+    untouched = first.create()
+    first.flush()
+
+    second = ConversationStore(db_url=db_url)
+    assert not second.resident(session_id)
+    assert second.messages(session_id) == first.messages(session_id)
+    assert second.resident(session_id)
+    assert second.messages(untouched) == []
+    assert second.delete(session_id)
+    assert not ConversationStore(db_url=db_url).delete(session_id)
+
+
+def test_turn_text_uses_session_history(monkeypatch):
+    monkeypatch.setattr(orchestrator_app, "SESSIONS", ConversationStore())
+    prompts = []
+    requests_seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/chat/completions"):
+            body = json.loads(request.content)
+            requests_seen.append(body)
+            prompts.append(body["messages"])
+            return httpx.Response(200, json={"choices": [{"message": {"content": f"Reply {len(prompts)}"}}]})
+        return httpx.Response(404)
+
+    app = orchestrator_app.create_app()
+    app.state.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = TestClient(app)
+    session_id = client.post("/sessions", headers=_auth_headers()).json()["session_id"]
+
+    for text in ["Patient desaturating after induction", "Now the blood pressure is dropping"]:
+        reply = client.post(
+            "/turn_text",
+            json={"transcript": text, "enable_tts": False, "session_id": session_id},
+            headers=_auth_headers(),
+        )
+        assert reply.status_code == 200
+        assert reply.json()["session_id"] == session_id
+
+    assert requests_seen[0]["cache_prompt"] is True
+    assert prompts[1][: len(prompts[0])] == prompts[0]
+    assert prompts[1][len(prompts[0])] == {"role": "assistant", "content": "Reply 1"}
+    stored = client.get(f"/sessions/{session_id}", headers=_auth_headers()).json()
+    assert len(stored["messages"]) == 4
+
+    missing = client.post(
+        "/turn_text",
+        json={"transcript": "Patient desaturating after induction", "session_id": "nope"},
+        headers=_auth_headers(),
+    )
+    assert missing.status_code == 404
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import math
+import struct
+
+from fastapi.testclient import TestClient
+
+from src.tts import app as tts_app
+
+
+def _legacy_pcm(text: str, sample_rate: int = 24_000) -> bytes:
+    duration = max(1.0, min(len(text) * 0.1, 6.0))
+    buffer = bytearray()
+    for i in range(int(sample_rate * duration)):
+        freq = 220.0 + (ord(text[i % len(text)]) % 40) * 5
+        buffer.extend(struct.pack("<h", int(0.3 * math.sin(2 * math.pi * freq * (i / sample_rate)) * 32767)))
+    return bytes(buffer)
+
+
+def test_render_stub_pcm_matches_reference_loop(monkeypatch):
+    text = "BP 90/60, HR 120"
+    assert tts_app._render_stub_pcm(text) == _legacy_pcm(text)
+    monkeypatch.setattr(tts_app, "np", None)
+    assert tts_app._render_stub_pcm(text) == _legacy_pcm(text)
+
+
+def test_stub_tts_reuses_clip_for_same_text_and_format(monkeypatch, tmp_path):
+    monkeypatch.setattr(tts_app, "FORWARD_URL", None)
+    monkeypatch.setattr(tts_app, "AUDIO_STORE", tts_app.AudioStore(tmp_path / "audio"))
+    monkeypatch.setattr(tts_app, "STUB_CACHE_STATS", {"hits": 0, "misses": 0})
+    with TestClient(tts_app.app) as client:
+        first = client.post("/tts", json={"text": "Check airway"}).json()
+        second = client.post("/tts", json={"text": "Check airway"}).json()
+        other = client.post("/tts", json={"text": "Check airway", "format": "mp3"}).json()
+        health = client.get("/health").json()
+
+    assert first["file_name"] == second["file_name"]
+    assert other["file_name"] != first["file_name"]
+    assert health["stub_cache"]["hits"] == 1
+    assert health["stub_cache"]["misses"] == 2
+    assert tts_app.AUDIO_STORE.count == 2
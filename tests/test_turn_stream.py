@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import httpx
+from fastapi.testclient import TestClient
+
+from src.orchestrator.app import create_app
+from src.orchestrator.streaming import SentenceChunker, parse_sse_delta
+
+TOKEN_PATH = Path("_validation/security/sos_token.txt")
+
+
+def _auth_headers() -> dict:
+    if TOKEN_PATH.exists():
+        return {"Authorization": f"Bearer {TOKEN_PATH.read_text(encoding='utf-8').strip()}"}
+    return {}
+
+
+def _sse_chunk(text: str) -> str:
+    return "data: " + json.dumps({"choices": [{"delta": {"content": text}}]}) + "\n\n"
+
+
+def _parse_events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for frame in body.strip().split("\n\n"):
+        lines = frame.splitlines()
+        name = lines[0][len("event: "):]
+        data = json.loads(lines[1][len("data: "):])
+        events.append((name, data))
+    return events
+
+
+def test_sentence_chunker_splits_on_boundaries_and_merges_short_fragments():
+    chunker = SentenceChunker()
+    emitted = []
+    for token in ["OK. Check the", " airway now. Is the", " tube in place? Reassess"]:
+        emitted.extend(chunker.feed(token))
+    assert emitted == ["OK. Check the airway now.", "Is the tube in place?"]
+    assert chunker.flush() == "Reassess"
+    assert chunker.flush() is None
+
+
+def test_parse_sse_delta_ignores_control_lines():
+    assert parse_sse_delta(_sse_chunk("Hi").strip()) == "Hi"
+    assert parse_sse_delta("data: [DONE]") is None
+    assert parse_sse_delta(": keep-alive") is None
+
+
+def test_turn_stream_emits_tokens_before_audio_and_done():
+    tts_texts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/asr"):
+            return httpx.Response(200, json={"text": "Patient desaturating after induction, what next?"})
+        if path.endswith("/chat/completions"):
+            body = "".join(
+                _sse_chunk(token)
+                for token in ["Confirm tube position", " with capnography. Then check", " breath sounds."]
+            ) + "data: [DONE]\n\n"
+            return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+        if path.endswith("/tts"):
+            tts_texts.append(json.loads(request.content)["text"])
+            return httpx.Response(200, json={"format": "wav", "audio_url": None})
+        return httpx.Response(404)
+
+    app = create_app()
+    app.state.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = TestClient(app)
+    response = client.post(
+        "/turn/stream",
+        files={"audio": ("ping.wav", b"RIFF", "audio/wav")},
+        headers=_auth_headers(),
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_events(response.text)
+    names = [name for name, _ in events]
+    assert names[0] == "transcript"
+    assert names[-1] == "done"
+    assert names.count("token") == 3
+    assert [data["index"] for name, data in events if name == "audio"] == [0, 1]
+    assert tts_texts == ["Confirm tube position with capnography.", "Then check breath sounds."]
+    assert events[-1][1]["reply"] == "Confirm tube position with capnography. Then check breath sounds."
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import httpx
+from fastapi.testclient import TestClient
+
+from src.asr import app as asr_app
+
+
+def _mock_backend(received: list) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        received.append(request)
+        return httpx.Response(200, json={"text": "patient is stable"})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_asr_proxy_streams_upload_as_chunked_multipart(monkeypatch):
+    monkeypatch.setattr(asr_app, "FORWARD_URL", "http://asr-backend")
+    received: list = []
+    audio = b"RIFF" + bytes(range(256)) * 800
+    with TestClient(asr_app.app) as client:
+        client.app.state.http = _mock_backend(received)
+        response = client.post(
+            "/asr",
+            files={"audio": ("clip.wav", audio, "audio/wav")},
+            data={"language": "en"},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["text"] == "patient is stable"
+    request = received[0]
+    assert request.headers["transfer-encoding"] == "chunked"
+    boundary = request.headers["content-type"].split("boundary=")[1]
+    body = request.content
+    assert body.startswith(f"--{boundary}\r\n".encode())
+    assert b'name="language"\r\n\r\nen\r\n' in body
+    assert b'name="file"; filename="clip.wav"' in body
+    assert audio in body
+    assert body.endswith(f"\r\n--{boundary}--\r\n".encode())
+
+
+def test_asr_proxy_rejects_oversized_upload(monkeypatch):
+    monkeypatch.setattr(asr_app, "FORWARD_URL", "http://asr-backend")
+    monkeypatch.setattr(asr_app, "UPLOAD_MAX_BYTES", 1024)
+    received: list = []
+    with TestClient(asr_app.app) as client:
+        client.app.state.http = _mock_backend(received)
+        response = client.post("/asr", files={"audio": ("clip.wav", b"0" * 4096, "audio/wav")})
+
+    assert response.status_code == 413
+    assert not received
@@ -0,0 +1,110 @@
+"""
+Micro-benchmark for ClinicianDataStore time lookups.
+
+Builds a synthetic scene with 10k vitals samples, replays harness-style
+questions at increasing scene times through the bisect-indexed store and
+through the previous linear scan, and checks both give the same answers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+from typing import Dict, List
+
+from src.utils.clinician_data_store import ClinicianDataStore
+
+QUESTIONS = (
+    "Could you update the current blood pressure?",
+    "What are the sats now?",
+    "Heart rate?",
+    "Latest etco2?",
+    "Which medications were given most recently?",
+    "Any recent blood gas values?",
+)
+
+
+def _legacy_latest_before(entries: List[Dict[str, object]], cutoff: float) -> Dict[str, object]:
+    latest = entries[0]
+    for entry in entries:
+        if float(entry.get("t", 0.0)) <= cutoff:
+            latest = entry
+        else:
+            break
+    return latest
+
+
+def _synthetic_store(samples: int, seed: int = 7) -> ClinicianDataStore:
+    rng = random.Random(seed)
+    metrics = ("blood_pressure", "spo2", "heart_rate", "etco2")
+    per_metric = samples // len(metrics)
+    vitals: Dict[str, List[Dict[str, object]]] = {}
+    for metric in metrics:
+        t = 0.0
+        readings = []
+        for _ in range(per_metric):
+            t += rng.uniform(0.5, 1.5)
+            readings.append({"t": round(t, 2), "value": str(rng.randint(40, 160)), "source": "monitor"})
+        vitals[metric] = readings
+    events = lambda key, n: [{"t": float(i * 30), key: f"{key}-{i}"} for i in range(n)]  # noqa: E731
+    return ClinicianDataStore(
+        vitals=vitals,
+        medications=events("name", 200),
+        procedures=events("name", 50),
+        evaluations=events("focus", 50),
+        labs=events("test", 100),
+        imaging=events("modality", 20),
+    )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark indexed ClinicianDataStore lookups.")
+    parser.add_argument("--samples", type=int, default=10_000, help="Vitals samples across all metrics.")
+    parser.add_argument("--number", type=int, default=5_000, help="Questions answered per timing run.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs; the best one is reported.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    store = _synthetic_store(args.samples)
+    end = max(readings[-1]["t"] for readings in store.vitals.values())
+    rng = random.Random(11)
+    queries = [(QUESTIONS[i % len(QUESTIONS)], rng.uniform(0.0, end)) for i in range(args.number)]
+
+    for metric, readings in store.vitals.items():
+        for _, at in queries[:500]:
+            if store.latest(metric, at) is not _legacy_latest_before(readings, at):
+                print(f"Mismatch for {metric} at t={at:.2f}")
+                return 1
+
+    import src.utils.clinician_data_store as module
+
+    indexed_lookup = module._latest_before
+
+    def legacy_lookup(entries, times, cutoff):
+        return _legacy_latest_before(entries, cutoff)
+
+    results = {}
+    for label, lookup in (("legacy", legacy_lookup), ("bisect", indexed_lookup)):
+        module._latest_before = lookup
+        try:
+            def run():
+                for question, at in queries:
+                    store.respond(question, event_time=at)
+
+            best = min(timeit.repeat(run, number=1, repeat=args.repeat))
+        finally:
+            module._latest_before = indexed_lookup
+        results[label] = best
+        print(f"{label:>8}: {best / args.number * 1e6:8.2f} µs/question")
+    print(f" speedup: {results['legacy'] / results['bisect']:.1f}x")
+
+    trend = min(timeit.repeat(lambda: store.trend("heart_rate", 60.0, at=end / 2), number=1000, repeat=args.repeat))
+    print(f"   trend: {trend / 1000 * 1e6:8.2f} µs/60s window")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
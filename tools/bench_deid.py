@@ -0,0 +1,99 @@
+"""
+Micro-benchmark for the PHI scrubber used by metrics and audit logging.
+
+Compares ``deid.scrub_record`` with the previous JSON round-trip
+implementation on representative turn records and checks both agree.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import timeit
+from typing import Any, Dict, List
+
+from src.security.deid import PHI_PATTERNS, scrub_record
+
+
+def _legacy_scrub(text: str) -> str:
+    if not text:
+        return text
+    for pattern, repl in PHI_PATTERNS:
+        text = re.sub(pattern, repl, text)
+    return text
+
+
+def _legacy_scrub_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    serialized = json.dumps(record)
+    cleaned = re.sub(r'"([^"\\]|\\.)*"', lambda m: _legacy_scrub(m.group(0)), serialized)
+    return json.loads(cleaned)
+
+
+def _sample_records() -> List[Dict[str, Any]]:
+    return [
+        {
+            "ts": "2025-10-17T21:36:04Z",
+            "event": "turn_audio",
+            "ok": True,
+            "latency_sec": 1.234,
+            "reply_len": 182,
+            "wav_count": 12,
+            "secure": False,
+            "clarifying": False,
+            "fallback": False,
+        },
+        {
+            "ts": "2025-10-17T21:36:05Z",
+            "event": "turn_text_error",
+            "ok": False,
+            "latency_sec": 0.2,
+            "error": "Patient John Smith DOB 4/12/1961 callback 555-123-4567 SSN 123-45-6789",
+            "secure": True,
+        },
+        {
+            "ts": "2025-10-17T21:36:06Z",
+            "event": "sbar_chaos",
+            "ok": True,
+            "latency_sec": 2.5,
+            "scene": "tension_pneumo",
+            "iteration": 3,
+            "run_id": "20251017-213604Z",
+            "with_llm": True,
+            "tokens": 812,
+            "report_path": "_validation/sbar_chaos_logs/tension_pneumo/20251017-213604Z/summary.md",
+            "llm_preview": "Situation: Hypotension after induction. Background: Mary Jones, 64F.",
+        },
+    ]
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark deid.scrub_record against the legacy implementation.")
+    parser.add_argument("--number", type=int, default=20_000, help="Records scrubbed per timing run.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs; the best one is reported.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    records = _sample_records()
+    for record in records:
+        if scrub_record(record) != _legacy_scrub_record(record):
+            print(f"Mismatch for {record['event']}")
+            return 1
+
+    results = {}
+    for label, func in (("legacy", _legacy_scrub_record), ("compiled", scrub_record)):
+        def run(func=func):
+            for index in range(args.number):
+                func(records[index % len(records)])
+
+        best = min(timeit.repeat(run, number=1, repeat=args.repeat))
+        results[label] = best
+        print(f"{label:>8}: {best / args.number * 1e6:8.2f} µs/record")
+    print(f" speedup: {results['legacy'] / results['compiled']:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
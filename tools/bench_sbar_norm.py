@@ -0,0 +1,82 @@
+"""
+Micro-benchmark for SBAR value normalization.
+
+Replays the values in ``sbar_history.jsonl`` the way ``update_field`` does
+(each new value plus the value it replaces) through the legacy
+``str.replace`` loop and through :class:`SynonymNormalizer`, then prints the
+values whose normalization changed because of the word-boundary fixes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from src.utils.sbar_normalizer import DEFAULT_SYNONYMS, SynonymNormalizer
+
+
+def _legacy_norm(value: str, synonyms: Dict[str, str] = DEFAULT_SYNONYMS) -> str:
+    v = (value or "").strip().lower()
+    for k, rep in synonyms.items():
+        v = v.replace(k, rep)
+    return v.replace("%", "").replace("/", " ").replace(",", " ")
+
+
+def _load_corpus(path: Path) -> List[Tuple[str, str]]:
+    pairs: List[Tuple[str, str]] = []
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                record = json.loads(line)
+                pairs.append((record.get("field", ""), record.get("value", "")))
+    return pairs
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark SBAR value normalization against the legacy loop.")
+    parser.add_argument("--corpus", type=Path, default=Path("sbar_history.jsonl"), help="SBAR history JSONL.")
+    parser.add_argument("--number", type=int, default=50_000, help="Updates replayed per timing run.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs; the best one is reported.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    corpus = _load_corpus(args.corpus)
+    if not corpus:
+        print(f"No values found in {args.corpus}")
+        return 1
+    normalizer = SynonymNormalizer.from_file()
+
+    for field, value in corpus:
+        legacy, compiled = _legacy_norm(value), normalizer.normalize(field, value)
+        if legacy != compiled:
+            print(f"changed: {value!r}: {legacy!r} -> {compiled!r}")
+
+    # Each update normalizes the new value and the previous value of the field.
+    updates = [(field, value, corpus[index - 1][1]) for index, (field, value) in enumerate(corpus)]
+    cold = SynonymNormalizer.from_file(cache_size=0)
+    results = {}
+    for label, func in (
+        ("legacy", lambda field, value: _legacy_norm(value)),
+        ("compiled", cold.normalize),
+        ("memoized", normalizer.normalize),
+    ):
+        def run(func=func):
+            for index in range(args.number):
+                field, value, previous = updates[index % len(updates)]
+                func(field, value)
+                func(field, previous)
+
+        best = min(timeit.repeat(run, number=1, repeat=args.repeat))
+        results[label] = best
+        print(f"{label:>8}: {best / args.number * 1e6:8.2f} µs/update")
+    print(f" speedup: {results['legacy'] / results['memoized']:.1f}x memoized")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
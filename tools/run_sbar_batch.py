@@ -0,0 +1,102 @@
+"""
+Run the SBAR chaos harness over every scene in ``scenes/`` in one batch.
+
+Rerunning after a crash resumes from the checkpoint; pass ``--fresh`` to start
+over. Results land in one consolidated metrics file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+from typing import Dict, List
+
+from src.utils.llm_runtime import LMStudioRuntime
+from src.utils.sbar_batch import (
+    BATCH_METRICS_PATH,
+    CHECKPOINT_PATH,
+    STUB_BACKEND,
+    Checkpoint,
+    discover_jobs,
+    run_batch,
+)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the SBAR chaos harness across all scenes.")
+    parser.add_argument("--scenes-dir", type=Path, default=Path("scenes"), help="Directory of scene folders.")
+    parser.add_argument("--iters", type=int, default=1, help="Iterations per scene.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("SBAR_BATCH_WORKERS", str(os.cpu_count() or 2))),
+        help="Size of the process pool.",
+    )
+    parser.add_argument(
+        "--llm-urls",
+        default=os.environ.get("LLM_API_URL", "http://127.0.0.1:1234/v1/chat/completions"),
+        help="Comma-separated LLM backends to spread scenes across.",
+    )
+    parser.add_argument(
+        "--per-backend",
+        type=int,
+        default=int(os.environ.get("SBAR_CHAOS_LLM_CAPACITY", "4")),
+        help="Maximum scenes running against one LLM backend at a time.",
+    )
+    parser.add_argument("--no-llm", action="store_true", help="Use stubbed SBAR output for every scene.")
+    parser.add_argument("--checkpoint", type=Path, default=CHECKPOINT_PATH, help="Checkpoint JSONL path.")
+    parser.add_argument("--metrics", type=Path, default=BATCH_METRICS_PATH, help="Consolidated metrics path.")
+    parser.add_argument("--fresh", action="store_true", help="Ignore any existing checkpoint.")
+    return parser.parse_args()
+
+
+def _backend_caps(args: argparse.Namespace) -> Dict[str, int]:
+    if args.no_llm:
+        return {STUB_BACKEND: max(args.workers, 1)}
+    caps = {}
+    for url in [item.strip() for item in args.llm_urls.split(",") if item.strip()]:
+        if LMStudioRuntime(base_url=url).is_available():
+            caps[url] = max(args.per_backend, 1)
+        else:
+            print(f"⚠️  LLM backend unreachable, skipping: {url}")
+    return caps or {STUB_BACKEND: max(args.workers, 1)}
+
+
+def main() -> int:
+    args = _parse_args()
+    jobs, uncovered = discover_jobs(args.scenes_dir)
+    if not jobs:
+        print(f"No scenes found under {args.scenes_dir}")
+        return 1
+
+    summary = run_batch(
+        jobs,
+        backend_caps=_backend_caps(args),
+        workers=args.workers,
+        iters=args.iters,
+        checkpoint=Checkpoint(args.checkpoint),
+        metrics_path=args.metrics,
+        uncovered_topics=uncovered,
+        resume=not args.fresh,
+    )
+
+    failed: List[str] = []
+    for record in summary["jobs"]:
+        status = "✅" if record.get("ok") else "❌"
+        print(f"{status} {record['job_id']} [{record.get('backend')}] tokens={int(record.get('tokens', 0) or 0)}")
+        if not record.get("ok"):
+            failed.append(str(record["job_id"]))
+    totals = summary["totals"]
+    print(
+        f"Scenes: {totals['succeeded']}/{totals['jobs']} ok, {totals['resumed']} resumed, "
+        f"{totals['throughput_per_min']:.2f} iterations/min"
+    )
+    if uncovered:
+        print(f"Registry topics without a scene: {len(uncovered)}")
+    print(f"Metrics written to {args.metrics}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
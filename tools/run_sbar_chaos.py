@@ -31,6 +31,12 @@ def _parse_args() -> argparse.Namespace:
         default=int(os.environ.get("SBAR_CHAOS_RETAIN", "5")),
         help="Number of most recent runs to keep per scene before archiving older runs.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("SBAR_CHAOS_WORKERS", "1")),
+        help="Iterations to run concurrently (capped by SBAR_CHAOS_LLM_CAPACITY when the LLM is used).",
+    )
     parser.add_argument(
         "--with-llm",
         dest="with_llm",
@@ -79,6 +85,9 @@ def _write_summary(results: List[dict], runtime_available: bool, requested_llm:
         f"- Run id: `{run_id}`",
         f"- Scene: `{scene}`",
         f"- Iterations: {len(results)}",
+        f"- Workers: {results[0].get('workers', 1)}",
+        f"- Wall time: {float(results[0].get('run_wall_time', 0.0)):.2f}s",
+        f"- Throughput: {float(results[0].get('run_throughput_per_min', 0.0)):.2f} iterations/min",
         f"- Average latency: {avg_latency:.3f}s",
         f"- Average tokens: {avg_tokens:.1f}",
         f"- Success rate: {success_count}/{len(results)} ({status})",
@@ -111,7 +120,13 @@ def main() -> int:
         with_llm = bool(args.with_llm)
 
     harness = SBARChaosHarness(dialogue_path=args.scene, retain_runs=args.retain)
-    results = harness.run(iters=args.iters, with_llm=with_llm, runtime=runtime, scene_path=args.scene)
+    results = harness.run(
+        iters=args.iters,
+        with_llm=with_llm,
+        runtime=runtime,
+        scene_path=args.scene,
+        workers=args.workers,
+    )
 
     for item in results:
         label = _heartbeat_label(item)
@@ -0,0 +1,43 @@
+"""
+Verify the hash-chained audit log, including rotated segments.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from src.utils.audit_logger import AUDIT_FILE, segment_paths, verify_chain
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Verify the SOS audit log hash chain.")
+    parser.add_argument(
+        "segments",
+        nargs="*",
+        type=Path,
+        help="Segments to verify in chain order (defaults to every segment of the active log).",
+    )
+    parser.add_argument(
+        "--log",
+        type=Path,
+        default=AUDIT_FILE,
+        help="Active audit log used to discover rotated segments.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    segments = args.segments or segment_paths(args.log)
+    if not segments:
+        print(f"No audit segments found for {args.log}")
+        return 1
+    report = verify_chain(segments)
+    print(json.dumps(report, indent=2))
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())